@@ -155,7 +155,8 @@ router.post('/schedule-exam', async (req, res) => {
             endDate,
             holidays,
             selectedFaculty,
-            selectedHalls
+            selectedHalls,
+            strategy
         } = req.body;
 
         // Validation
@@ -193,7 +194,9 @@ router.post('/schedule-exam', async (req, res) => {
             startDate,
             endDate,
             holidays: holidays || [],
-            scheduleId: newSchedule._id.toString()
+            scheduleId: newSchedule._id.toString(),
+            strategy: strategy || 'sequential',
+            halls: selectedHalls
         };
 
         const schedulingResult = await runScheduling(schedulingParams);
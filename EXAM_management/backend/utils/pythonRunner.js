@@ -1,15 +1,120 @@
 const { spawn } = require('child_process');
+const http = require('http');
 const path = require('path');
 require('dotenv').config();
 
+// Persistent worker daemon (modules/worker_daemon.py); set PYTHON_WORKER_URL='' to always spawn
+const WORKER_URL = process.env.PYTHON_WORKER_URL ?? 'http://127.0.0.1:8765';
+const WORKER_SCRIPTS = ['scheduler_wrapper.py', 'seating_wrapper.py', 'hall_ticket_wrapper.py'];
+// Per-command settings sent with each request, the daemon applies them to that command only
+const WORKER_FORWARDED_ENV = ['SEATING_PDF_WORKERS', 'SEATING_PDF_RENDERER', 'HALL_TICKET_WORKERS'];
+
+/**
+ * Run a wrapper command in the Python worker daemon
+ * @param {string} scriptPath - Path to Python script
+ * @param {Array} args - Command line arguments
+ * @returns {Promise} - Resolves like executePythonScript, or to null when no daemon is listening
+ */
+function runInWorker(scriptPath, args = []) {
+    return new Promise((resolve, reject) => {
+        const script = path.basename(scriptPath);
+        if (!WORKER_URL || !WORKER_SCRIPTS.includes(script)) {
+            return resolve(null);
+        }
+
+        const body = JSON.stringify({
+            script,
+            args: args.map(String),
+            cwd: path.dirname(path.resolve(scriptPath)),
+            env: Object.fromEntries(WORKER_FORWARDED_ENV
+                .filter(key => process.env[key] !== undefined)
+                .map(key => [key, process.env[key]]))
+        });
+
+        const request = http.request(`${WORKER_URL}/run`, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+                'Content-Length': Buffer.byteLength(body)
+            }
+        }, (response) => {
+            let data = '';
+            response.on('data', (chunk) => { data += chunk; });
+            response.on('end', () => {
+                let reply;
+                try {
+                    reply = JSON.parse(data);
+                } catch (error) {
+                    return reject({
+                        success: false,
+                        error: error.message,
+                        message: 'Invalid reply from Python worker daemon'
+                    });
+                }
+
+                // Same shape as a spawned script so callers parse stdout as before
+                const stdout = JSON.stringify(reply.result);
+                console.log(`Python worker daemon: ${script} exited with code ${reply.exitCode}`);
+
+                if (reply.exitCode === 0) {
+                    resolve({ success: true, stdout, stderr: '', code: 0 });
+                } else {
+                    reject({
+                        success: false,
+                        stdout,
+                        stderr: '',
+                        code: reply.exitCode,
+                        message: `Python script failed with exit code ${reply.exitCode}`
+                    });
+                }
+            });
+        });
+
+        request.on('error', (error) => {
+            // No daemon running, fall back to spawning the script
+            if (error.code === 'ECONNREFUSED') {
+                return resolve(null);
+            }
+            reject({
+                success: false,
+                error: error.message,
+                message: 'Python worker daemon request failed'
+            });
+        });
+
+        request.end(body);
+    });
+}
+
 /**
  * Execute Python script and return results
+ *
+ * Wrapper scripts are sent to the worker daemon when it is running,
+ * otherwise a new Python process is spawned.
+ * @param {string} scriptPath - Path to Python script
+ * @param {Array} args - Command line arguments
+ * @param {Object} options - Additional options (options.onLine receives each stdout line as it arrives)
+ * @returns {Promise} - Promise resolving to script output
+ */
+async function executePythonScript(scriptPath, args = [], options = {}) {
+    // Streaming stdout needs a live process, the daemon only replies once
+    const workerResult = options.onLine ? null : await runInWorker(scriptPath, args);
+    if (workerResult) {
+        return workerResult;
+    }
+    return spawnPythonScript(scriptPath, args, options);
+}
+
+/**
+ * Spawn a new Python process for the script
  * @param {string} scriptPath - Path to Python script
  * @param {Array} args - Command line arguments
  * @param {Object} options - Additional options
  * @returns {Promise} - Promise resolving to script output
  */
-function executePythonScript(scriptPath, args = [], options = {}) {
+function spawnPythonScript(scriptPath, args = [], options = {}) {
+    const { onLine, ...spawnOptions } = options;
+
     return new Promise((resolve, reject) => {
         const pythonPath = process.env.PYTHON_PATH || 'python';
         const fullScriptPath = path.resolve(scriptPath);
@@ -24,16 +129,25 @@ function executePythonScript(scriptPath, args = [], options = {}) {
 
         const pythonProcess = spawn(pythonPath, [fullScriptPath, ...args], {
             cwd: path.dirname(fullScriptPath),
-            ...options
+            ...spawnOptions,
+            // Streamed lines must come from this process, keep the CLI from handing the run to the daemon
+            env: onLine ? { ...process.env, ...spawnOptions.env, PYTHON_WORKER_URL: '' } : spawnOptions.env
         });
 
         let stdout = '';
         let stderr = '';
+        let pendingLine = '';
 
         pythonProcess.stdout.on('data', (data) => {
             const output = data.toString();
             stdout += output;
             console.log(output);
+
+            if (onLine) {
+                const lines = (pendingLine + output).split('\n');
+                pendingLine = lines.pop();
+                lines.filter(line => line.trim()).forEach(onLine);
+            }
         });
 
         pythonProcess.stderr.on('data', (data) => {
@@ -86,7 +200,9 @@ async function runScheduling(params) {
         startDate,
         endDate,
         holidays = [],
-        scheduleId
+        scheduleId,
+        strategy = 'sequential',
+        halls = []
     } = params;
 
     console.log('Running scheduling algorithm with Python integration...');
@@ -103,7 +219,9 @@ async function runScheduling(params) {
             startDate,
             endDate,
             holidays,
-            scheduleId: scheduleId.toString()
+            scheduleId: scheduleId.toString(),
+            strategy,
+            halls: halls.map(h => h.toString())
         });
         
         const result = await executePythonScript(
@@ -262,19 +380,14 @@ async function generateSeatingPDFs(scheduleId, outputDir = 'uploads/seating') {
     try {
         const scriptPath = path.join(__dirname, '../../modules/seating_wrapper.py');
         
-        // Generate student PDF
-        const studentResult = await executePythonScript(
-            scriptPath,
-            ['generate_student_pdf', scheduleId.toString(), outputDir]
-        );
-        const studentOutput = JSON.parse(studentResult.stdout.trim());
-        
-        // Generate faculty PDF
-        const facultyResult = await executePythonScript(
+        // Generate student and faculty PDFs from one load of the allocations
+        const result = await executePythonScript(
             scriptPath,
-            ['generate_faculty_pdf', scheduleId.toString(), outputDir]
+            ['generate_pdfs', scheduleId.toString(), outputDir]
         );
-        const facultyOutput = JSON.parse(facultyResult.stdout.trim());
+        const output = JSON.parse(result.stdout.trim());
+        const studentOutput = output.studentPdf;
+        const facultyOutput = output.facultyPdf;
         
         return {
             success: true,
@@ -367,9 +480,13 @@ async function generateSingleHallTicket(scheduleId, registerNumber) {
  * Generate hall tickets for all students in a year
  * @param {string} scheduleId - Schedule ID
  * @param {number} year - Year of study (optional)
- * @returns {Promise} - Bulk hall ticket generation result
+ * @param {Object} options - { workers: worker processes, onProgress: called with each per-student result,
+ *                             merge: 'all' | 'department' | 'hall' to write merged multi-page PDFs }
+ * @returns {Promise} - Bulk hall ticket generation result (merged runs add documents and a page index)
  */
-async function generateBulkHallTickets(scheduleId, year = null) {
+async function generateBulkHallTickets(scheduleId, year = null, options = {}) {
+    const { workers = null, onProgress = null, merge = null } = options;
+
     console.log('Generating bulk hall tickets...');
     console.log('Schedule ID:', scheduleId);
     console.log('Year:', year);
@@ -381,11 +498,33 @@ async function generateBulkHallTickets(scheduleId, year = null) {
         if (year !== null) {
             args.push(year.toString());
         }
+        if (workers) {
+            args.push('--workers', workers.toString());
+        }
+        if (merge) {
+            args.push('--merge', merge);
+        }
+        
+        const runOptions = {};
+        if (onProgress) {
+            // Per-student JSON lines are streamed before the final summary
+            args.push('--progress');
+            runOptions.onLine = (line) => {
+                try {
+                    const event = JSON.parse(line);
+                    if (event.event === 'progress') {
+                        onProgress(event);
+                    }
+                } catch (error) {
+                    // Not a JSON line, already logged
+                }
+            };
+        }
         
-        const result = await executePythonScript(scriptPath, args);
+        const result = await executePythonScript(scriptPath, args, runOptions);
         
-        // Parse result
-        const output = JSON.parse(result.stdout.trim());
+        // Parse result, the summary is the last line
+        const output = JSON.parse(result.stdout.trim().split('\n').pop());
         
         if (!output.success) {
             throw new Error(output.error || 'Bulk hall ticket generation failed');
@@ -397,7 +536,9 @@ async function generateBulkHallTickets(scheduleId, year = null) {
             errors: output.errors,
             total: output.total,
             successful: output.successful,
-            failed: output.failed
+            failed: output.failed,
+            documents: output.documents,
+            index: output.index
         };
         
     } catch (error) {
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Timetable Slot Assignment Benchmark
+Times MongoScheduler.assign_exam_slots against the previous implementation,
+which rescanned the whole timetable for every department on every date, on
+synthetic subjects. Both must produce identical timetables.
+
+Usage:
+    python benchmark_scheduler.py [--departments 50] [--subjects 12] [--days 60] [--repeat 3]
+
+Cases:
+    unique codes   every subject code is distinct, the loop stops once all are placed
+    shared codes   the first two subjects of every department share codes across
+                   departments (common courses), so the distinct count never reaches
+                   the subject count and every date is visited
+"""
+
+import sys
+import time
+from datetime import datetime, timedelta
+from bson import ObjectId
+
+from scheduler_wrapper import MongoScheduler
+
+SCHEDULE_ID = '65a000000000000000000001'
+
+
+def legacy_assign_slots(subjects_by_dept, available_dates, exam_type, schedule_id, total_subjects):
+    """The slot loop generate_timetable used before assign_exam_slots"""
+    timetable = []
+
+    for date in available_dates:
+        exams_on_date = []
+
+        if exam_type == 'SEM':
+            for dept_code in sorted(subjects_by_dept.keys()):
+                dept_subjects = subjects_by_dept[dept_code]
+                scheduled_codes = set(t['subjectCode'] for t in timetable if t.get('department') == dept_code)
+                for subject in dept_subjects:
+                    if subject['code'] not in scheduled_codes:
+                        exams_on_date.append({
+                            'schedule': ObjectId(schedule_id), 'subject': subject['_id'],
+                            'subjectCode': subject['code'], 'subjectName': subject['name'],
+                            'department': dept_code, 'date': date,
+                            'timeStart': '09:30 AM', 'timeEnd': '12:30 PM', 'session': 'FN'
+                        })
+                        scheduled_codes.add(subject['code'])
+                        break
+
+            for dept_code in sorted(subjects_by_dept.keys()):
+                dept_subjects = subjects_by_dept[dept_code]
+                scheduled_codes = set(t['subjectCode'] for t in timetable + exams_on_date if t.get('department') == dept_code)
+                for subject in dept_subjects:
+                    if subject['code'] not in scheduled_codes:
+                        exams_on_date.append({
+                            'schedule': ObjectId(schedule_id), 'subject': subject['_id'],
+                            'subjectCode': subject['code'], 'subjectName': subject['name'],
+                            'department': dept_code, 'date': date,
+                            'timeStart': '02:00 PM', 'timeEnd': '05:00 PM', 'session': 'AN'
+                        })
+                        scheduled_codes.add(subject['code'])
+                        break
+        else:
+            for dept_code in sorted(subjects_by_dept.keys()):
+                dept_subjects = subjects_by_dept[dept_code]
+                scheduled_codes = set(t['subjectCode'] for t in timetable if t.get('department') == dept_code)
+                for subject in dept_subjects:
+                    if subject['code'] not in scheduled_codes:
+                        exams_on_date.append({
+                            'schedule': ObjectId(schedule_id), 'subject': subject['_id'],
+                            'subjectCode': subject['code'], 'subjectName': subject['name'],
+                            'department': dept_code, 'date': date,
+                            'timeStart': '09:30 AM', 'timeEnd': '12:30 PM', 'session': 'SINGLE'
+                        })
+                        scheduled_codes.add(subject['code'])
+                        break
+
+        timetable.extend(exams_on_date)
+
+        total_scheduled = len(set(t['subjectCode'] for t in timetable))
+        if total_scheduled >= total_subjects:
+            break
+
+    return timetable
+
+
+def build_subjects(departments, subjects_per_dept, shared):
+    """Synthetic subjects_by_dept, the first `shared` codes of each department are common"""
+    subjects_by_dept = {}
+    for d in range(departments):
+        dept_code = f'D{d:02d}'
+        subjects_by_dept[dept_code] = [
+            {
+                '_id': ObjectId(),
+                'code': f'COM{i:02d}' if i < shared else f'{dept_code}S{i:02d}',
+                'name': f'Subject {i} of {dept_code}'
+            }
+            for i in range(subjects_per_dept)
+        ]
+    return subjects_by_dept
+
+
+def build_dates(days):
+    start = datetime(2025, 5, 1)
+    return [(start + timedelta(days=i)).strftime('%Y-%m-%d') for i in range(days)]
+
+
+def best_time(func, args, repeat):
+    """Best wall time of `repeat` runs and the last result"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def main():
+    args = sys.argv[1:]
+
+    def option(name, default):
+        return int(args[args.index(name) + 1]) if name in args else default
+
+    departments = option('--departments', 50)
+    subjects_per_dept = option('--subjects', 12)
+    days = option('--days', 60)
+    repeat = option('--repeat', 3)
+
+    # assign_exam_slots needs no database connection
+    scheduler = MongoScheduler.__new__(MongoScheduler)
+    dates = build_dates(days)
+
+    print("=" * 60)
+    print("TIMETABLE SLOT ASSIGNMENT BENCHMARK")
+    print("=" * 60)
+    print(f"{departments} departments x {subjects_per_dept} subjects x {days} days, best of {repeat}")
+
+    mismatches = []
+    for case, shared in [('unique codes', 0), ('shared codes', 2)]:
+        subjects_by_dept = build_subjects(departments, subjects_per_dept, shared)
+        total_subjects = departments * subjects_per_dept
+
+        for exam_type in ['SEM', 'Internal']:
+            call_args = (subjects_by_dept, dates, exam_type, SCHEDULE_ID, total_subjects)
+            legacy_time, legacy = best_time(legacy_assign_slots, call_args, repeat)
+            new_time, new = best_time(scheduler.assign_exam_slots, call_args, repeat)
+
+            name = f'{case}, {exam_type}'
+            if new != legacy:
+                mismatches.append(name)
+
+            print(f"\n{name}")
+            print("-" * 60)
+            print(f"  Entries:   {len(new)}")
+            print(f"  Previous:  {legacy_time * 1000:10.2f} ms")
+            print(f"  Current:   {new_time * 1000:10.2f} ms  ({legacy_time / new_time:.1f}x)")
+
+    print("\n" + "=" * 60)
+    if mismatches:
+        print("MISMATCH: timetables differ for " + ', '.join(mismatches))
+        print("=" * 60)
+        return 1
+    print("OK: identical timetables")
+    print("=" * 60)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
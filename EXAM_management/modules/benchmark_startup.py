@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Startup Benchmark for the Python Wrappers
+Runs each wrapper command under `python -X importtime` and reports how much of
+the startup is spent importing modules, which top-level imports dominate, and
+whether heavy rendering libraries were loaded.
+
+Usage:
+    python benchmark_startup.py                      # module import only, no MongoDB needed
+    python benchmark_startup.py <schedule_id>        # also run the seating commands
+    python benchmark_startup.py <schedule_id> --register-number <reg_no>
+
+Options:
+    --repeat N    Runs per case, the median is reported (default 5)
+    --top N       Heaviest top-level imports to list per case (default 5)
+
+Note: running with a schedule_id executes allocate_seats, which rewrites the
+allocations of that schedule. Use a test schedule.
+"""
+
+import re
+import sys
+import time
+import tempfile
+import subprocess
+from pathlib import Path
+from statistics import median
+
+MODULES_DIR = Path(__file__).parent
+
+# Libraries that only the PDF rendering paths should load
+HEAVY_MODULES = ['matplotlib', 'numpy', 'pandas', 'reportlab', 'qrcode', 'PIL', 'pypdf']
+
+WRAPPER_MODULES = {'seating_wrapper', 'hall_ticket_wrapper'}
+
+IMPORTTIME_LINE = re.compile(r'^import time:\s*(\d+)\s*\|\s*(\d+)\s*\| ( *)(\S+)')
+
+
+def parse_importtime(stderr):
+    """Parse -X importtime output into (self_us, cumulative_us, depth, module) rows"""
+    rows = []
+    for line in stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            rows.append((int(self_us), int(cumulative_us), len(indent) // 2, module))
+    return rows
+
+
+def top_level_imports(rows):
+    """
+    Rows imported directly by the command, heaviest first
+
+    A wrapper imported with -c is replaced by its own direct imports, so both
+    ways of starting a wrapper list the same dependencies.
+    """
+    top = []
+    children = []
+    # importtime prints nested imports before the module that pulled them in
+    for row in rows:
+        if row[2] == 1:
+            children.append(row)
+        elif row[2] == 0:
+            top.extend(children if row[3] in WRAPPER_MODULES else [row])
+            children = []
+    return sorted(top, key=lambda row: -row[1])
+
+
+def run_case(args, repeat):
+    """Run one command `repeat` times and return its median measurements"""
+    wall_times = []
+    import_times = []
+    rows = []
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        proc = subprocess.run([sys.executable, '-X', 'importtime'] + args,
+                              cwd=MODULES_DIR, capture_output=True, text=True)
+        wall_times.append(time.perf_counter() - start)
+
+        rows = parse_importtime(proc.stderr)
+        import_times.append(sum(row[0] for row in rows) / 1000)
+
+    loaded = {row[3].split('.')[0] for row in rows}
+    return {
+        'wall_ms': median(wall_times) * 1000,
+        'import_ms': median(import_times),
+        'modules': len(rows),
+        'heavy': [name for name in HEAVY_MODULES if name in loaded],
+        'top': top_level_imports(rows)
+    }
+
+
+def build_cases(schedule_id, register_number, output_dir):
+    """
+    List (name, argv, must_stay_light) cases
+
+    Cases marked must_stay_light never render a PDF, so loading any heavy
+    module there is a regression.
+    """
+    cases = [
+        ('import seating_wrapper', ['-c', 'import seating_wrapper'], True),
+        ('import hall_ticket_wrapper', ['-c', 'import hall_ticket_wrapper'], True),
+        ('seating_wrapper.py (usage)', ['seating_wrapper.py'], True),
+        ('hall_ticket_wrapper.py (usage)', ['hall_ticket_wrapper.py'], True),
+    ]
+
+    if schedule_id:
+        cases += [
+            ('seating allocate_seats',
+             ['seating_wrapper.py', 'allocate_seats', schedule_id, output_dir], True),
+            ('seating generate_student_pdf',
+             ['seating_wrapper.py', 'generate_student_pdf', schedule_id, output_dir], False),
+            ('seating generate_faculty_pdf',
+             ['seating_wrapper.py', 'generate_faculty_pdf', schedule_id, output_dir], False),
+        ]
+
+    if schedule_id and register_number:
+        cases.append(('hall ticket generate_single',
+                      ['hall_ticket_wrapper.py', schedule_id, 'generate_single', register_number], False))
+
+    return cases
+
+
+def main():
+    args = sys.argv[1:]
+
+    def take_option(name, default):
+        if name in args:
+            i = args.index(name)
+            value = args[i + 1]
+            del args[i:i + 2]
+            return value
+        return default
+
+    repeat = int(take_option('--repeat', 5))
+    top = int(take_option('--top', 5))
+    register_number = take_option('--register-number', None)
+    schedule_id = args[0] if args else None
+
+    print("=" * 60)
+    print("PYTHON WRAPPER STARTUP BENCHMARK")
+    print("=" * 60)
+    print(f"Python: {sys.version.split()[0]}  Repeats: {repeat}")
+
+    regressions = []
+    with tempfile.TemporaryDirectory() as output_dir:
+        for name, case_args, must_stay_light in build_cases(schedule_id, register_number, output_dir):
+            result = run_case(case_args, repeat)
+
+            print(f"\n{name}")
+            print("-" * 60)
+            print(f"  Wall time:    {result['wall_ms']:8.1f} ms")
+            print(f"  Import time:  {result['import_ms']:8.1f} ms ({result['modules']} modules)")
+            print(f"  Heavy:        {', '.join(result['heavy']) or 'none'}")
+            for self_us, cumulative_us, _, module in result['top'][:top]:
+                print(f"    {cumulative_us / 1000:8.1f} ms  {module}")
+
+            if must_stay_light and result['heavy']:
+                regressions.append(name)
+
+    print("\n" + "=" * 60)
+    if regressions:
+        print("REGRESSION: heavy modules loaded by " + ', '.join(regressions))
+        print("=" * 60)
+        return 1
+    print("OK: light commands load no rendering libraries")
+    print("=" * 60)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
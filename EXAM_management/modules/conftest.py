@@ -0,0 +1,157 @@
+"""
+Shared pytest fixtures for the wrapper tests: an in-memory stand-in for the
+MongoDB client and local HTTP servers standing in for the worker daemon
+"""
+
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import pytest
+from bson import ObjectId
+
+
+def _matches(doc, query):
+    """Equality, $in and $or filters"""
+    for key, condition in query.items():
+        if key == '$or':
+            if not any(_matches(doc, part) for part in condition):
+                return False
+        elif isinstance(condition, dict) and '$in' in condition:
+            if doc.get(key) not in condition['$in']:
+                return False
+        elif doc.get(key) != condition:
+            return False
+    return True
+
+
+class FakeCursor(list):
+    """find() results, with sort() like a pymongo cursor"""
+
+    def sort(self, key, direction=1):
+        keys = [(key, direction)] if isinstance(key, str) else key
+        for field, order in reversed(keys):
+            super().sort(key=lambda doc: doc.get(field), reverse=order < 0)
+        return self
+
+
+class FakeCollection:
+    """The collection methods the wrappers call; projections are recorded"""
+
+    def __init__(self, name, database):
+        self.name = name
+        self.database = database
+        self.docs = []
+        self.projections = []
+
+    def find(self, query=None, projection=None):
+        self.projections.append(projection)
+        docs = [doc for doc in self.docs if _matches(doc, query or {})]
+        if projection is not None:
+            fields = set(projection) | {'_id'}
+            docs = [{key: value for key, value in doc.items() if key in fields} for doc in docs]
+        return FakeCursor(docs)
+
+    def find_one(self, query=None):
+        return next(iter(self.find(query)), None)
+
+    def count_documents(self, query):
+        return len(self.find(query))
+
+    def aggregate(self, pipeline):
+        """$match, then $group on one field with {'$sum': 1} counters"""
+        docs = self.docs
+        for stage in pipeline:
+            if '$match' in stage:
+                docs = [doc for doc in docs if _matches(doc, stage['$match'])]
+            elif '$group' in stage:
+                group = dict(stage['$group'])
+                field = group.pop('_id').lstrip('$')
+                groups = {}
+                for doc in docs:
+                    row = groups.setdefault(doc.get(field), {'_id': doc.get(field), **dict.fromkeys(group, 0)})
+                    for counter in group:
+                        row[counter] += 1
+                docs = list(groups.values())
+        return iter(docs)
+
+    def insert_many(self, docs):
+        for doc in docs:
+            doc.setdefault('_id', ObjectId())
+            self.docs.append(doc)
+
+    def delete_many(self, query):
+        self.docs = [doc for doc in self.docs if not _matches(doc, query)]
+
+    def update_one(self, query, update):
+        doc = self.find_one(query)
+        if doc is not None:
+            next(d for d in self.docs if d['_id'] == doc['_id']).update(update.get('$set', {}))
+
+
+class FakeDatabase:
+    """db['name'] and db.name, with empty collections created on first use"""
+
+    def __init__(self, name):
+        self.name = name
+        self.collections = {}
+
+    def __getitem__(self, name):
+        if name not in self.collections:
+            self.collections[name] = FakeCollection(name, self)
+        return self.collections[name]
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return self[name]
+
+
+class FakeClient:
+    """client[db_name] and client.get_default_database() ('exam_management')"""
+
+    def __init__(self):
+        self.databases = {}
+
+    def __getitem__(self, name):
+        if name not in self.databases:
+            self.databases[name] = FakeDatabase(name)
+        return self.databases[name]
+
+    def get_default_database(self):
+        return self['exam_management']
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def mongo():
+    """Empty in-memory MongoDB client"""
+    return FakeClient()
+
+
+@pytest.fixture
+def serve_post():
+    """
+    Start local HTTP servers whose POST handler is handle_post(handler);
+    returns each server's URL and shuts them down after the test
+    """
+    servers = []
+
+    def start(handle_post):
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                handle_post(self)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return f'http://127.0.0.1:{server.server_address[1]}'
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
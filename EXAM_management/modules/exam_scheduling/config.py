@@ -31,6 +31,12 @@ GAP_REQUIREMENTS = {
     'NONMAJOR': 0.5  # Half day gap (different session or next day)
 }
 
+# Semester scheduling methods: first-fit greedy or the constraint solver
+SCHEDULING_MODES = ['greedy', 'solver']
+
+# Seconds the constraint solver searches for a better timetable
+SOLVER_TIME_BUDGET = 2.0
+
 # Violation severity levels
 SEVERITY_LEVELS = {
     'LOW': 'Minor gap violation',
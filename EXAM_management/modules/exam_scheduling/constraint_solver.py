@@ -0,0 +1,265 @@
+"""
+Constraint-Based Exam Timetable Solver
+Local search (simulated annealing) over (date, session) slots for semester exams
+
+Model:
+    - one variable per subject: the slot (available date, session) it is held in
+    - hard constraint: a department has at most one exam per date
+    - soft constraints between chronologically consecutive exams of a department:
+        HEAVY needs one full day gap, NONMAJOR needs a different session on the
+        same day, and an AN exam cannot be followed by FN the next day
+
+The solver minimises a weighted sum of objectives (by default gap violations
+first, then the length of the exam window) under a time budget, and returns
+the same (schedule, violations) pair as the greedy scheduler.
+"""
+
+import sys
+import math
+import time
+import random
+from pathlib import Path
+from typing import List, Dict, Tuple, Callable, Optional
+
+import config
+from gap_rules import gap_violation, session_bit
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from exam_calendar import to_ordinal
+
+
+def total_violations(solver: 'ConstraintSolver') -> float:
+    """Objective: number of gap constraint violations"""
+    return solver.violation_count
+
+
+def window_length(solver: 'ConstraintSolver') -> float:
+    """Objective: calendar days from the first available date to the last exam"""
+    return solver.days[solver.last_date_index()] - solver.days[0] + 1
+
+
+# (weight, objective) pairs; any violation outweighs a longer exam window
+DEFAULT_OBJECTIVES = [(1000.0, total_violations), (1.0, window_length)]
+
+
+class ConstraintSolver:
+    """Semester exam timetable solver with pluggable weighted objectives"""
+
+    def __init__(self, subjects: List[Dict], available_dates: List[str],
+                 sessions: Optional[List[str]] = None,
+                 objectives: Optional[List[Tuple[float, Callable]]] = None,
+                 time_budget: float = config.SOLVER_TIME_BUDGET,
+                 max_iterations: Optional[int] = None, seed: int = 0):
+        """
+        Args:
+            subjects: Subject dictionaries, as returned by get_subjects_for_year
+            available_dates: Available dates in DD.MM.YYYY format, ascending
+            sessions: Sessions per date (default FN and AN)
+            objectives: (weight, function(solver)) pairs to minimise
+            time_budget: Seconds to search for
+            max_iterations: Optional cap on search moves (for reproducible runs)
+            seed: Random seed
+        """
+        self.subjects = subjects
+        self.dates = available_dates
+        self.days = [to_ordinal(d) for d in available_dates]
+        self.sessions = list(sessions or config.SEMESTER_SESSIONS)
+        self.session_bits = [session_bit(session) for session in self.sessions]
+        self.objectives = objectives if objectives is not None else DEFAULT_OBJECTIVES
+        self.time_budget = time_budget
+        self.max_iterations = max_iterations
+        self.random = random.Random(seed)
+
+        # Subject indexes per department, in input order
+        self.dept_subjects = {}
+        for i, subject in enumerate(subjects):
+            self.dept_subjects.setdefault(subject['department'], []).append(i)
+
+        # Search state: slot per subject as (date index, session index)
+        self.assignment = [None] * len(subjects)
+        self.dept_date_count = {dept: [0] * len(self.days) for dept in self.dept_subjects}
+        self.dept_violations = {dept: 0 for dept in self.dept_subjects}
+        self.violation_count = 0
+        self.date_load = [0] * len(self.days)
+        self.iterations = 0
+
+    def last_date_index(self) -> int:
+        """Index of the last available date holding an exam"""
+        i = len(self.date_load) - 1
+        while i > 0 and self.date_load[i] == 0:
+            i -= 1
+        return i
+
+    def cost(self) -> float:
+        return sum(weight * objective(self) for weight, objective in self.objectives)
+
+    def _dept_sequence(self, dept: str) -> List[int]:
+        """Subject indexes of a department in chronological order"""
+        return sorted(self.dept_subjects[dept], key=lambda i: self.assignment[i])
+
+    def _count_dept_violations(self, dept: str) -> int:
+        count = 0
+        prev = None
+        for i in self._dept_sequence(dept):
+            date_index, session_index = self.assignment[i]
+            if prev is not None:
+                prev_date, prev_session = self.assignment[prev]
+                if gap_violation(self.subjects[prev]['subject_type'],
+                                 self.days[date_index] - self.days[prev_date],
+                                 self.session_bits[prev_session], self.session_bits[session_index]):
+                    count += 1
+            prev = i
+        return count
+
+    def _refresh_dept(self, dept: str):
+        count = self._count_dept_violations(dept)
+        self.violation_count += count - self.dept_violations[dept]
+        self.dept_violations[dept] = count
+
+    def _place(self, i: int, slot: Tuple[int, int]):
+        """Move subject i to slot, keeping the per-department and per-date counters"""
+        dept = self.subjects[i]['department']
+        if self.assignment[i] is not None:
+            old_date = self.assignment[i][0]
+            self.dept_date_count[dept][old_date] -= 1
+            self.date_load[old_date] -= 1
+        self.assignment[i] = slot
+        self.dept_date_count[dept][slot[0]] += 1
+        self.date_load[slot[0]] += 1
+
+    def _initial_solution(self):
+        """Each department takes consecutive available dates in the first session"""
+        for dept, indexes in self.dept_subjects.items():
+            if len(indexes) > len(self.days):
+                subject = self.subjects[indexes[len(self.days)]]
+                raise ValueError(f"No slots available for {subject['subject_code']}")
+            for date_index, i in enumerate(indexes):
+                self._place(i, (date_index, 0))
+            self._refresh_dept(dept)
+
+    def _random_move(self) -> Optional[List[Tuple[int, Tuple[int, int]]]]:
+        """
+        Pick a neighbouring solution
+
+        Returns the list of (subject, new slot) changes, or None if the
+        picked move is not possible.
+        """
+        i = self.random.randrange(len(self.subjects))
+        dept = self.subjects[i]['department']
+        date_index, session_index = self.assignment[i]
+        kind = self.random.random()
+
+        if kind < 0.5:
+            # Relocate to a date this department does not use yet
+            new_date = self.random.randrange(len(self.days))
+            if self.dept_date_count[dept][new_date]:
+                return None
+            return [(i, (new_date, self.random.randrange(len(self.sessions))))]
+
+        if kind < 0.8:
+            # Swap slots with another exam of the same department
+            j = self.random.choice(self.dept_subjects[dept])
+            if j == i:
+                return None
+            return [(i, self.assignment[j]), (j, self.assignment[i])]
+
+        # Change session on the same date
+        if len(self.sessions) == 1:
+            return None
+        return [(i, (date_index, (session_index + 1) % len(self.sessions)))]
+
+    def _apply(self, changes: List[Tuple[int, Tuple[int, int]]]):
+        for i, slot in changes:
+            self._place(i, slot)
+        for dept in {self.subjects[i]['department'] for i, _ in changes}:
+            self._refresh_dept(dept)
+
+    def solve(self) -> Tuple[List[Dict], List[Dict]]:
+        """
+        Search for the lowest-cost timetable
+
+        Returns:
+            Tuple of (schedule, violations), in the greedy scheduler's format
+        """
+        if not self.subjects:
+            return [], []
+
+        self._initial_solution()
+        current_cost = self.cost()
+        best_cost = current_cost
+        best_assignment = list(self.assignment)
+
+        start = time.perf_counter()
+        start_temperature, end_temperature = 50.0, 0.05
+        progress = 0.0
+
+        while progress < 1.0:
+            self.iterations += 1
+            if self.iterations % 256 == 0:
+                progress = (time.perf_counter() - start) / self.time_budget if self.time_budget else 1.0
+            if self.max_iterations:
+                progress = max(progress, self.iterations / self.max_iterations)
+
+            changes = self._random_move()
+            if changes is None:
+                continue
+
+            undo = [(i, self.assignment[i]) for i, _ in changes]
+            self._apply(changes)
+            new_cost = self.cost()
+
+            temperature = start_temperature * (end_temperature / start_temperature) ** min(progress, 1.0)
+            delta = new_cost - current_cost
+            if delta <= 0 or self.random.random() < math.exp(-delta / temperature):
+                current_cost = new_cost
+                if new_cost < best_cost:
+                    best_cost = new_cost
+                    best_assignment = list(self.assignment)
+            else:
+                self._apply(undo)
+
+        # Restore the best solution found
+        self._apply(list(enumerate(best_assignment)))
+        return self._build_result()
+
+    def _build_result(self) -> Tuple[List[Dict], List[Dict]]:
+        schedule = []
+        for i, subject in enumerate(self.subjects):
+            date_index, session_index = self.assignment[i]
+            schedule.append({
+                'subject_id': subject['subject_id'],
+                'subject_code': subject['subject_code'],
+                'subject_name': subject['subject_name'],
+                'department': subject['department'],
+                'date': self.dates[date_index],
+                'session': self.sessions[session_index],
+                'subject_type': subject['subject_type'],
+                'student_count': subject['student_count']
+            })
+
+        # Report each violation on the later exam of the offending pair
+        messages = {}
+        for dept in self.dept_subjects:
+            prev = None
+            for i in self._dept_sequence(dept):
+                if prev is not None:
+                    msg = gap_violation(self.subjects[prev]['subject_type'],
+                                        self.days[self.assignment[i][0]] - self.days[self.assignment[prev][0]],
+                                        self.session_bits[self.assignment[prev][1]],
+                                        self.session_bits[self.assignment[i][1]])
+                    if msg:
+                        messages[i] = msg
+                prev = i
+
+        violations = []
+        for i in sorted(messages):
+            subject = self.subjects[i]
+            violations.append({
+                'subject_id': subject['subject_id'],
+                'subject_code': subject['subject_code'],
+                'violation_type': 'GAP_CONSTRAINT',
+                'description': messages[i],
+                'severity': 'MEDIUM'
+            })
+
+        return schedule, violations
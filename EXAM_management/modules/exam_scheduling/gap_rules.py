@@ -0,0 +1,45 @@
+"""
+Gap Rules Between Consecutive Exams of a Department
+Pure integer checks: slots carry a day ordinal and a session bit, so the
+rules are comparisons on (days between, session bits).
+"""
+
+from functools import lru_cache
+
+FN, AN = 0, 1
+
+# Session bit of each session name; other sessions (SINGLE) only equal themselves
+SESSION_BITS = {'FN': FN, 'AN': AN}
+
+
+def session_bit(session: str) -> int:
+    return SESSION_BITS.get(session, -1)
+
+
+@lru_cache(maxsize=None)
+def gap_violation(last_type: str, days_diff: int, last_session: int, new_session: int) -> str:
+    """
+    Check the gap rules between a department's last exam and a new slot
+
+    Args:
+        last_type: subject_type of the last exam (HEAVY/NONMAJOR)
+        days_diff: Day ordinal of the new slot minus that of the last exam
+        last_session: Session bit of the last exam
+        new_session: Session bit of the new slot
+
+    Returns:
+        Violation message, or "" if the slot is valid
+    """
+    # Heavy subject constraint: Need 1 full day gap
+    if last_type == 'HEAVY' and days_diff < 2:
+        return f"Heavy subject needs 1 full day gap (only {days_diff} days)"
+
+    # Non-major constraint: Need half-day gap
+    if last_type == 'NONMAJOR' and days_diff == 0 and new_session == last_session:
+        return "Same session on same day for non-major"
+
+    # AN session rule: If last was AN, next must be AN (next day) or day after tomorrow
+    if last_session == AN and days_diff == 1 and new_session == FN:
+        return "Cannot schedule FN next day after AN session"
+
+    return ""
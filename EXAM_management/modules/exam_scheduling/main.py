@@ -8,6 +8,7 @@ import os
 from datetime import datetime
 from scheduler import ExamScheduler
 from pdf_generator import generate_schedule_pdf
+from exam_calendar import to_ordinal
 import config
 
 def print_header(title):
@@ -36,7 +37,7 @@ def print_schedule_table(schedule, exam_type):
     print("-"*70)
     
     # Print schedule
-    for date in sorted(schedule_by_date.keys(), key=lambda x: datetime.strptime(x, '%d.%m.%Y')):
+    for date in sorted(schedule_by_date.keys(), key=to_ordinal):
         exams = schedule_by_date[date]
         
         # Sort by session then department
@@ -156,7 +157,24 @@ def get_user_input():
             except ValueError:
                 print(f"   Warning: Invalid date '{h}' ignored.")
     
-    return exam_type, year, start_date, end_date, holidays
+    # Scheduling method (semester exams only)
+    mode = 'greedy'
+    if exam_type == 'SEMESTER':
+        print("\n5. Select Scheduling Method:")
+        print("   [1] Greedy (fast)")
+        print("   [2] Constraint solver (fewer gap violations)")
+        
+        while True:
+            choice = input("\n   Enter choice (1/2, Enter for 1): ").strip()
+            if choice in ['', '1']:
+                break
+            elif choice == '2':
+                mode = 'solver'
+                break
+            else:
+                print("   Invalid choice. Please enter 1 or 2.")
+    
+    return exam_type, year, start_date, end_date, holidays, mode
 
 def main():
     """Main CLI function"""
@@ -168,7 +186,7 @@ def main():
     
     try:
         # Get input
-        exam_type, year, start_date, end_date, holidays = get_user_input()
+        exam_type, year, start_date, end_date, holidays, mode = get_user_input()
         
         # Display summary
         print_header("SCHEDULING PARAMETERS")
@@ -177,6 +195,8 @@ def main():
         print(f"   Start Date: {start_date}")
         print(f"   End Date: {end_date}")
         print(f"   Holidays: {', '.join(holidays) if holidays else 'None'}")
+        if exam_type == 'SEMESTER':
+            print(f"   Method: {mode}")
         
         # Confirm
         print("\n" + "-"*70)
@@ -193,7 +213,7 @@ def main():
         
         if exam_type == 'SEMESTER':
             schedule, violations = scheduler.schedule_semester_exams(
-                year, start_date, end_date, holidays
+                year, start_date, end_date, holidays, mode=mode
             )
         else:
             schedule, violations = scheduler.schedule_internal_exams(
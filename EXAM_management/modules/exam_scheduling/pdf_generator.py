@@ -10,8 +10,13 @@ from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
 from datetime import datetime
+import sys
+from pathlib import Path
 import config
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from exam_calendar import to_ordinal, reformat, DATE_FORMAT
+
 class SchedulePDFGenerator:
     def __init__(self, filename='exam_schedule.pdf', orientation='portrait'):
         self.filename = filename
@@ -163,8 +168,7 @@ class SchedulePDFGenerator:
         data = [headers]
         
         # Sort by date
-        dept_schedule_sorted = sorted(dept_schedule, 
-                                     key=lambda x: datetime.strptime(x['date'], '%d.%m.%Y'))
+        dept_schedule_sorted = sorted(dept_schedule, key=lambda x: to_ordinal(x['date']))
         
         for exam in dept_schedule_sorted:
             row = [
@@ -227,8 +231,7 @@ class SchedulePDFGenerator:
         data = [headers]
         
         # Sort by date
-        dept_schedule_sorted = sorted(dept_schedule, 
-                                     key=lambda x: datetime.strptime(x['date'], '%d.%m.%Y'))
+        dept_schedule_sorted = sorted(dept_schedule, key=lambda x: to_ordinal(x['date']))
         
         for exam in dept_schedule_sorted:
             row = [
@@ -280,8 +283,7 @@ class SchedulePDFGenerator:
     def add_internal_schedule_matrix(self, schedule):
         """Add internal exam schedule in matrix format (departments × dates)"""
         # Extract all unique dates and departments
-        dates = sorted(list(set(exam['date'] for exam in schedule)), 
-                      key=lambda x: datetime.strptime(x, '%d.%m.%Y'))
+        dates = sorted(set(exam['date'] for exam in schedule), key=to_ordinal)
         departments = sorted(list(set(exam['department'] for exam in schedule)))
         
         # Create a mapping for quick lookup
@@ -306,8 +308,7 @@ class SchedulePDFGenerator:
         # Header row with dates (formatted with day below)
         header_row = ['Branch\n/ Date']
         for date_str in dates:
-            date_obj = datetime.strptime(date_str, '%d.%m.%Y')
-            day_name = date_obj.strftime('%A')
+            day_name = reformat(date_str, DATE_FORMAT, '%A')
             formatted = f"{date_str}\n{day_name}"
             header_row.append(formatted)
         
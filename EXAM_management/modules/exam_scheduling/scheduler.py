@@ -3,10 +3,18 @@ Core Exam Scheduling Algorithm
 Implements greedy scheduling with best-effort gap constraints
 """
 
+import sys
 import sqlite3
-from datetime import datetime, timedelta
+from datetime import datetime
+from pathlib import Path
 from typing import List, Dict, Tuple, Optional
 import config
+from constraint_solver import ConstraintSolver
+from gap_rules import gap_violation, session_bit
+
+# Shared date calendar lives in the parent modules folder
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from exam_calendar import ExamCalendar, days_between, to_ordinal
 
 class ExamScheduler:
     def __init__(self, db_path='exam_scheduling.db'):
@@ -31,25 +39,8 @@ class ExamScheduler:
         Returns:
             List of available dates in DD.MM.YYYY format
         """
-        # Parse dates
-        start = datetime.strptime(start_date, '%d.%m.%Y')
-        end = datetime.strptime(end_date, '%d.%m.%Y')
-        
-        # Convert holidays to datetime objects
-        holiday_dates = [datetime.strptime(h, '%d.%m.%Y') for h in holidays]
-        
-        available_dates = []
-        current = start
-        
-        while current <= end:
-            # Skip weekends (Saturday=5, Sunday=6)
-            if current.weekday() not in config.WEEKENDS:
-                # Skip holidays
-                if current not in holiday_dates:
-                    available_dates.append(current.strftime('%d.%m.%Y'))
-            current += timedelta(days=1)
-        
-        return available_dates
+        # Skip weekends (config.WEEKENDS) and holidays
+        return ExamCalendar(start_date, end_date, holidays, closed_weekdays=config.WEEKENDS).dates()
     
     def get_subjects_for_year(self, year: int, exam_type: str) -> List[Dict]:
         """
@@ -130,32 +121,13 @@ class ExamScheduler:
         if last_exam is None:
             return True, ""
         
-        last_date = datetime.strptime(last_exam['date'], '%d.%m.%Y')
-        new_date_dt = datetime.strptime(new_date, '%d.%m.%Y')
-        last_session = last_exam['session']
-        last_type = last_exam['subject_type']
-        
-        days_diff = (new_date_dt - last_date).days
-        
-        # Heavy subject constraint: Need 1 full day gap
-        if last_type == 'HEAVY':
-            if days_diff < 2:  # Less than 1 full day gap
-                return False, f"Heavy subject needs 1 full day gap (only {days_diff} days)"
-        
-        # Non-major constraint: Need half-day gap
-        if last_type == 'NONMAJOR':
-            if days_diff == 0 and new_session == last_session:
-                return False, "Same session on same day for non-major"
-        
-        # AN session rule: If last was AN, next must be AN (next day) or day after tomorrow
-        if last_session == 'AN' and days_diff == 1:
-            if new_session == 'FN':
-                return False, "Cannot schedule FN next day after AN session"
-        
-        return True, ""
+        msg = gap_violation(last_exam['subject_type'], days_between(last_exam['date'], new_date),
+                            session_bit(last_exam['session']), session_bit(new_session))
+        return not msg, msg
     
     def schedule_semester_exams(self, year: int, start_date: str, end_date: str,
-                               holidays: List[str]) -> Tuple[List[Dict], List[Dict]]:
+                               holidays: List[str], mode: str = 'greedy',
+                               time_budget: Optional[float] = None) -> Tuple[List[Dict], List[Dict]]:
         """
         Schedule semester exams for given year
         
@@ -164,10 +136,16 @@ class ExamScheduler:
             start_date: Start date (DD.MM.YYYY)
             end_date: End date (DD.MM.YYYY)
             holidays: List of holiday dates
+            mode: 'greedy' (first valid slot per subject) or 'solver'
+                  (constraint solver: fewest violations, then shortest window)
+            time_budget: Solver search time in seconds (default config.SOLVER_TIME_BUDGET)
             
         Returns:
             Tuple of (schedule, violations)
         """
+        if mode not in config.SCHEDULING_MODES:
+            raise ValueError(f"Unknown scheduling mode: {mode}")
+        
         # Generate available dates
         available_dates = self.generate_available_dates(start_date, end_date, holidays)
         
@@ -191,45 +169,59 @@ class ExamScheduler:
         if len(subjects) > total_slots:
             print(f"   ⚠️  WARNING: Not enough slots! Need to extend date range.")
         
+        if mode == 'solver':
+            solver = ConstraintSolver(
+                subjects, available_dates, config.SEMESTER_SESSIONS,
+                time_budget=config.SOLVER_TIME_BUDGET if time_budget is None else time_budget
+            )
+            schedule, violations = solver.solve()
+            print(f"   Constraint solver: {solver.iterations} moves, {len(violations)} violations")
+            return schedule, violations
+        
         # Build conflict graph
         conflicts = self.build_conflict_graph(subjects)
         
         # Initialize schedule and tracking
         schedule = []
         violations = []
-        dept_last_exam = {}  # Track last exam per department
-        dept_date_usage = {}  # Track which dates are used per department (entire day)
+        dept_last_exam = {}  # Track last exam per department: (day ordinal, session bit, subject type)
+        dept_days_used = {}  # Days used per department (entire day), 1 per used day index
+        dept_next_day = {}  # First day index each department has not used yet
         
-        # Create slots
-        slots = []
-        for date in available_dates:
-            slots.append({'date': date, 'session': 'FN'})
-            slots.append({'date': date, 'session': 'AN'})
+        # Create slots as (day index, session index); the rules compare day
+        # ordinals and session bits, so no date strings are parsed in the scan
+        sessions = config.SEMESTER_SESSIONS
+        bits = [session_bit(session) for session in sessions]
+        day_ordinals = [to_ordinal(date) for date in available_dates]
+        slots = [(day, s) for day in range(len(available_dates)) for s in range(len(sessions))]
         
         # Schedule each subject
         for subject in subjects:
             subject_id = subject['subject_id']
             dept = subject['department']
             
-            scheduled = False
+            days_used = dept_days_used.setdefault(dept, bytearray(len(available_dates)))
+            last_exam = dept_last_exam.get(dept)
             best_slot = None
             violation_msg = None
             
-            # Try to find valid slot
-            for slot in slots:
-                date_key = f"{dept}_{slot['date']}"
+            # Try to find valid slot, starting at the department's first unused day
+            # (every earlier slot is on a day it already uses)
+            for slot in slots[dept_next_day.get(dept, 0) * len(sessions):]:
+                day, s = slot
                 
                 # Check if this date already used for this department (block entire day)
-                if date_key in dept_date_usage:
+                if days_used[day]:
                     continue
                 
                 # Validate gap constraints
-                last_exam = dept_last_exam.get(dept)
-                is_valid, msg = self.validate_gap_constraint(
-                    last_exam, slot['date'], slot['session']
-                )
+                if last_exam is None:
+                    msg = ""
+                else:
+                    last_day, last_bit, last_type = last_exam
+                    msg = gap_violation(last_type, day_ordinals[day] - last_day, last_bit, bits[s])
                 
-                if is_valid:
+                if not msg:
                     best_slot = slot
                     break
                 elif best_slot is None:
@@ -241,26 +233,26 @@ class ExamScheduler:
                 raise ValueError(f"No slots available for {subject['subject_code']}")
             
             # Assign to best slot and block entire day for this department
-            date_key = f"{dept}_{best_slot['date']}"
-            dept_date_usage[date_key] = subject_id
+            day, s = best_slot
+            days_used[day] = 1
+            next_day = dept_next_day.get(dept, 0)
+            while next_day < len(days_used) and days_used[next_day]:
+                next_day += 1
+            dept_next_day[dept] = next_day
             
             schedule.append({
                 'subject_id': subject_id,
                 'subject_code': subject['subject_code'],
                 'subject_name': subject['subject_name'],
                 'department': dept,
-                'date': best_slot['date'],
-                'session': best_slot['session'],
+                'date': available_dates[day],
+                'session': sessions[s],
                 'subject_type': subject['subject_type'],
                 'student_count': subject['student_count']
             })
             
             # Update last exam for department
-            dept_last_exam[dept] = {
-                'date': best_slot['date'],
-                'session': best_slot['session'],
-                'subject_type': subject['subject_type']
-            }
+            dept_last_exam[dept] = (day_ordinals[day], bits[s], subject['subject_type'])
             
             # Log violation if any
             if violation_msg:
@@ -365,25 +357,23 @@ class ExamScheduler:
             schedule: List of scheduled exams
             violations: List of constraint violations
         """
-        # Insert schedule
-        for item in schedule:
-            self.cursor.execute('''
+        # Insert schedule and violations in one transaction
+        with self.conn:
+            self.cursor.executemany('''
             INSERT INTO exam_schedule 
             (exam_cycle_id, subject_id, department, exam_date, session, student_count)
             VALUES (?, ?, ?, ?, ?, ?)
-            ''', (cycle_id, item['subject_id'], item['department'], 
-                  item['date'], item['session'], item['student_count']))
-        
-        # Insert violations
-        for violation in violations:
-            self.cursor.execute('''
+            ''', [(cycle_id, item['subject_id'], item['department'], 
+                    item['date'], item['session'], item['student_count'])
+                  for item in schedule])
+            
+            self.cursor.executemany('''
             INSERT INTO schedule_violations
             (exam_cycle_id, subject_id, violation_type, description, severity)
             VALUES (?, ?, ?, ?, ?)
-            ''', (cycle_id, violation['subject_id'], violation['violation_type'],
-                  violation['description'], violation['severity']))
-        
-        self.conn.commit()
+            ''', [(cycle_id, violation['subject_id'], violation['violation_type'],
+                   violation['description'], violation['severity'])
+                  for violation in violations])
     
     def create_exam_cycle(self, exam_type: str, year: int, 
                          start_date: str, end_date: str) -> int:
@@ -2,13 +2,15 @@ import os
 import socket
 import sqlite3
 import io
-import base64
+import sys
 from pathlib import Path
 from flask import Flask, render_template, request, redirect, url_for, make_response, send_file
 from jinja2 import Environment, FileSystemLoader
-import qrcode
 import pdfkit
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from qr_cache import default_cache, ERROR_CORRECT_M
+
 app = Flask(__name__)
 TEMPLATES_DIR = os.path.join(os.path.dirname(__file__), 'templates')
 DB_PATH = Path(__file__).with_name('students.db')
@@ -85,17 +87,8 @@ def fetch_student_and_subjects(reg_no):
 
 
 def generate_qr_base64(url):
-    """Generate QR code as base64 string"""
-    qr = qrcode.QRCode(version=1, box_size=10, border=2)
-    qr.add_data(url)
-    qr.make(fit=True)
-    img = qr.make_image(fill_color="black", back_color="white")
-    
-    buffer = io.BytesIO()
-    img.save(buffer, format='PNG')
-    buffer.seek(0)
-    
-    return base64.b64encode(buffer.read()).decode()
+    """Generate QR code as base64 string (cached by URL)"""
+    return default_cache.base64(url, border=2, error_correction=ERROR_CORRECT_M)
 
 
 def generate_hall_ticket_pdf(reg_no):
@@ -11,31 +11,42 @@ from pathlib import Path
 from datetime import datetime
 from bson import ObjectId
 from pymongo import MongoClient
-import qrcode
-from io import BytesIO
-import base64
+from qr_cache import default_cache
+from pdf_cache import default_cache as pdf_cache
+from exam_calendar import reformat, ISO_FORMAT
 
-# Import ReportLab for PDF generation
-from reportlab.lib.pagesizes import A4
-from reportlab.lib import colors
-from reportlab.lib.units import mm
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.enums import TA_CENTER, TA_LEFT
+# qrcode and ReportLab are imported inside the methods that render tickets, so
+# argument and schedule errors are reported without loading them.
+
+MONGO_URI = 'mongodb://localhost:27017/'
+DB_NAME = 'exam_management'
+
+# Student fields read when rendering a ticket
+TICKET_FIELDS = [
+    'name', 'studentName', 'registerNumber', 'registerNo', 'regno', 'reg_no',
+    'degree', 'branch', 'dateOfBirth', 'semester', 'sem', 'gender', 'regulation',
+    'yearOfStudy', 'year'
+]
+
+# Part of the PDF cache key, bump when the ticket layout changes
+TICKET_TEMPLATE_VERSION = 1
 
 
 class MongoHallTicketGenerator:
     """Generates hall tickets from MongoDB data"""
     
-    def __init__(self, schedule_id=None):
-        """Initialize generator with MongoDB connection"""
-        self.client = MongoClient('mongodb://localhost:27017/')
-        self.db = self.client['exam_management']
+    def __init__(self, schedule_id=None, client=None):
+        """Initialize generator with MongoDB connection (reuses client if given)"""
+        self.owns_client = client is None
+        self.client = client if client is not None else MongoClient(MONGO_URI)
+        self.db = self.client[DB_NAME]
         self.schedules = self.db['schedules']
         self.students = self.db['students']
         self.subjects = self.db['subjects']
         self.schedule_id = ObjectId(schedule_id) if schedule_id else None
         self.schedule_data = None
+        self._template = None
+        self._subjects_by_group = {}
         
     def load_schedule_data(self):
         """Load schedule information from MongoDB"""
@@ -48,28 +59,13 @@ class MongoHallTicketGenerator:
             raise ValueError(f"Schedule not found: {self.schedule_id}")
             
         self.schedule_data = schedule
+        self._template = None
+        self._subjects_by_group = {}
         return schedule
         
     def generate_qr_base64(self, data):
-        """Generate QR code as base64 image"""
-        qr = qrcode.QRCode(
-            version=1,
-            error_correction=qrcode.constants.ERROR_CORRECT_L,
-            box_size=10,
-            border=4,
-        )
-        qr.add_data(data)
-        qr.make(fit=True)
-        
-        img = qr.make_image(fill_color="black", back_color="white")
-        
-        # Convert to base64
-        buffer = BytesIO()
-        img.save(buffer, format='PNG')
-        buffer.seek(0)
-        img_base64 = base64.b64encode(buffer.getvalue()).decode()
-        
-        return img_base64
+        """Generate QR code as base64 image (cached by content)"""
+        return default_cache.base64(data)
         
     def fetch_student_data(self, register_number):
         """Fetch student information from MongoDB"""
@@ -119,8 +115,7 @@ class MongoHallTicketGenerator:
                 elif isinstance(exam_date, str) and exam_date:
                     try:
                         # Try to parse and reformat
-                        dt = datetime.strptime(exam_date, '%Y-%m-%d')
-                        exam_date = dt.strftime('%d.%m.%Y')
+                        exam_date = reformat(exam_date, ISO_FORMAT, '%d.%m.%Y')
                     except:
                         pass
                 
@@ -134,28 +129,23 @@ class MongoHallTicketGenerator:
         
         return subjects_list
         
-    def create_hall_ticket_pdf(self, student_data, subjects, qr_image):
-        """Create hall ticket PDF using ReportLab"""
+    def _ticket_template(self):
+        """
+        Build the styles, table styles and static header flowables once
         
-        # Get student fields with fallbacks
-        name = student_data.get('name') or student_data.get('studentName', '')
-        reg_no = (student_data.get('registerNumber') or 
-                 student_data.get('registerNo') or 
-                 student_data.get('regno') or 
-                 student_data.get('reg_no', ''))
+        They only depend on the schedule, so every ticket of a run shares them
+        and only the student fields vary.
+        """
+        if self._template is not None:
+            return self._template
         
-        deg = student_data.get('degree', 'B.Tech')
-        branch = student_data.get('branch', '')
-        dob = student_data.get('dateOfBirth', '')
-        if isinstance(dob, datetime):
-            dob = dob.strftime('%d.%m.%Y')
-            
-        sem = str(student_data.get('semester') or student_data.get('sem', ''))
-        gender = student_data.get('gender', '')
-        regulation = student_data.get('regulation', '')
+        from reportlab.lib import colors
+        from reportlab.lib.units import mm
+        from reportlab.platypus import TableStyle, Paragraph
+        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+        from reportlab.lib.enums import TA_CENTER
         
         # Get exam session from schedule
-        exam_type = self.schedule_data.get('examType', 'SEM')
         academic_year = self.schedule_data.get('academicYear', '')
         semester_name = self.schedule_data.get('semester', '')
         
@@ -213,37 +203,17 @@ class MongoHallTicketGenerator:
             alignment=TA_CENTER
         )
         
-        # Build story
-        story = []
-        
         # Header
-        story.append(Paragraph("MARRI LAXMAN REDDY INSTITUTE OF TECHNOLOGY", title_style))
-        story.append(Paragraph("HYDERABAD – 43", subtitle_style))
-        story.append(Paragraph("[An Autonomous Institution]", small_center_style))
-        story.append(Paragraph("OFFICE OF THE CONTROLLER OF EXAMINATION", heading_style))
-        story.append(Paragraph("HALL TICKET", heading_style))
-        story.append(Paragraph(semtime, exam_style))
-        
-        # Add QR code (top right)
-        story.append(Spacer(1, 5*mm))
-        if qr_image:
-            qr_img = Image(qr_image, width=35*mm, height=35*mm)
-            story.append(qr_img)
-            story.append(Spacer(1, 5*mm))
-        
-        # Student information table
-        info_data = [
-            [Paragraph('<b>Name:</b> ' + name, styles['Normal']), 
-             Paragraph('<b>Register Number:</b> ' + reg_no, styles['Normal'])],
-            [Paragraph('<b>Degree & Branch:</b> ' + deg + ' AND ' + branch, styles['Normal']), ''],
-            [Paragraph('<b>Date of Birth:</b> ' + dob, styles['Normal']), 
-             Paragraph('<b>Semester:</b> ' + sem, styles['Normal'])],
-            [Paragraph('<b>Gender:</b> ' + gender, styles['Normal']), 
-             Paragraph('<b>Regulation:</b> ' + regulation, styles['Normal'])]
+        header = [
+            Paragraph("MARRI LAXMAN REDDY INSTITUTE OF TECHNOLOGY", title_style),
+            Paragraph("HYDERABAD – 43", subtitle_style),
+            Paragraph("[An Autonomous Institution]", small_center_style),
+            Paragraph("OFFICE OF THE CONTROLLER OF EXAMINATION", heading_style),
+            Paragraph("HALL TICKET", heading_style),
+            Paragraph(semtime, exam_style)
         ]
         
-        info_table = Table(info_data, colWidths=[95*mm, 95*mm])
-        info_table.setStyle(TableStyle([
+        info_table_style = TableStyle([
             ('GRID', (0, 0), (-1, -1), 1, colors.black),
             ('BACKGROUND', (0, 0), (-1, -1), colors.white),
             ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
@@ -252,7 +222,81 @@ class MongoHallTicketGenerator:
             ('TOPPADDING', (0, 0), (-1, -1), 2*mm),
             ('BOTTOMPADDING', (0, 0), (-1, -1), 2*mm),
             ('SPAN', (0, 1), (1, 1)),  # Merge degree & branch row
-        ]))
+        ])
+        
+        subjects_table_style = TableStyle([
+            ('GRID', (0, 0), (-1, -1), 1, colors.black),
+            ('BACKGROUND', (0, 0), (-1, 0), colors.white),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+            ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+            ('ALIGN', (0, 1), (0, -1), 'CENTER'),  # Sem column
+            ('ALIGN', (2, 1), (2, -1), 'CENTER'),  # Session column
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 10),
+            ('FONTSIZE', (0, 1), (-1, -1), 9),
+            ('LEFTPADDING', (0, 0), (-1, -1), 2*mm),
+            ('RIGHTPADDING', (0, 0), (-1, -1), 2*mm),
+            ('TOPPADDING', (0, 0), (-1, -1), 2*mm),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 2*mm),
+        ])
+        
+        self._template = {
+            'normal_style': styles['Normal'],
+            'header': header,
+            'info_table_style': info_table_style,
+            'subjects_table_style': subjects_table_style
+        }
+        return self._template
+        
+    def create_hall_ticket_pdf(self, student_data, subjects, qr_image):
+        """Create hall ticket PDF using ReportLab"""
+        from reportlab.lib.units import mm
+        from reportlab.platypus import Table, Paragraph, Spacer, Image, Flowable
+        
+        template = self._ticket_template()
+        normal_style = template['normal_style']
+        
+        # Get student fields with fallbacks
+        name = student_data.get('name') or student_data.get('studentName', '')
+        reg_no = (student_data.get('registerNumber') or 
+                 student_data.get('registerNo') or 
+                 student_data.get('regno') or 
+                 student_data.get('reg_no', ''))
+        
+        deg = student_data.get('degree', 'B.Tech')
+        branch = student_data.get('branch', '')
+        dob = student_data.get('dateOfBirth', '')
+        if isinstance(dob, datetime):
+            dob = dob.strftime('%d.%m.%Y')
+            
+        sem = str(student_data.get('semester') or student_data.get('sem', ''))
+        gender = student_data.get('gender', '')
+        regulation = student_data.get('regulation', '')
+        
+        # Build story, starting from the shared header
+        story = list(template['header'])
+        
+        # Add QR code (top right), either a drawing from the QR cache or image data
+        story.append(Spacer(1, 5*mm))
+        if qr_image:
+            qr_img = qr_image if isinstance(qr_image, Flowable) else Image(qr_image, width=35*mm, height=35*mm)
+            story.append(qr_img)
+            story.append(Spacer(1, 5*mm))
+        
+        # Student information table
+        info_data = [
+            [Paragraph('<b>Name:</b> ' + name, normal_style), 
+             Paragraph('<b>Register Number:</b> ' + reg_no, normal_style)],
+            [Paragraph('<b>Degree & Branch:</b> ' + deg + ' AND ' + branch, normal_style), ''],
+            [Paragraph('<b>Date of Birth:</b> ' + dob, normal_style), 
+             Paragraph('<b>Semester:</b> ' + sem, normal_style)],
+            [Paragraph('<b>Gender:</b> ' + gender, normal_style), 
+             Paragraph('<b>Regulation:</b> ' + regulation, normal_style)]
+        ]
+        
+        info_table = Table(info_data, colWidths=[95*mm, 95*mm])
+        info_table.setStyle(template['info_table_style'])
         
         story.append(info_table)
         story.append(Spacer(1, 5*mm))
@@ -274,27 +318,63 @@ class MongoHallTicketGenerator:
             colWidths=[19*mm, 28.5*mm, 22.8*mm, 34.2*mm, 85.5*mm]
         )
         
-        subjects_table.setStyle(TableStyle([
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('BACKGROUND', (0, 0), (-1, 0), colors.white),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-            ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-            ('ALIGN', (0, 1), (0, -1), 'CENTER'),  # Sem column
-            ('ALIGN', (2, 1), (2, -1), 'CENTER'),  # Session column
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 10),
-            ('FONTSIZE', (0, 1), (-1, -1), 9),
-            ('LEFTPADDING', (0, 0), (-1, -1), 2*mm),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 2*mm),
-            ('TOPPADDING', (0, 0), (-1, -1), 2*mm),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 2*mm),
-        ]))
+        subjects_table.setStyle(template['subjects_table_style'])
         
         story.append(subjects_table)
         
         return story
         
+    def _qr_code(self, register_number):
+        """Verification QR code for a register number as a vector drawing"""
+        from reportlab.lib.units import mm
+        
+        qr_data = f"http://localhost:5000/verify/{register_number}"
+        return default_cache.drawing(qr_data, 35*mm)
+        
+    def _ticket_document(self, output_path):
+        """Create the A4 document template hall tickets are built into"""
+        from reportlab.lib.pagesizes import A4
+        from reportlab.lib.units import mm
+        from reportlab.platypus import SimpleDocTemplate
+        
+        return SimpleDocTemplate(
+            str(output_path),
+            pagesize=A4,
+            leftMargin=15*mm,
+            rightMargin=15*mm,
+            topMargin=15*mm,
+            bottomMargin=15*mm
+        )
+        
+    def _build_ticket(self, student_data, subjects, register_number, output_path):
+        """
+        Render one hall ticket for an already loaded student and subject list
+        
+        The PDF is reused from the output cache while the student record,
+        subjects and schedule header are unchanged.
+        """
+        cache_key = pdf_cache.key(
+            'hall_ticket', TICKET_TEMPLATE_VERSION,
+            [self.schedule_data.get('academicYear'), self.schedule_data.get('semester')],
+            {field: student_data.get(field) for field in TICKET_FIELDS},
+            subjects,
+            register_number
+        )
+        if pdf_cache.fetch(cache_key, output_path):
+            return str(output_path)
+            
+        # Create PDF
+        doc = self._ticket_document(output_path)
+        
+        # Build content
+        story = self.create_hall_ticket_pdf(student_data, subjects, self._qr_code(register_number))
+        
+        # Generate PDF
+        doc.build(story)
+        pdf_cache.store(cache_key, output_path)
+        
+        return str(output_path)
+        
     def generate_hall_ticket_pdf(self, register_number, output_path=None):
         """Generate hall ticket PDF for a student"""
         
@@ -308,50 +388,214 @@ class MongoHallTicketGenerator:
         # Fetch subjects
         subjects = self.fetch_subjects_for_student(student_data)
         
-        # Generate QR code image
-        qr_data = f"http://localhost:5000/verify/{register_number}"
-        qr = qrcode.QRCode(
-            version=1,
-            error_correction=qrcode.constants.ERROR_CORRECT_L,
-            box_size=10,
-            border=4,
-        )
-        qr.add_data(qr_data)
-        qr.make(fit=True)
-        
-        img = qr.make_image(fill_color="black", back_color="white")
-        
-        # Save QR code to BytesIO
-        qr_buffer = BytesIO()
-        img.save(qr_buffer, format='PNG')
-        qr_buffer.seek(0)
-        
         # Default output path if not provided
         if not output_path:
             output_dir = Path(__file__).parent.parent / 'outputs' / 'hall_tickets'
             output_dir.mkdir(parents=True, exist_ok=True)
             output_path = output_dir / f'hall_ticket_{register_number}.pdf'
         
-        # Create PDF
-        doc = SimpleDocTemplate(
-            str(output_path),
-            pagesize=A4,
-            leftMargin=15*mm,
-            rightMargin=15*mm,
-            topMargin=15*mm,
-            bottomMargin=15*mm
-        )
+        return self._build_ticket(student_data, subjects, register_number, output_path)
+        
+    def _subjects_for(self, student):
+        """Subject list for a student, computed once per (year, semester) group"""
+        # The only student fields fetch_subjects_for_student reads
+        group = (student.get('yearOfStudy') or student.get('year'),
+                 student.get('semester') or student.get('sem'))
+        if group not in self._subjects_by_group:
+            self._subjects_by_group[group] = self.fetch_subjects_for_student(student)
+        return self._subjects_by_group[group]
+        
+    def _merged_groups(self, students_list, merge):
+        """
+        Split students into (group name, students) pairs for merged output
+        
+        merge='all' puts everyone in one document, 'department' groups by
+        department name and 'hall' groups by the seating allocation of this
+        schedule, ordered by seat so printed stacks match the hall.
+        """
+        if merge == 'all':
+            return [('all', students_list)]
+            
+        groups = {}
+        
+        if merge == 'department':
+            dept_ids = list({s['department'] for s in students_list if isinstance(s.get('department'), ObjectId)})
+            dept_names = {}
+            if dept_ids:
+                for dept in self.db['departments'].find({'_id': {'$in': dept_ids}}, {'name': 1}):
+                    dept_names[dept['_id']] = dept.get('name')
+                    
+            for student in students_list:
+                name = dept_names.get(student.get('department')) or student.get('branch') or 'unknown'
+                groups.setdefault(name, []).append(student)
+                
+        elif merge == 'hall':
+            seats = {}
+            allocations = self.db['allocations'].find(
+                {'schedule': self.schedule_id},
+                {'student': 1, 'hallNumber': 1, 'seatNumber': 1, 'isLeftSeat': 1}
+            )
+            for alloc in allocations:
+                # Left seat before right seat on the same bench
+                seats[alloc.get('student')] = (str(alloc.get('hallNumber') or 'unknown'),
+                                               alloc.get('seatNumber') or 0,
+                                               not alloc.get('isLeftSeat', True))
+                
+            for student in students_list:
+                hall = seats[student['_id']][0] if student.get('_id') in seats else 'unallocated'
+                groups.setdefault(hall, []).append(student)
+                
+            for hall, students in groups.items():
+                if hall != 'unallocated':
+                    students.sort(key=lambda s: seats[s['_id']][1:])
+                    
+        else:
+            raise ValueError(f"Unknown merge mode: {merge}")
+            
+        return sorted(groups.items())
         
-        # Build content
-        story = self.create_hall_ticket_pdf(student_data, subjects, qr_buffer)
+    def _build_merged_tickets(self, students, output_path):
+        """
+        Build the tickets of several students into one PDF, one page break apart
         
-        # Generate PDF
-        doc.build(story)
+        Returns (entries, page_count). There is one entry per student like
+        _generate_student_ticket, with the 1-based page each successful
+        ticket starts on.
+        """
+        from reportlab.platypus import PageBreak, Spacer
         
-        return str(output_path)
+        story = []
+        entries = []
+        built = []
+        # Zero-height marker flowable per ticket -> its entry, to record start pages
+        markers = {}
+        
+        for student in students:
+            reg_no = (student.get('registerNumber') or 
+                     student.get('registerNo') or 
+                     student.get('regno') or 
+                     student.get('reg_no'))
+            
+            if not reg_no:
+                entries.append({'success': False, 'student': str(student.get('_id')), 'error': 'No register number'})
+                continue
+                
+            try:
+                ticket = self.create_hall_ticket_pdf(student, self._subjects_for(student), self._qr_code(reg_no))
+            except Exception as e:
+                entries.append({'success': False, 'student': str(student.get('_id')), 'error': str(e)})
+                continue
+                
+            entry = {
+                'success': True,
+                'registerNumber': reg_no,
+                'name': student.get('name') or student.get('studentName'),
+                'pdfPath': str(output_path)
+            }
+            entries.append(entry)
+            built.append((entry, student))
+            
+            if story:
+                story.append(PageBreak())
+            marker = Spacer(0, 0)
+            markers[id(marker)] = entry
+            story.append(marker)
+            story.extend(ticket)
+            
+        if not story:
+            return entries, 0
+            
+        doc = self._ticket_document(output_path)
+        
+        def record_page(flowable):
+            if id(flowable) in markers:
+                markers[id(flowable)]['page'] = doc.page
+                
+        doc.afterFlowable = record_page
+        
+        try:
+            doc.build(story)
+        except Exception as e:
+            # The whole document failed, so none of its tickets were written
+            for entry, student in built:
+                entry.clear()
+                entry.update({'success': False, 'student': str(student.get('_id')), 'error': str(e)})
+            return entries, 0
+            
+        return entries, doc.page
+        
+    def _generate_student_ticket(self, student, output_dir):
+        """
+        Render the ticket for one loaded student
+        
+        Returns {'success': True, 'registerNumber', 'name', 'pdfPath'} or
+        {'success': False, 'student', 'error'}; errors never propagate so one
+        bad record does not stop a bulk run.
+        """
+        try:
+            reg_no = (student.get('registerNumber') or 
+                     student.get('registerNo') or 
+                     student.get('regno') or 
+                     student.get('reg_no'))
+            
+            if not reg_no:
+                return {'success': False, 'student': str(student.get('_id')), 'error': 'No register number'}
+                
+            pdf_path = self._build_ticket(
+                student,
+                self._subjects_for(student),
+                reg_no,
+                Path(output_dir) / f'hall_ticket_{reg_no}.pdf'
+            )
+            
+            return {
+                'success': True,
+                'registerNumber': reg_no,
+                'name': student.get('name') or student.get('studentName'),
+                'pdfPath': pdf_path
+            }
+            
+        except Exception as e:
+            return {
+                'success': False,
+                'student': str(student.get('_id')),
+                'error': str(e)
+            }
         
-    def generate_bulk_hall_tickets(self, year=None, output_dir=None):
-        """Generate hall tickets for all students in a year"""
+    def _generate_tickets_parallel(self, students_list, output_dir, workers):
+        """Shard students across worker processes, yielding results in input order"""
+        from concurrent.futures import ProcessPoolExecutor
+        
+        # Small chunks keep progress steady while amortising the pickling overhead
+        chunksize = max(1, len(students_list) // (workers * 8))
+        
+        with ProcessPoolExecutor(max_workers=workers,
+                                 initializer=_init_ticket_worker,
+                                 initargs=(self.schedule_id, self.schedule_data)) as executor:
+            yield from executor.map(_render_student_ticket, students_list,
+                                    [str(output_dir)] * len(students_list),
+                                    chunksize=chunksize)
+        
+    def generate_bulk_hall_tickets(self, year=None, output_dir=None, workers=1, progress=None, merge=None):
+        """
+        Generate hall tickets for all students in a year
+        
+        Students are loaded in one query and rendered from those documents.
+        The subject list only depends on a student's year and semester, so it
+        is computed once per group and shared with the ticket template.
+        
+        Args:
+            year: Year of study to generate for (all students if None)
+            output_dir: Directory for the PDFs (outputs/hall_tickets by default)
+            workers: Worker processes, each with its own MongoDB connection
+            progress: Optional callback(entry, done, total) called per student
+                      with the entry returned by _generate_student_ticket
+            merge: None for one PDF per student, or 'all', 'department' or
+                   'hall' to build each group into a single multi-page PDF.
+                   Merged runs build one document per group in this process
+                   and also return 'documents' and a register number ->
+                   {'pdfPath', 'page'} 'index' for extracting single tickets.
+        """
         
         if not self.schedule_data:
             self.load_schedule_data()
@@ -364,7 +608,10 @@ class MongoHallTicketGenerator:
                 {'year': year}
             ]}
             
-        students_list = list(self.students.find(query))
+        # department is only needed to group the merged output, it stays out of
+        # TICKET_FIELDS (and so out of the ticket cache key)
+        fields = TICKET_FIELDS + ['department'] if merge == 'department' else TICKET_FIELDS
+        students_list = list(self.students.find(query, fields))
         
         if not students_list:
             return {
@@ -378,38 +625,41 @@ class MongoHallTicketGenerator:
             output_dir = Path(__file__).parent.parent / 'outputs' / 'hall_tickets'
             output_dir.mkdir(parents=True, exist_ok=True)
             
+        documents = []
+        
+        if merge:
+            def merged_results():
+                for group, students in self._merged_groups(students_list, merge):
+                    output_path = Path(output_dir) / f'hall_tickets_{self.schedule_id}_{_safe_filename(group)}.pdf'
+                    entries, page_count = self._build_merged_tickets(students, output_path)
+                    if page_count:
+                        documents.append({
+                            'group': group,
+                            'pdfPath': str(output_path),
+                            'tickets': sum(1 for entry in entries if entry['success']),
+                            'pages': page_count
+                        })
+                    yield from entries
+                    
+            results = merged_results()
+        elif workers > 1 and len(students_list) > 1:
+            results = self._generate_tickets_parallel(students_list, output_dir, workers)
+        else:
+            results = (self._generate_student_ticket(student, output_dir) for student in students_list)
+            
         generated = []
         errors = []
         
-        for student in students_list:
-            try:
-                reg_no = (student.get('registerNumber') or 
-                         student.get('registerNo') or 
-                         student.get('regno') or 
-                         student.get('reg_no'))
+        for done, entry in enumerate(results, 1):
+            if entry['success']:
+                generated.append({k: entry[k] for k in ('registerNumber', 'name', 'pdfPath', 'page') if k in entry})
+            else:
+                errors.append({k: entry[k] for k in ('student', 'error')})
                 
-                if not reg_no:
-                    errors.append({'student': str(student.get('_id')), 'error': 'No register number'})
-                    continue
-                    
-                pdf_path = self.generate_hall_ticket_pdf(
-                    reg_no, 
-                    output_path=Path(output_dir) / f'hall_ticket_{reg_no}.pdf'
-                )
+            if progress:
+                progress(entry, done, len(students_list))
                 
-                generated.append({
-                    'registerNumber': reg_no,
-                    'name': student.get('name') or student.get('studentName'),
-                    'pdfPath': pdf_path
-                })
-                
-            except Exception as e:
-                errors.append({
-                    'student': str(student.get('_id')),
-                    'error': str(e)
-                })
-                
-        return {
+        result = {
             'success': True,
             'generated': generated,
             'errors': errors,
@@ -418,35 +668,72 @@ class MongoHallTicketGenerator:
             'failed': len(errors)
         }
         
+        if merge:
+            result['documents'] = documents
+            result['index'] = {
+                entry['registerNumber']: {'pdfPath': entry['pdfPath'], 'page': entry['page']}
+                for entry in generated
+            }
+            
+        return result
+        
     def close(self):
-        """Close MongoDB connection"""
-        if self.client:
+        """Close MongoDB connection unless it was passed in"""
+        if self.client and self.owns_client:
             self.client.close()
 
 
-def main():
-    """CLI interface for backend integration"""
-    if len(sys.argv) < 3:
-        print(json.dumps({
+def _safe_filename(name):
+    """Make a group name (department or hall) safe to use in a file name"""
+    return ''.join(c if c.isalnum() or c in '-_' else '_' for c in str(name))
+
+
+_worker_generator = None
+
+
+def _init_ticket_worker(schedule_id, schedule_data):
+    """Give each bulk worker process its own generator and MongoDB connection"""
+    global _worker_generator
+    _worker_generator = MongoHallTicketGenerator(schedule_id)
+    _worker_generator.schedule_data = schedule_data
+
+
+def _render_student_ticket(student, output_dir):
+    """Render one student's ticket in a bulk worker process"""
+    return _worker_generator._generate_student_ticket(student, output_dir)
+
+
+def _print_progress(entry, done, total):
+    """Stream one bulk result as a JSON line ahead of the final summary"""
+    print(json.dumps({'event': 'progress', 'done': done, 'total': total, **entry}), flush=True)
+
+
+def run_command(args, client=None):
+    """
+    Run one command and return (result, exit_code)
+    
+    Used by main() and by the worker daemon, which passes its pooled client.
+    """
+    if len(args) < 2:
+        return {
             'success': False,
             'error': 'Usage: hall_ticket_wrapper.py <schedule_id> <command> [args]'
-        }))
-        return 1
+        }, 1
         
-    schedule_id = sys.argv[1]
-    command = sys.argv[2]
+    schedule_id = args[0]
+    command = args[1]
     
     generator = None
     
     try:
-        generator = MongoHallTicketGenerator(schedule_id)
+        generator = MongoHallTicketGenerator(schedule_id, client=client)
         
         if command == 'generate_single':
             # Generate single hall ticket
-            if len(sys.argv) < 4:
+            if len(args) < 3:
                 raise ValueError("Register number required for generate_single")
                 
-            register_number = sys.argv[3]
+            register_number = args[2]
             pdf_path = generator.generate_hall_ticket_pdf(register_number)
             
             result = {
@@ -456,9 +743,25 @@ def main():
             }
             
         elif command == 'generate_bulk':
-            # Generate bulk hall tickets
-            year = int(sys.argv[3]) if len(sys.argv) > 3 else None
-            result = generator.generate_bulk_hall_tickets(year)
+            # Generate bulk hall tickets: [year] [--workers N] [--merge all|department|hall] [--progress]
+            options = list(args[2:])
+            workers = int(os.environ.get('HALL_TICKET_WORKERS', '1'))
+            if '--workers' in options:
+                i = options.index('--workers')
+                workers = int(options[i + 1])
+                del options[i:i + 2]
+            merge = None
+            if '--merge' in options:
+                i = options.index('--merge')
+                merge = options[i + 1]
+                del options[i:i + 2]
+            progress = None
+            if '--progress' in options:
+                options.remove('--progress')
+                progress = _print_progress
+                
+            year = int(options[0]) if options else None
+            result = generator.generate_bulk_hall_tickets(year, workers=workers, progress=progress, merge=merge)
             
         else:
             result = {
@@ -466,20 +769,32 @@ def main():
                 'error': f'Unknown command: {command}'
             }
             
-        print(json.dumps(result))
-        return 0
+        return result, 0
         
     except Exception as e:
-        print(json.dumps({
+        return {
             'success': False,
             'error': str(e)
-        }))
-        return 1
+        }, 1
         
     finally:
         if generator:
             generator.close()
 
 
+def main():
+    """CLI interface for backend integration"""
+    args = sys.argv[1:]
+    
+    # Hand the command to the worker daemon when one is running. Progress lines
+    # must reach this process's stdout, so --progress runs stay in-process.
+    from worker_client import run_in_worker
+    streamed = '--progress' in args
+    result, exit_code = (None if streamed else run_in_worker('hall_ticket_wrapper.py', args)) or run_command(args)
+    
+    print(json.dumps(result))
+    return exit_code
+
+
 if __name__ == '__main__':
     sys.exit(main())
@@ -0,0 +1,160 @@
+"""
+PDF Output Cache for the Wrappers
+---------------------------------
+Hall tickets, seating PDFs and timetables are pure functions of their inputs
+(schedule, allocations, timetable entries, student record and the template
+version). PDFCache stores every rendered PDF under a hash of those inputs, so
+a repeated download is a hash lookup and a hard link instead of a full render.
+
+- cache files live in one directory (PDF_CACHE_DIR), outside the upload
+  folders the backend serves
+- a hit links (or copies) the cached file to the requested output path, so
+  paths the backend has stored keep working after the entry is evicted
+- entries older than PDF_CACHE_MAX_AGE_DAYS are deleted, then the least
+  recently used ones until the cache fits in PDF_CACHE_MAX_MB; a marker file
+  in the cache directory records the last sweep, so the limits hold when
+  every CLI process stores a single PDF
+
+Bump a wrapper's template version whenever its layout changes, so older
+renders are no longer served.
+"""
+
+import os
+import json
+import time
+import shutil
+import hashlib
+import threading
+from pathlib import Path
+
+CACHE_DIR = Path(os.environ.get('PDF_CACHE_DIR', Path(__file__).parent.parent / 'outputs' / 'pdf_cache'))
+MAX_BYTES = int(float(os.environ.get('PDF_CACHE_MAX_MB', '512')) * 1024 * 1024)
+MAX_AGE_DAYS = float(os.environ.get('PDF_CACHE_MAX_AGE_DAYS', '30'))
+
+# Sweep the cache at most once per this many seconds, across all processes
+SWEEP_INTERVAL = 300
+SWEEP_MARKER = '.last_sweep'
+
+
+class PDFCache:
+    """Content-addressed store of rendered PDFs with size and age eviction"""
+
+    def __init__(self, cache_dir=CACHE_DIR, max_bytes=MAX_BYTES, max_age_days=MAX_AGE_DAYS):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.max_age = max_age_days * 24 * 3600
+
+    def key(self, kind, version, *inputs):
+        """
+        Hash of everything a PDF is rendered from
+
+        inputs must be JSON-like (dicts, lists, strings, numbers); ObjectIds
+        and datetimes are hashed through str(). Dict order does not matter.
+        """
+        payload = json.dumps([kind, version, inputs], sort_keys=True, default=str, separators=(',', ':'))
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _path(self, key):
+        return self.cache_dir / key[:2] / f'{key}.pdf'
+
+    def fetch(self, key, output_path):
+        """
+        Place the cached PDF for key at output_path
+
+        Returns True on a hit. On a miss any existing file at output_path is
+        removed first: it may be a link to a cached entry, and rendering into
+        it in place would corrupt that entry.
+        """
+        output_path = Path(output_path)
+        cached = self._path(key)
+
+        try:
+            os.utime(cached)
+        except OSError:
+            try:
+                output_path.unlink()
+            except OSError:
+                pass
+            return False
+
+        try:
+            if output_path.exists() and os.path.samefile(cached, output_path):
+                return True
+            _link_or_copy(cached, output_path)
+        except OSError:
+            return False
+        return True
+
+    def store(self, key, output_path):
+        """Add a freshly rendered PDF to the cache"""
+        cached = self._path(key)
+        try:
+            cached.parent.mkdir(parents=True, exist_ok=True)
+            _link_or_copy(output_path, cached)
+        except OSError:
+            # The cache is an optimisation only
+            return
+
+        if self._sweep_due():
+            self.evict()
+
+    def _sweep_due(self):
+        """True when no process has swept for SWEEP_INTERVAL; claims the sweep"""
+        marker = self.cache_dir / SWEEP_MARKER
+        try:
+            if time.time() - marker.stat().st_mtime < SWEEP_INTERVAL:
+                return False
+        except OSError:
+            pass
+        try:
+            marker.touch()
+        except OSError:
+            return False
+        return True
+
+    def evict(self):
+        """Delete expired entries, then the least recently used beyond max_bytes"""
+        try:
+            entries = []
+            for subdir in self.cache_dir.iterdir():
+                if subdir.is_dir():
+                    for entry in subdir.iterdir():
+                        stat = entry.stat()
+                        entries.append((stat.st_mtime, stat.st_size, entry))
+        except OSError:
+            return 0
+
+        entries.sort(key=lambda item: item[0])
+        total = sum(size for _, size, _ in entries)
+        expired_before = time.time() - self.max_age
+
+        removed = 0
+        for mtime, size, path in entries:
+            if mtime >= expired_before and total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        return removed
+
+
+def _link_or_copy(source, target):
+    """Atomically make target a hard link to source, copying across filesystems"""
+    target = Path(target)
+    # Unique per thread too, threads of one process may store the same key at once
+    tmp_path = target.with_name(f'{target.name}.{os.getpid()}.{threading.get_ident()}.tmp')
+    tmp_path.unlink(missing_ok=True)
+    try:
+        os.link(source, tmp_path)
+    except OSError:
+        shutil.copyfile(source, tmp_path)
+    os.replace(tmp_path, target)
+    # rename() leaves both names when target already links to source
+    tmp_path.unlink(missing_ok=True)
+
+
+# Shared cache for the wrappers
+default_cache = PDFCache()
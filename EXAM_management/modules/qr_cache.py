@@ -0,0 +1,216 @@
+"""
+QR Code Cache for Hall Tickets
+------------------------------
+Encoding a QR code (mask selection) and round-tripping it through a PIL PNG
+is the most expensive part of rendering a hall ticket. QRCache keeps every
+code it builds, keyed by a hash of the payload (the verify URL, which carries
+the register number) and the QR settings:
+
+- an in-memory LRU for the current process
+- an on-disk LRU directory shared by processes and re-runs of a schedule,
+  swept when a marker file shows no process has done so for SWEEP_INTERVAL
+
+Codes can be returned as PNG / base64 for HTML templates, or as a ReportLab
+vector drawing built straight from the module matrix, so PDF tickets never
+touch PIL at all.
+"""
+
+import os
+import time
+import base64
+import hashlib
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+CACHE_DIR = Path(os.environ.get('QR_CACHE_DIR', Path(__file__).parent.parent / 'outputs' / 'qr_cache'))
+MAX_DISK_ENTRIES = int(os.environ.get('QR_CACHE_MAX_ENTRIES', '20000'))
+MAX_MEMORY_ENTRIES = 4096
+
+# Sweep the disk cache at most once per this many seconds, across all processes
+SWEEP_INTERVAL = 300
+SWEEP_MARKER = '.last_sweep'
+
+# qrcode.constants values, so callers need not import qrcode
+ERROR_CORRECT_L = 1
+ERROR_CORRECT_M = 0
+
+
+class QRCache:
+    """Content-addressed QR code cache with memory and disk LRU layers"""
+
+    def __init__(self, cache_dir=CACHE_DIR, max_entries=MAX_DISK_ENTRIES):
+        self.cache_dir = Path(cache_dir)
+        self.max_entries = max_entries
+        self._memory = OrderedDict()
+
+    def _key(self, kind, data, border, error_correction):
+        """Hash of everything that changes the rendered code"""
+        text = f'{kind}|{data}|{border}|{error_correction}'
+        return hashlib.sha256(text.encode()).hexdigest()
+
+    def _get(self, key, suffix):
+        """Look a key up in memory, then on disk (refreshing its LRU position)"""
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            return self._memory[key]
+
+        path = self.cache_dir / key[:2] / f'{key}{suffix}'
+        try:
+            value = path.read_bytes()
+            os.utime(path)
+        except OSError:
+            return None
+
+        self._remember(key, value)
+        return value
+
+    def _put(self, key, suffix, value):
+        """Store a value in memory and on disk"""
+        self._remember(key, value)
+
+        path = self.cache_dir / key[:2] / f'{key}{suffix}'
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write then rename, so parallel workers never read a partial file
+            tmp_path = path.with_name(f'{path.name}.{os.getpid()}.{threading.get_ident()}.tmp')
+            tmp_path.write_bytes(value)
+            os.replace(tmp_path, path)
+        except OSError:
+            # The disk layer is an optimisation only
+            return
+
+        if self._sweep_due():
+            self.evict()
+
+    def _sweep_due(self):
+        """True when no process has swept for SWEEP_INTERVAL; claims the sweep"""
+        marker = self.cache_dir / SWEEP_MARKER
+        try:
+            if time.time() - marker.stat().st_mtime < SWEEP_INTERVAL:
+                return False
+        except OSError:
+            pass
+        try:
+            marker.touch()
+        except OSError:
+            return False
+        return True
+
+    def _remember(self, key, value):
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        if len(self._memory) > MAX_MEMORY_ENTRIES:
+            self._memory.popitem(last=False)
+
+    def evict(self):
+        """Delete the least recently used files beyond max_entries"""
+        try:
+            files = [(entry.stat().st_mtime, entry)
+                     for subdir in self.cache_dir.iterdir() if subdir.is_dir()
+                     for entry in subdir.iterdir()]
+        except OSError:
+            return 0
+
+        excess = len(files) - self.max_entries
+        if excess <= 0:
+            return 0
+
+        files.sort(key=lambda item: item[0])
+        for _, path in files[:excess]:
+            try:
+                path.unlink()
+            except OSError:
+                pass
+        return excess
+
+    def _make_qr(self, data, border, error_correction):
+        import qrcode
+
+        qr = qrcode.QRCode(
+            version=1,
+            error_correction=error_correction,
+            box_size=10,
+            border=border,
+        )
+        qr.add_data(data)
+        qr.make(fit=True)
+        return qr
+
+    def matrix(self, data, border=4, error_correction=ERROR_CORRECT_L):
+        """
+        Module matrix of the code, including the quiet-zone border
+
+        Returns a list of strings, one per row, with '1' for dark modules.
+        """
+        key = self._key('matrix', data, border, error_correction)
+        cached = self._get(key, '.qr')
+        if cached is not None:
+            return cached.decode().split()
+
+        qr = self._make_qr(data, border, error_correction)
+        rows = [''.join('1' if cell else '0' for cell in row) for row in qr.get_matrix()]
+        self._put(key, '.qr', '\n'.join(rows).encode())
+        return rows
+
+    def png(self, data, border=4, error_correction=ERROR_CORRECT_L):
+        """PNG bytes of the code at 10 pixels per module, black on white"""
+        key = self._key('png', data, border, error_correction)
+        cached = self._get(key, '.png')
+        if cached is not None:
+            return cached
+
+        from io import BytesIO
+
+        img = self._make_qr(data, border, error_correction).make_image(fill_color="black", back_color="white")
+        buffer = BytesIO()
+        img.save(buffer, format='PNG')
+        value = buffer.getvalue()
+        self._put(key, '.png', value)
+        return value
+
+    def base64(self, data, border=4, error_correction=ERROR_CORRECT_L):
+        """Base64 PNG of the code, for embedding in HTML"""
+        return base64.b64encode(self.png(data, border, error_correction)).decode()
+
+    def drawing(self, data, size, border=4, error_correction=ERROR_CORRECT_L):
+        """
+        ReportLab Drawing of the code, size points square
+
+        Each horizontal run of dark modules is one rectangle of a single
+        filled path, so the code stays vector and no image is encoded or
+        embedded. The drawing is centred like the Image it replaces.
+        """
+        from reportlab.graphics.shapes import Drawing, Path
+        from reportlab.lib import colors
+
+        rows = self.matrix(data, border, error_correction)
+        module = size / len(rows)
+
+        # One path for all runs, per-shape Rects are slow to build and render
+        path = Path(fillColor=colors.black, strokeColor=None, strokeWidth=0)
+        for r, row in enumerate(rows):
+            y = size - (r + 1) * module
+            c = 0
+            while c < len(row):
+                if row[c] != '1':
+                    c += 1
+                    continue
+                start = c
+                while c < len(row) and row[c] == '1':
+                    c += 1
+                x0, x1 = start * module, c * module
+                path.moveTo(x0, y)
+                path.lineTo(x1, y)
+                path.lineTo(x1, y + module)
+                path.lineTo(x0, y + module)
+                path.closePath()
+
+        qr_drawing = Drawing(size, size)
+        qr_drawing.add(path)
+        qr_drawing.hAlign = 'CENTER'
+        return qr_drawing
+
+
+# Shared cache for the wrappers and the Flask server
+default_cache = QRCache()
@@ -4,7 +4,9 @@ Connects to MongoDB, generates timetable, and creates PDF
 """
 import sys
 import json
-from datetime import datetime, timedelta
+import time
+from pathlib import Path
+from datetime import datetime
 from pymongo import MongoClient
 from bson import ObjectId
 from reportlab.lib import colors
@@ -14,32 +16,87 @@ from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.lib.enums import TA_CENTER
 import os
+from pdf_cache import default_cache as pdf_cache
+from slot_allocator import dsatur_colouring
+from exam_calendar import ExamCalendar, reformat, ISO_FORMAT
+
+MONGO_URI = os.environ.get('MONGO_URI', 'mongodb://localhost:27017/exam_management')
+
+# Part of the PDF cache key, bump when the timetable layout changes
+TIMETABLE_TEMPLATE_VERSION = 1
+
+# Departments and subjects are reused across requests for this many seconds
+REFERENCE_CACHE_TTL = float(os.environ.get('REFERENCE_CACHE_TTL', '600'))
+REFERENCE_CACHE_MARKER = Path(__file__).parent.parent / 'outputs' / 'reference_cache.stamp'
+
+# Slot assignment strategies for generate_timetable (params['strategy'])
+#   sequential  each department's subjects in code order, one per slot
+#   dsatur      colour the conflict graph: fewest slots within hall capacity
+SLOT_STRATEGIES = ['sequential', 'dsatur']
+
+class ReferenceCache:
+    """
+    Departments and subjects by _id, kept across requests in this process
+    
+    These collections barely change during an exam season. Entries are
+    dropped after REFERENCE_CACHE_TTL seconds, or as soon as invalidate() is
+    called in any process: it touches a marker file that every lookup checks,
+    so all worker daemon processes see it.
+    """
+    
+    def __init__(self, ttl=REFERENCE_CACHE_TTL, marker=REFERENCE_CACHE_MARKER):
+        self.ttl = ttl
+        self.marker = Path(marker)
+        self._docs = {}
+        self._loaded_at = time.monotonic()
+        self._marker_mtime = self._read_marker()
+    
+    def _read_marker(self):
+        try:
+            return os.stat(self.marker).st_mtime_ns
+        except OSError:
+            return None
+    
+    def _drop_if_stale(self):
+        marker_mtime = self._read_marker()
+        if marker_mtime != self._marker_mtime or time.monotonic() - self._loaded_at > self.ttl:
+            self._docs = {}
+            self._loaded_at = time.monotonic()
+            self._marker_mtime = marker_mtime
+    
+    def get_many(self, collection, ids):
+        """Documents of collection by _id, fetching the missing ones in one $in query"""
+        self._drop_if_stale()
+        docs = self._docs.setdefault((collection.database.name, collection.name), {})
+        
+        missing = list(set(ids) - docs.keys())
+        if missing:
+            for doc in collection.find({'_id': {'$in': missing}}):
+                docs[doc['_id']] = doc
+        
+        return {doc_id: docs[doc_id] for doc_id in ids if doc_id in docs}
+    
+    def invalidate(self):
+        """Drop cached documents here and in every other process"""
+        self._docs = {}
+        self.marker.parent.mkdir(parents=True, exist_ok=True)
+        self.marker.touch()
+        self._marker_mtime = self._read_marker()
+
+# Shared by every MongoScheduler in this process (one per worker daemon process)
+reference_cache = ReferenceCache()
 
 class MongoScheduler:
-    def __init__(self, mongo_uri='mongodb://localhost:27017/exam_management'):
-        """Initialize MongoDB connection"""
-        self.client = MongoClient(mongo_uri)
+    def __init__(self, mongo_uri='mongodb://localhost:27017/exam_management', client=None):
+        """Initialize MongoDB connection (reuses client if given)"""
+        self.owns_client = client is None
+        self.client = client if client is not None else MongoClient(mongo_uri)
         self.db = self.client.get_default_database()
         
     def generate_available_dates(self, start_date, end_date, holidays):
         """Generate list of available dates excluding weekends and holidays"""
-        start = datetime.strptime(start_date, '%Y-%m-%d')
-        end = datetime.strptime(end_date, '%Y-%m-%d')
-        
-        holiday_dates = [datetime.strptime(h, '%Y-%m-%d') for h in holidays]
-        
-        available_dates = []
-        current = start
-        
-        while current <= end:
-            # Skip weekends (Saturday=5, Sunday=6)
-            if current.weekday() not in [5, 6]:
-                # Skip holidays
-                if current not in holiday_dates:
-                    available_dates.append(current.strftime('%Y-%m-%d'))
-            current += timedelta(days=1)
-        
-        return available_dates
+        # Skip weekends (Saturday=5, Sunday=6)
+        return ExamCalendar(start_date, end_date, holidays, ISO_FORMAT, closed_weekdays=(5, 6)).dates()
     
     def get_subjects_for_year(self, year, semester, exam_type):
         """Fetch subjects from MongoDB for given year and semester"""
@@ -61,6 +118,14 @@ class MongoScheduler:
         end_date = params['endDate']
         holidays = params.get('holidays', [])
         schedule_id = params['scheduleId']
+        strategy = params.get('strategy', 'sequential')
+        
+        if strategy not in SLOT_STRATEGIES:
+            return {
+                'success': False,
+                'message': f'Unknown scheduling strategy: {strategy}',
+                'timetable': []
+            }
         
         # Get available dates
         available_dates = self.generate_available_dates(start_date, end_date, holidays)
@@ -76,102 +141,201 @@ class MongoScheduler:
             }
         
         # Group subjects by department
+        departments = reference_cache.get_many(
+            self.db.departments,
+            [subject['department'] for subject in subjects if subject.get('department')]
+        )
         subjects_by_dept = {}
         for subject in subjects:
             dept_id = subject.get('department')
             if dept_id:
-                dept = self.db.departments.find_one({'_id': dept_id})
+                dept = departments.get(dept_id)
                 if dept:
                     dept_code = dept['code']
                     if dept_code not in subjects_by_dept:
                         subjects_by_dept[dept_code] = []
                     subjects_by_dept[dept_code].append(subject)
         
-        # Generate timetable entries for each department
-        timetable = []
-        date_idx = 0
+        # Seats per slot, computed once. MongoSeatingAllocator.allocate_seats
+        # seats every active student of the year for the schedule, so the
+        # whole year has to fit in the selected halls, whatever the slots hold
+        slot_capacity = self.get_slot_capacity(exam_type, params.get('halls'))
+        dept_students = self.get_department_headcounts(year) if slot_capacity else {}
+        
+        if slot_capacity:
+            year_students = self.get_year_headcount(year)
+            if year_students > slot_capacity:
+                return {
+                    'success': False,
+                    'message': f'Year {year} has {year_students} students, '
+                               f'the halls seat only {slot_capacity}',
+                    'timetable': []
+                }
+        
+        if strategy == 'dsatur':
+            try:
+                timetable = self.assign_exam_slots_dsatur(subjects_by_dept, available_dates, exam_type,
+                                                          schedule_id, dept_students, slot_capacity)
+            except ValueError as e:
+                return {'success': False, 'message': str(e), 'timetable': []}
+        else:
+            timetable = self.assign_exam_slots(subjects_by_dept, available_dates, exam_type,
+                                               schedule_id, len(subjects))
+
+        return {
+            'success': True,
+            'message': f'Timetable generated successfully for {len(subjects_by_dept)} departments',
+            'timetable': timetable
+        }
+    
+    def assign_exam_slots(self, subjects_by_dept, available_dates, exam_type, schedule_id, total_subjects):
+        """
+        Place each department's subjects, in list order, on the available dates
+        
+        SEM exams get an FN and an AN slot per department per date, internal
+        exams one slot. Stops once total_subjects distinct codes are placed.
+        Each department keeps a cursor into its subject list and the set of
+        codes it has placed, so a slot is filled in O(1) amortized time
+        instead of rescanning the timetable.
+        """
+        sessions = self.exam_sessions(exam_type)
+        schedule_oid = ObjectId(schedule_id)
+        dept_codes = sorted(subjects_by_dept.keys())
+        cursors = {dept_code: 0 for dept_code in dept_codes}
+        placed_by_dept = {dept_code: set() for dept_code in dept_codes}
+        placed_codes = set()
         
-        # For each date, schedule exams for all departments
+        timetable = []
         for date in available_dates:
-            exams_on_date = []
-            
-            # For SEM exams: FN and AN sessions
-            if exam_type == 'SEM':
-                # FN Session - schedule one subject per department if available
-                for dept_code in sorted(subjects_by_dept.keys()):
-                    dept_subjects = subjects_by_dept[dept_code]
-                    # Find next unscheduled subject for this dept
-                    scheduled_codes = set(t['subjectCode'] for t in timetable if t.get('department') == dept_code)
-                    for subject in dept_subjects:
-                        if subject['code'] not in scheduled_codes:
-                            exams_on_date.append({
-                                'schedule': ObjectId(schedule_id),
-                                'subject': subject['_id'],
-                                'subjectCode': subject['code'],
-                                'subjectName': subject['name'],
-                                'department': dept_code,
-                                'date': date,
-                                'timeStart': '09:30 AM',
-                                'timeEnd': '12:30 PM',
-                                'session': 'FN'
-                            })
-                            scheduled_codes.add(subject['code'])
-                            break
-                
-                # AN Session - schedule another subject per department if available
-                for dept_code in sorted(subjects_by_dept.keys()):
+            for time_start, time_end, session in sessions:
+                # Schedule the next unscheduled subject of every department
+                for dept_code in dept_codes:
                     dept_subjects = subjects_by_dept[dept_code]
-                    scheduled_codes = set(t['subjectCode'] for t in timetable + exams_on_date if t.get('department') == dept_code)
-                    for subject in dept_subjects:
-                        if subject['code'] not in scheduled_codes:
-                            exams_on_date.append({
-                                'schedule': ObjectId(schedule_id),
-                                'subject': subject['_id'],
-                                'subjectCode': subject['code'],
-                                'subjectName': subject['name'],
-                                'department': dept_code,
-                                'date': date,
-                                'timeStart': '02:00 PM',
-                                'timeEnd': '05:00 PM',
-                                'session': 'AN'
-                            })
-                            scheduled_codes.add(subject['code'])
-                            break
-            
-            else:  # Internal exam - single session per day
-                # Schedule one subject per department
-                for dept_code in sorted(subjects_by_dept.keys()):
-                    dept_subjects = subjects_by_dept[dept_code]
-                    scheduled_codes = set(t['subjectCode'] for t in timetable if t.get('department') == dept_code)
-                    for subject in dept_subjects:
-                        if subject['code'] not in scheduled_codes:
-                            exams_on_date.append({
-                                'schedule': ObjectId(schedule_id),
-                                'subject': subject['_id'],
-                                'subjectCode': subject['code'],
-                                'subjectName': subject['name'],
-                                'department': dept_code,
-                                'date': date,
-                                'timeStart': '09:30 AM',
-                                'timeEnd': '12:30 PM',
-                                'session': 'SINGLE'
-                            })
-                            scheduled_codes.add(subject['code'])
-                            break
-            
-            # Add exams for this date to timetable
-            timetable.extend(exams_on_date)
+                    placed = placed_by_dept[dept_code]
+                    i = cursors[dept_code]
+                    while i < len(dept_subjects) and dept_subjects[i]['code'] in placed:
+                        i += 1
+                    cursors[dept_code] = i
+                    if i == len(dept_subjects):
+                        continue
+                    
+                    subject = dept_subjects[i]
+                    timetable.append({
+                        'schedule': schedule_oid,
+                        'subject': subject['_id'],
+                        'subjectCode': subject['code'],
+                        'subjectName': subject['name'],
+                        'department': dept_code,
+                        'date': date,
+                        'timeStart': time_start,
+                        'timeEnd': time_end,
+                        'session': session
+                    })
+                    placed.add(subject['code'])
+                    placed_codes.add(subject['code'])
             
             # Check if all subjects scheduled
-            total_scheduled = len(set(t['subjectCode'] for t in timetable))
-            if total_scheduled >= len(subjects):
+            if len(placed_codes) >= total_subjects:
                 break
         
-        return {
-            'success': True,
-            'message': f'Timetable generated successfully for {len(subjects_by_dept)} departments',
-            'timetable': timetable
+        return timetable
+    
+    def exam_sessions(self, exam_type):
+        """(timeStart, timeEnd, session) of each slot on an exam date"""
+        if exam_type == 'SEM':
+            return [('09:30 AM', '12:30 PM', 'FN'), ('02:00 PM', '05:00 PM', 'AN')]
+        return [('09:30 AM', '12:30 PM', 'SINGLE')]
+    
+    def get_year_headcount(self, year):
+        """Active students of the year, as allocate_seats loads them"""
+        return self.db.students.count_documents({'year': year, 'isActive': True})
+    
+    def get_department_headcounts(self, year):
+        """Active students of the year per department code, in one aggregation"""
+        counts = {
+            row['_id']: row['count']
+            for row in self.db.students.aggregate([
+                {'$match': {'year': year, 'isActive': True}},
+                {'$group': {'_id': '$department', 'count': {'$sum': 1}}}
+            ])
         }
+        departments = reference_cache.get_many(self.db.departments, [d for d in counts if d])
+        return {dept['code']: counts[dept_id] for dept_id, dept in departments.items()}
+    
+    def get_slot_capacity(self, exam_type, hall_ids=None):
+        """
+        Seats in one slot across the halls: one student per bench for SEM,
+        two for internal exams (as MongoSeatingAllocator seats them).
+        None when no halls are set up.
+        """
+        query = {'isActive': True}
+        if hall_ids:
+            query['_id'] = {'$in': [ObjectId(h) if isinstance(h, str) else h for h in hall_ids]}
+        benches = sum(hall.get('capacity', 0) for hall in self.db.halls.find(query, {'capacity': 1}))
+        if not benches:
+            return None
+        return benches if exam_type == 'SEM' else benches * 2
+    
+    def assign_exam_slots_dsatur(self, subjects_by_dept, available_dates, exam_type, schedule_id,
+                                 dept_students=None, slot_capacity=None):
+        """
+        Place subjects on the fewest slots by colouring their conflict graph
+        
+        Subjects of one department conflict, since its students sit all of
+        them. With slot_capacity, a slot holds no more students than the
+        halls seat. Colours map to slots in date and session order.
+        
+        Raises:
+            ValueError: If the subjects need more slots than the dates offer
+        """
+        sessions = self.exam_sessions(exam_type)
+        slots = [(date,) + session for date in available_dates for session in sessions]
+        dept_students = dept_students or {}
+        
+        # One node per department and subject code, as in assign_exam_slots
+        nodes = []
+        subject_of = {}
+        dept_of = {}
+        neighbors = {}
+        headcount = {}
+        for dept_code in sorted(subjects_by_dept.keys()):
+            dept_nodes = []
+            for subject in subjects_by_dept[dept_code]:
+                node = f"{subject['code']} ({dept_code})"
+                if node not in subject_of:
+                    subject_of[node] = subject
+                    dept_of[node] = dept_code
+                    dept_nodes.append(node)
+            for node in dept_nodes:
+                neighbors[node] = dept_nodes
+                headcount[node] = dept_students.get(dept_code, 0)
+            nodes.extend(dept_nodes)
+        
+        colours = dsatur_colouring(nodes, neighbors, headcount, slot_capacity)
+        
+        slots_needed = max(colours.values()) + 1 if colours else 0
+        if slots_needed > len(slots):
+            raise ValueError(f'Need {slots_needed} exam slots, only {len(slots)} available in the date range')
+        
+        schedule_oid = ObjectId(schedule_id)
+        timetable = []
+        for node in sorted(nodes, key=lambda n: (colours[n], dept_of[n])):
+            dept_code = dept_of[node]
+            subject = subject_of[node]
+            date, time_start, time_end, session = slots[colours[node]]
+            timetable.append({
+                'schedule': schedule_oid,
+                'subject': subject['_id'],
+                'subjectCode': subject['code'],
+                'subjectName': subject['name'],
+                'department': dept_code,
+                'date': date,
+                'timeStart': time_start,
+                'timeEnd': time_end,
+                'session': session
+            })
+        
+        return timetable
     
     def generate_timetable_pdf(self, schedule_id, output_dir='uploads/timetables'):
         """Generate PDF for exam timetable"""
@@ -191,16 +355,33 @@ class MongoScheduler:
         if len(timetable_entries) == 0:
             return {'success': False, 'message': 'No timetable entries found'}
         
-        # Fetch subjects for each entry
+        # Everything the PDF shows, the file name is derived from its hash
+        ref_date = datetime.now().strftime('%d/%m/%Y')
+        cache_key = pdf_cache.key(
+            'timetable', TIMETABLE_TEMPLATE_VERSION,
+            [schedule.get('examType', 'N/A'), schedule.get('year', 'N/A'), ref_date],
+            [[entry['date'], entry['subjectCode'], entry['subjectName'], entry['timeStart'], entry['timeEnd']]
+             for entry in timetable_entries]
+        )
+        filename = f"timetable_{schedule_id}_{cache_key[:16]}.pdf"
+        filepath = os.path.join(output_dir, filename)
+        
+        if pdf_cache.fetch(cache_key, filepath):
+            return {
+                'success': True,
+                'message': 'PDF generated successfully',
+                'pdfPath': filepath,
+                'filename': filename
+            }
+        
+        # Fetch subjects for all entries at once
+        subjects = reference_cache.get_many(self.db.subjects, [entry['subject'] for entry in timetable_entries])
         for entry in timetable_entries:
-            subject = self.db.subjects.find_one({'_id': entry['subject']})
+            subject = subjects.get(entry['subject'])
             if subject:
                 entry['subjectDetails'] = subject
         
         # Generate PDF
-        filename = f"timetable_{schedule_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
-        filepath = os.path.join(output_dir, filename)
-        
         doc = SimpleDocTemplate(
             filepath,
             pagesize=landscape(A4),
@@ -247,7 +428,6 @@ class MongoScheduler:
         elements.append(Spacer(1, 10))
         
         # Reference number and date
-        ref_date = datetime.now().strftime('%d/%m/%Y')
         ref_table = Table(
             [[f"Lr. No. 1604: MLRIT/COE/2025-26", f"Date: {ref_date}"]],
             colWidths=[4*inch, 2*inch]
@@ -286,7 +466,7 @@ class MongoScheduler:
         for entry in timetable_entries:
             # Handle both string and datetime objects
             if isinstance(entry['date'], str):
-                date_str = datetime.strptime(entry['date'], '%Y-%m-%d').strftime('%d/%m/%Y')
+                date_str = reformat(entry['date'], ISO_FORMAT, '%d/%m/%Y')
             else:
                 date_str = entry['date'].strftime('%d/%m/%Y')
             
@@ -318,6 +498,7 @@ class MongoScheduler:
         
         # Build PDF
         doc.build(elements)
+        pdf_cache.store(cache_key, filepath)
         
         return {
             'success': True,
@@ -327,52 +508,66 @@ class MongoScheduler:
         }
     
     def close(self):
-        """Close MongoDB connection"""
-        self.client.close()
+        """Close MongoDB connection unless it was passed in"""
+        if self.owns_client:
+            self.client.close()
 
-def main():
-    """Main entry point for command-line execution"""
-    if len(sys.argv) < 2:
-        print(json.dumps({
+def run_command(args, client=None):
+    """
+    Run one command and return (result, exit_code)
+    
+    Used by main() and by the worker daemon, which passes its pooled client.
+    """
+    if len(args) < 1:
+        return {
             'success': False,
             'message': 'Usage: python scheduler_wrapper.py <command> <params_json>'
-        }))
-        sys.exit(1)
+        }, 1
     
-    command = sys.argv[1]
+    command = args[0]
     
     try:
         # Initialize scheduler
-        mongo_uri = os.environ.get('MONGO_URI', 'mongodb://localhost:27017/exam_management')
-        scheduler = MongoScheduler(mongo_uri)
+        scheduler = MongoScheduler(MONGO_URI, client=client)
         
         if command == 'generate_timetable':
-            params = json.loads(sys.argv[2])
+            params = json.loads(args[1])
             result = scheduler.generate_timetable(params)
-            print(json.dumps(result, default=str))
             
         elif command == 'generate_pdf':
-            schedule_id = sys.argv[2]
-            output_dir = sys.argv[3] if len(sys.argv) > 3 else 'uploads/timetables'
+            schedule_id = args[1]
+            output_dir = args[2] if len(args) > 2 else 'uploads/timetables'
             result = scheduler.generate_timetable_pdf(schedule_id, output_dir)
-            print(json.dumps(result, default=str))
+            
+        elif command == 'invalidate_cache':
+            # Call after departments or subjects are edited
+            reference_cache.invalidate()
+            result = {'success': True, 'message': 'Reference data cache invalidated'}
             
         else:
-            print(json.dumps({
+            return {
                 'success': False,
                 'message': f'Unknown command: {command}'
-            }))
-            sys.exit(1)
+            }, 1
         
         scheduler.close()
+        return result, 0
         
     except Exception as e:
-        print(json.dumps({
+        return {
             'success': False,
             'message': str(e),
             'error': type(e).__name__
-        }))
-        sys.exit(1)
+        }, 1
+
+def main():
+    """Main entry point for command-line execution"""
+    # Hand the command to the worker daemon when one is running
+    from worker_client import run_in_worker
+    result, exit_code = run_in_worker('scheduler_wrapper.py', sys.argv[1:]) or run_command(sys.argv[1:])
+    
+    print(json.dumps(result, default=str))
+    sys.exit(exit_code)
 
 if __name__ == '__main__':
     main()
@@ -27,6 +27,11 @@ def main():
                        help='Path to teachers CSV file')
     parser.add_argument('--output-dir', type=str, default='.',
                        help='Output directory for PDFs')
+    parser.add_argument('--workers', type=int, default=1,
+                       help='Worker processes for rendering the student PDF')
+    parser.add_argument('--renderer', type=str, default='matplotlib',
+                       choices=['matplotlib', 'reportlab'],
+                       help='Student PDF renderer (reportlab skips matplotlib entirely)')
     
     args = parser.parse_args()
     
@@ -61,7 +66,7 @@ def main():
         system.assign_teachers()
         
         # Generate PDFs
-        student_pdf = system.generate_student_pdf()
+        student_pdf = system.generate_student_pdf(workers=args.workers, renderer=args.renderer)
         faculty_pdf = system.generate_faculty_pdf()
         
         # Print statistics
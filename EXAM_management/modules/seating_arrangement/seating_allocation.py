@@ -12,10 +12,10 @@ import pandas as pd
 import numpy as np
 import random
 import os
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-import matplotlib.pyplot as plt
-import matplotlib.patches as mpatches
-from matplotlib.backends.backend_pdf import PdfPages
+from io import BytesIO
 from reportlab.lib.pagesizes import landscape, A4
 from reportlab.lib import colors
 from reportlab.lib.units import inch
@@ -24,6 +24,103 @@ from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.enums import TA_CENTER, TA_LEFT
 
 
+class SeatAllocationEngine:
+    """
+    Array-backed allocation core shared by the SEM and Internal allocators.
+
+    Student columns are extracted once into NumPy arrays. Each department is a
+    [start, end) slice of one shuffled row order with its own cursor, so taking
+    the next student is an index bump instead of a DataFrame lookup. Allocations
+    are recorded as row/hall/seat indices and materialised as column arrays.
+    """
+
+    def __init__(self, students_df, halls_df):
+        """Pre-extract student and hall columns and build per-department cursors"""
+        self.departments = sorted(students_df['Department'].unique())
+
+        self._reg_numbers = students_df['Register Number'].to_numpy()
+        self._names = students_df['Name'].to_numpy()
+        self._dept_column = students_df['Department'].to_numpy()
+
+        # Same order as sort_values('Register Number') followed by
+        # sample(frac=1, random_state=42) within each department
+        order = []
+        self.dept_end = []
+        for dept in self.departments:
+            rows = np.flatnonzero(self._dept_column == dept)
+            rows = rows[np.argsort(self._reg_numbers[rows], kind='stable')]
+            rows = rows[np.random.RandomState(42).permutation(len(rows))]
+            order.extend(rows.tolist())
+            self.dept_end.append(len(order))
+
+        self.order = order
+        self.cursor = [0] + self.dept_end[:-1]
+        # Department indices that still have students, kept sorted
+        self.available = [d for d in range(len(self.departments))
+                          if self.cursor[d] < self.dept_end[d]]
+        self.remaining = len(order)
+
+        self._hall_numbers = halls_df['hallno'].to_numpy()
+        self.hall_numbers = self._hall_numbers.tolist()
+        self.hall_capacities = halls_df['capacity'].tolist()
+
+        # Output columns as indices into the student and hall arrays
+        self._rows = []
+        self._halls = []
+        self._seats = []
+
+    def choose_department(self, hall_depts):
+        """Pick a department at random, preferring ones not yet in the hall until it has 2"""
+        if len(hall_depts) < 2:
+            unused = [d for d in self.available if d not in hall_depts]
+            if unused:
+                return random.choice(unused)
+        return random.choice(self.available)
+
+    def choose_benchmate_department(self, dept):
+        """Pick a department other than dept at random, or None if none is left"""
+        available = self.available
+        pos = bisect_left(available, dept)
+        present = pos < len(available) and available[pos] == dept
+        num_other = len(available) - present
+        if num_other == 0:
+            return None
+        # Same draw as random.choice over the list without dept
+        idx = random.randrange(num_other)
+        if present and idx >= pos:
+            idx += 1
+        return available[idx]
+
+    def take(self, dept, hall_idx, seat_no):
+        """Seat the next student of dept at (hall_idx, seat_no)"""
+        ptr = self.cursor[dept]
+        self._rows.append(self.order[ptr])
+        self._halls.append(hall_idx)
+        self._seats.append(seat_no)
+
+        ptr += 1
+        self.cursor[dept] = ptr
+        if ptr == self.dept_end[dept]:
+            self.available.remove(dept)
+        self.remaining -= 1
+
+    def department_names(self, dept_indices):
+        """Map a set of department indices back to names"""
+        return {self.departments[d] for d in dept_indices}
+
+    def columns(self):
+        """Return the allocations as a dict of column arrays"""
+        rows = np.asarray(self._rows, dtype=np.intp)
+        halls = np.asarray(self._halls, dtype=np.intp)
+        return {
+            'Hall No': self._hall_numbers[halls],
+            'Seat No': np.asarray(self._seats, dtype=np.int64),
+            'Register Number': self._reg_numbers[rows],
+            'Name': self._names[rows],
+            'Department': self._dept_column[rows]
+        }
+
+
 class SeatingAllocationSystem:
     def __init__(self, halls_file, students_file, teachers_file, session='FN', exam_type='Internal', year=1, internal_number=1):
         """Initialize the seating allocation system"""
@@ -42,6 +139,10 @@ class SeatingAllocationSystem:
         # Prepare data structures
         self.allocations = []
         self.hall_wise_allocations = {}
+        self.hall_dept_counts = {}
+        self.hall_seat_index = {}
+        self.hall_capacity = {}
+        self.hall_columns = {}
         self.teacher_assignments = {}
         self.session = session  # 'FN' or 'AN'
         self.exam_type = exam_type  # 'Internal' or 'SEM'
@@ -76,190 +177,90 @@ class SeatingAllocationSystem:
     
     def _allocate_sem_linear(self):
         """Allocate for SEM exam: 1 student per bench with randomization and min 2 depts per hall"""
-        # Group students by department and shuffle within each department
-        departments = sorted(self.students_df['Department'].unique())
-        dept_groups = {}
+        engine = SeatAllocationEngine(self.students_df, self.halls_df)
         
-        for dept in departments:
-            dept_students = self.students_df[self.students_df['Department'] == dept].copy()
-            dept_students = dept_students.sort_values('Register Number').reset_index(drop=True)
-            # Shuffle to add randomness
-            dept_students = dept_students.sample(frac=1, random_state=42).reset_index(drop=True)
-            dept_groups[dept] = dept_students
-        
-        # Create pointers for each department
-        dept_pointers = {dept: 0 for dept in departments}
-        
-        allocations = []
         current_hall_idx = 0
         current_seat_in_hall = 1
-        total_students = len(self.students_df)
-        total_allocated = 0
         
         # Track departments used in current hall
         current_hall_depts = set()
-        hall_start_idx = 0
         
-        while total_allocated < total_students:
-            hall_no = self.halls_df.loc[current_hall_idx, 'hallno']
-            hall_capacity = self.halls_df.loc[current_hall_idx, 'capacity']
-            
-            # Find available departments (prioritize ensuring min 2 depts per hall)
-            available_depts = [dept for dept, ptr in dept_pointers.items() 
-                             if ptr < len(dept_groups[dept])]
-            
-            if len(available_depts) == 0:
-                break
+        while engine.remaining > 0:
+            hall_no = engine.hall_numbers[current_hall_idx]
+            hall_capacity = engine.hall_capacities[current_hall_idx]
             
             # Select department with controlled randomness
             # Ensure at least 2 different departments per hall
-            if len(current_hall_depts) < 2:
-                # Prefer departments not yet in this hall
-                unused_depts = [d for d in available_depts if d not in current_hall_depts]
-                if unused_depts:
-                    selected_dept = random.choice(unused_depts)
-                else:
-                    selected_dept = random.choice(available_depts)
-            else:
-                # Random selection from all available
-                selected_dept = random.choice(available_depts)
-            
+            selected_dept = engine.choose_department(current_hall_depts)
             current_hall_depts.add(selected_dept)
             
-            student = dept_groups[selected_dept].iloc[dept_pointers[selected_dept]]
-            
-            allocations.append({
-                'Hall No': hall_no,
-                'Seat No': current_seat_in_hall,
-                'Register Number': student['Register Number'],
-                'Name': student['Name'],
-                'Department': student['Department']
-            })
-            
-            dept_pointers[selected_dept] += 1
-            total_allocated += 1
+            engine.take(selected_dept, current_hall_idx, current_seat_in_hall)
             current_seat_in_hall += 1
             
             # Move to next hall if current is full
             if current_seat_in_hall > hall_capacity:
-                print(f"  Hall {hall_no}: {len(current_hall_depts)} departments - {current_hall_depts}")
+                print(f"  Hall {hall_no}: {len(current_hall_depts)} departments - {engine.department_names(current_hall_depts)}")
                 current_hall_idx += 1
                 current_seat_in_hall = 1
                 current_hall_depts = set()
-                hall_start_idx = len(allocations)
                 
-                if current_hall_idx >= len(self.halls_df):
+                if current_hall_idx >= len(engine.hall_numbers):
                     print("Warning: Ran out of halls!")
                     break
         
         # Print final hall info if not empty
         if current_hall_depts:
-            print(f"  Hall {hall_no}: {len(current_hall_depts)} departments - {current_hall_depts}")
+            print(f"  Hall {hall_no}: {len(current_hall_depts)} departments - {engine.department_names(current_hall_depts)}")
         
         print(f"Halls used: {current_hall_idx + 1} out of {len(self.halls_df)}")
-        return allocations
+        return engine.columns()
     
     def _allocate_internal_alternating(self):
         """Allocate for Internal exam: 2 students per bench with randomization and min 2 depts per hall"""
-        # Group students by department and shuffle
-        departments = sorted(self.students_df['Department'].unique())
-        dept_groups = {}
-        
-        for dept in departments:
-            dept_students = self.students_df[self.students_df['Department'] == dept].copy()
-            dept_students = dept_students.sort_values('Register Number').reset_index(drop=True)
-            # Shuffle for randomness
-            dept_students = dept_students.sample(frac=1, random_state=42).reset_index(drop=True)
-            dept_groups[dept] = dept_students
-        
-        # Create pointers for each department
-        dept_pointers = {dept: 0 for dept in departments}
+        engine = SeatAllocationEngine(self.students_df, self.halls_df)
         
-        allocations = []
         current_hall_idx = 0
         current_seat_in_hall = 1
-        total_students = len(self.students_df)
-        total_allocated = 0
         
         # Track departments in current hall
         current_hall_depts = set()
         
         # For Internal exams, capacity represents benches
-        while total_allocated < total_students:
-            hall_no = self.halls_df.loc[current_hall_idx, 'hallno']
-            hall_capacity = self.halls_df.loc[current_hall_idx, 'capacity']
-            
-            # Find available departments
-            available_depts = [dept for dept, ptr in dept_pointers.items() 
-                             if ptr < len(dept_groups[dept])]
-            
-            if len(available_depts) == 0:
-                break
+        while engine.remaining > 0:
+            hall_no = engine.hall_numbers[current_hall_idx]
+            hall_capacity = engine.hall_capacities[current_hall_idx]
             
             # Select first student (ensure dept diversity in hall)
-            if len(current_hall_depts) < 2:
-                unused_depts = [d for d in available_depts if d not in current_hall_depts]
-                dept1 = random.choice(unused_depts) if unused_depts else random.choice(available_depts)
-            else:
-                dept1 = random.choice(available_depts)
-            
+            dept1 = engine.choose_department(current_hall_depts)
             current_hall_depts.add(dept1)
-            student1 = dept_groups[dept1].iloc[dept_pointers[dept1]]
+            engine.take(dept1, current_hall_idx, current_seat_in_hall)
             
-            allocations.append({
-                'Hall No': hall_no,
-                'Seat No': current_seat_in_hall,
-                'Register Number': student1['Register Number'],
-                'Name': student1['Name'],
-                'Department': student1['Department']
-            })
-            
-            dept_pointers[dept1] += 1
-            total_allocated += 1
-            
-            # Try to allocate second student from different department (bench-mate)
-            available_depts = [dept for dept, ptr in dept_pointers.items() 
-                             if ptr < len(dept_groups[dept])]
-            
-            if len(available_depts) > 0:
-                # Prefer different department for bench-mate
-                other_depts = [d for d in available_depts if d != dept1]
-                if other_depts:
-                    dept2 = random.choice(other_depts)
-                    current_hall_depts.add(dept2)
-                    student2 = dept_groups[dept2].iloc[dept_pointers[dept2]]
-                    
-                    allocations.append({
-                        'Hall No': hall_no,
-                        'Seat No': current_seat_in_hall,  # Same seat for bench-mates
-                        'Register Number': student2['Register Number'],
-                        'Name': student2['Name'],
-                        'Department': student2['Department']
-                    })
-                    
-                    dept_pointers[dept2] += 1
-                    total_allocated += 1
+            # Bench-mate from a different department, same seat number
+            dept2 = engine.choose_benchmate_department(dept1)
+            if dept2 is not None:
+                current_hall_depts.add(dept2)
+                engine.take(dept2, current_hall_idx, current_seat_in_hall)
             
             current_seat_in_hall += 1
             
             # Move to next hall if current is full
             if current_seat_in_hall > hall_capacity:
-                print(f"  Hall {hall_no}: {len(current_hall_depts)} departments - {current_hall_depts}")
+                print(f"  Hall {hall_no}: {len(current_hall_depts)} departments - {engine.department_names(current_hall_depts)}")
                 current_hall_idx += 1
                 current_seat_in_hall = 1
                 current_hall_depts = set()
                 
-                if current_hall_idx >= len(self.halls_df):
+                if current_hall_idx >= len(engine.hall_numbers):
                     print("Warning: Ran out of halls!")
                     break
         
         # Print final hall info
         if current_hall_depts:
-            print(f"  Hall {hall_no}: {len(current_hall_depts)} departments - {current_hall_depts}")
+            print(f"  Hall {hall_no}: {len(current_hall_depts)} departments - {engine.department_names(current_hall_depts)}")
         
         print(f"Halls used: {current_hall_idx + 1} out of {len(self.halls_df)}")
         print(f"Benches per hall: ~{hall_capacity}, Total capacity: ~{hall_capacity * 2} students")
-        return allocations
+        return engine.columns()
     
     def allocate_seats_alternating_department(self):
         """
@@ -380,13 +381,39 @@ class SeatingAllocationSystem:
         return allocations_df
     
     def _create_hall_wise_summary(self):
-        """Create a summary of allocations by hall"""
+        """
+        Partition allocations by hall in a single sorted pass and cache the
+        per-hall frames, department counts, seat index and hall lookups
+        """
         self.hall_wise_allocations = {}
-        
-        for hall_no in self.allocations['Hall No'].unique():
-            hall_data = self.allocations[self.allocations['Hall No'] == hall_no].copy()
-            hall_data = hall_data.sort_values('Seat No').reset_index(drop=True)
+        self.hall_dept_counts = {}
+        self.hall_seat_index = {}
+        
+        # Hall capacity and column count keyed by hall number
+        hall_numbers = self.halls_df['hallno'].tolist()
+        self.hall_capacity = dict(zip(hall_numbers, self.halls_df['capacity'].tolist()))
+        self.hall_columns = dict(zip(hall_numbers, self.halls_df['Columns'].tolist()))
+        
+        if len(self.allocations) == 0:
+            return
+        
+        # One stable sort by hall then seat; each hall is a contiguous run
+        sorted_allocations = self.allocations.sort_values(['Hall No', 'Seat No'], kind='stable')
+        hall_column = sorted_allocations['Hall No'].to_numpy()
+        run_starts = np.flatnonzero(hall_column[1:] != hall_column[:-1]) + 1
+        starts = np.concatenate(([0], run_starts))
+        ends = np.concatenate((run_starts, [len(hall_column)]))
+        
+        for start, end in zip(starts, ends):
+            hall_no = hall_column[start]
+            hall_data = sorted_allocations.iloc[start:end].reset_index(drop=True)
             self.hall_wise_allocations[hall_no] = hall_data
+            self.hall_dept_counts[hall_no] = hall_data['Department'].value_counts()
+            
+            # Rows seat_bounds[s]:seat_bounds[s + 1] of hall_data sit on Seat No s
+            seat_numbers = hall_data['Seat No'].to_numpy()
+            self.hall_seat_index[hall_no] = np.searchsorted(
+                seat_numbers, np.arange(seat_numbers.max() + 2))
     
     def assign_teachers(self):
         """Assign teachers to halls (one-to-one assignment)"""
@@ -411,10 +438,10 @@ class SeatingAllocationSystem:
     def convert_to_2d_layout(self, hall_no):
         """Convert student list to 2D grid layout using hall-specific columns"""
         # Get the number of columns for this specific hall
-        num_cols = self.halls_df[self.halls_df['hallno'] == hall_no]['Columns'].values[0]
+        num_cols = self.hall_columns[hall_no]
             
         hall_data = self.hall_wise_allocations[hall_no]
-        hall_capacity = self.halls_df[self.halls_df['hallno'] == hall_no]['capacity'].values[0]
+        hall_capacity = self.hall_capacity[hall_no]
         
         if self.exam_type == 'SEM':
             # Semester Exam: 1 student per bench
@@ -437,6 +464,10 @@ class SeatingAllocationSystem:
             # Group by seat number to get bench-mates
             num_rows = int(np.ceil(hall_capacity / num_cols))
             
+            reg_numbers = hall_data['Register Number'].tolist()
+            departments = hall_data['Department'].tolist()
+            seat_bounds = self.hall_seat_index[hall_no].tolist()
+            
             layout = []
             bench_idx = 0
             
@@ -444,57 +475,41 @@ class SeatingAllocationSystem:
                 row_data = []
                 for col in range(num_cols):
                     bench_idx += 1
-                    # Get students for this bench (same seat number)
-                    bench_students = hall_data[hall_data['Seat No'] == bench_idx]
+                    # Get students for this bench (same seat number) from the seat index
+                    if bench_idx + 1 < len(seat_bounds):
+                        start, end = seat_bounds[bench_idx], seat_bounds[bench_idx + 1]
+                    else:
+                        start = end = 0
                     
-                    if len(bench_students) == 0:
+                    if end - start == 0:
                         row_data.append({"left": "-", "right": "-"})
-                    elif len(bench_students) == 1:
-                        student = bench_students.iloc[0]
+                    elif end - start == 1:
                         row_data.append({
-                            "left": student['Register Number'],
+                            "left": reg_numbers[start],
                             "right": "-",  # Empty seat shown as dash
-                            "dept_left": student['Department']
+                            "dept_left": departments[start]
                         })
                     else:  # 2 students
-                        student1 = bench_students.iloc[0]
-                        student2 = bench_students.iloc[1]
                         row_data.append({
-                            "left": student1['Register Number'],
-                            "right": student2['Register Number'],
-                            "dept_left": student1['Department'],
-                            "dept_right": student2['Department']
+                            "left": reg_numbers[start],
+                            "right": reg_numbers[start + 1],
+                            "dept_left": departments[start],
+                            "dept_right": departments[start + 1]
                         })
                     
                 layout.append(row_data)
         
         return layout, num_rows, num_cols
     
-    def generate_hall_visual(self, hall_no, save_path=None):
-        """Generate visual representation of hall layout using matplotlib"""
+    def _hall_page_content(self, hall_no):
+        """Collect the header text, seat grid and department breakdown for one hall page"""
         layout, num_rows, num_cols = self.convert_to_2d_layout(hall_no)
         
-        # Create figure in landscape orientation (11.69 x 8.27 inches = A4 landscape)
-        fig, ax = plt.subplots(figsize=(11.69, 8.27))
-        ax.axis('off')
-        
-        # Get hall info
-        teacher = self.teacher_assignments.get(hall_no, "TBA")
-        hall_capacity = self.halls_df[self.halls_df['hallno'] == hall_no]['capacity'].values[0]
         hall_data = self.hall_wise_allocations[hall_no]
         occupied = len(hall_data)
         
         # Get department breakdown
-        dept_counts = hall_data['Department'].value_counts()
-        dept_text = "\n".join([f"{dept}({count})" for dept, count in dept_counts.items()])
-        
-        # Add college header
-        fig.text(0.5, 0.96, 'Marri Laxman Reddy Institute of Technology',
-                ha='center', fontsize=16, fontweight='bold')
-        fig.text(0.5, 0.93, 'Hyderabad - 43',
-                ha='center', fontsize=11)
-        fig.text(0.5, 0.90, '[An Autonomous Institution]',
-                ha='center', fontsize=9, style='italic')
+        dept_counts = self.hall_dept_counts[hall_no]
         
         # Add exam type to title
         if self.exam_type == 'Internal':
@@ -502,18 +517,14 @@ class SeatingAllocationSystem:
             exam_type_text = f'Continuous Internal Assessment - {roman_numeral}'
         else:
             exam_type_text = 'End Semester Examination'
-        fig.text(0.5, 0.87, f'SEATING ARRANGEMENT ({exam_type_text})',
-                ha='center', fontsize=14, fontweight='bold')
         
-        # Add date, session, and hall info
+        # Date, session, and hall info
         from datetime import date
         today = date.today().strftime('%d-%m-%Y')
-        fig.text(0.1, 0.82, f'Date:{today}', fontsize=10)
         if self.exam_type == 'Internal':
-            fig.text(0.5, 0.82, f'Session: Morning', ha='center', fontsize=10)
+            session_text = f'Session: Morning'
         else:
-            fig.text(0.5, 0.82, f'Session:{self.session}', ha='center', fontsize=10)
-        fig.text(0.9, 0.82, f'Hall:{hall_no}', ha='right', fontsize=10)
+            session_text = f'Session:{self.session}'
         
         # Create column headers
         col_headers = [f'column {i+1}' for i in range(num_cols)]
@@ -540,18 +551,51 @@ class SeatingAllocationSystem:
                         row_data.append(str(cell))
                 table_data.append(row_data)
         
+        return {
+            'exam_type_text': exam_type_text,
+            'date_text': f'Date:{today}',
+            'session_text': session_text,
+            'hall_text': f'Hall:{hall_no}',
+            'table_data': table_data,
+            'dept_counts': list(dept_counts.items()),
+            'occupied': occupied,
+            # Smaller font for two students per cell
+            'font_size': 6 if self.exam_type == 'Internal' else 9
+        }
+    
+    def generate_hall_visual(self, hall_no, save_path=None):
+        """Generate visual representation of hall layout using matplotlib"""
+        import matplotlib.pyplot as plt
+        
+        page = self._hall_page_content(hall_no)
+        
+        # Create figure in landscape orientation (11.69 x 8.27 inches = A4 landscape)
+        fig, ax = plt.subplots(figsize=(11.69, 8.27))
+        ax.axis('off')
+        
+        # Add college header
+        fig.text(0.5, 0.96, 'Marri Laxman Reddy Institute of Technology',
+                ha='center', fontsize=16, fontweight='bold')
+        fig.text(0.5, 0.93, 'Hyderabad - 43',
+                ha='center', fontsize=11)
+        fig.text(0.5, 0.90, '[An Autonomous Institution]',
+                ha='center', fontsize=9, style='italic')
+        fig.text(0.5, 0.87, f"SEATING ARRANGEMENT ({page['exam_type_text']})",
+                ha='center', fontsize=14, fontweight='bold')
+        
+        # Add date, session, and hall info
+        fig.text(0.1, 0.82, page['date_text'], fontsize=10)
+        fig.text(0.5, 0.82, page['session_text'], ha='center', fontsize=10)
+        fig.text(0.9, 0.82, page['hall_text'], ha='right', fontsize=10)
+        
         # Create main seating table
-        table = ax.table(cellText=table_data, cellLoc='center', loc='center',
+        table = ax.table(cellText=page['table_data'], cellLoc='center', loc='center',
                         bbox=[0.1, 0.20, 0.8, 0.57])
         
         # Style the table
         table.auto_set_font_size(False)
-        if self.exam_type == 'Internal':
-            table.set_fontsize(6)  # Smaller font for two students per cell
-            table.scale(1, 2.0)  # Standard height for split cells
-        else:
-            table.set_fontsize(9)
-            table.scale(1, 2)
+        table.set_fontsize(page['font_size'])
+        table.scale(1, 2)
         
         # Style all cells with borders only (no colors)
         for key, cell in table.get_celld().items():
@@ -569,9 +613,9 @@ class SeatingAllocationSystem:
                 cell.set_text_props(color='black')
         
         # Add department breakdown table at bottom
-        dept_data = [[dept, count] for dept, count in dept_counts.items()]
+        dept_data = [[dept, count] for dept, count in page['dept_counts']]
         dept_data.insert(0, ['Department', 'Count'])
-        dept_data.append(['Total Number of Students:', str(occupied)])
+        dept_data.append(['Total Number of Students:', str(page['occupied'])])
         
         dept_table = ax.table(cellText=dept_data, cellLoc='left', loc='lower center',
                              bbox=[0.1, 0.05, 0.5, 0.15])
@@ -595,8 +639,15 @@ class SeatingAllocationSystem:
         else:
             return fig
     
-    def generate_student_pdf(self, output_file=None):
-        """Generate student PDF with hall layouts (skip empty halls)"""
+    def generate_student_pdf(self, output_file=None, workers=1, renderer='matplotlib'):
+        """
+        Generate student PDF with hall layouts (skip empty halls)
+        
+        renderer='reportlab' draws the pages with ReportLab canvas primitives
+        instead of matplotlib tables. With the matplotlib renderer and
+        workers > 1 each hall page is drawn in a separate process and the
+        pages are merged in hall order.
+        """
         if output_file is None:
             if self.exam_type == 'Internal':
                 output_file = f'seating_student_{self.generation_date}_Y{self.year}_I{self.internal_number}.pdf'
@@ -617,16 +668,49 @@ class SeatingAllocationSystem:
         
         print(f"Generating PDF for {len(non_empty_halls)} halls with students...")
         
-        with PdfPages(output_file) as pdf:
+        if renderer == 'reportlab':
+            from seating_canvas import new_seating_canvas, draw_seating_page
+            
+            canv = new_seating_canvas(output_file)
             for hall_no in non_empty_halls:
                 print(f"  Creating layout for Hall {hall_no}...")
-                fig = self.generate_hall_visual(hall_no)
-                pdf.savefig(fig, bbox_inches='tight')
-                plt.close(fig)
+                draw_seating_page(canv, **self._hall_page_content(hall_no))
+            canv.save()
+        elif workers > 1:
+            self._generate_student_pdf_parallel(non_empty_halls, output_file, workers)
+        else:
+            import matplotlib.pyplot as plt
+            from matplotlib.backends.backend_pdf import PdfPages
+            
+            with PdfPages(output_file) as pdf:
+                for hall_no in non_empty_halls:
+                    print(f"  Creating layout for Hall {hall_no}...")
+                    fig = self.generate_hall_visual(hall_no)
+                    pdf.savefig(fig, bbox_inches='tight')
+                    plt.close(fig)
         
         print(f"\n✓ Student PDF generated: {output_file}")
         return output_file
     
+    def _generate_student_pdf_parallel(self, hall_numbers, output_file, workers):
+        """Render hall pages in a process pool and merge them in hall order"""
+        from pypdf import PdfReader, PdfWriter
+        
+        print(f"Rendering with {workers} worker processes...")
+        writer = PdfWriter()
+        
+        with ProcessPoolExecutor(max_workers=workers,
+                                 initializer=_init_hall_page_worker,
+                                 initargs=(self,)) as executor:
+            # map() yields results in submission order, so pages stay in hall order
+            pages = executor.map(_render_hall_page, hall_numbers)
+            for hall_no, page in zip(hall_numbers, pages):
+                print(f"  Created layout for Hall {hall_no}")
+                writer.append(PdfReader(BytesIO(page)))
+        
+        with open(output_file, 'wb') as f:
+            writer.write(f)
+    
     def generate_faculty_pdf(self, output_file=None):
         """Generate faculty PDF with summary table"""
         if output_file is None:
@@ -693,8 +777,7 @@ class SeatingAllocationSystem:
         # Overall Statistics
         total_students = len(self.allocations)
         halls_used = len(self.hall_wise_allocations)
-        total_capacity = sum([self.halls_df[self.halls_df['hallno'] == h]['capacity'].values[0] 
-                             for h in self.hall_wise_allocations.keys()])
+        total_capacity = sum([self.hall_capacity[h] for h in self.hall_wise_allocations.keys()])
         
         stats_data = [
             ['Overall Statistics', ''],
@@ -729,11 +812,11 @@ class SeatingAllocationSystem:
         
         for hall_no in non_empty_halls:
             hall_data = self.hall_wise_allocations[hall_no]
-            capacity = self.halls_df[self.halls_df['hallno'] == hall_no]['capacity'].values[0]
+            capacity = self.hall_capacity[hall_no]
             occupied = len(hall_data)
             
             # Get department counts - use compact format
-            dept_counts = hall_data['Department'].value_counts()
+            dept_counts = self.hall_dept_counts[hall_no]
             # Format as comma-separated to prevent overflow: "CSE:25,ECE:20,..."
             dept_breakdown = ', '.join([f"{dept}:{count}" for dept, count in dept_counts.items()])
             
@@ -786,7 +869,7 @@ class SeatingAllocationSystem:
         # Sheet 2: Hall-wise breakdown
         hall_summary = []
         for hall_no, hall_data in sorted(self.hall_wise_allocations.items()):
-            dept_counts = hall_data['Department'].value_counts()
+            dept_counts = self.hall_dept_counts[hall_no]
             hall_summary.append({
                 'Hall No': hall_no,
                 'Total Students': len(hall_data),
@@ -902,13 +985,36 @@ class SeatingAllocationSystem:
             print(f"  {dept:8s}: {count:3d} students (Halls {hall_min:2d} to {hall_max:2d})")
         
         print("\nHall utilization:")
-        for hall_no in sorted(self.allocations['Hall No'].unique()):
-            hall_capacity = self.halls_df[self.halls_df['hallno'] == hall_no]['capacity'].values[0]
-            allocated = len(self.allocations[self.allocations['Hall No'] == hall_no])
+        for hall_no, hall_data in sorted(self.hall_wise_allocations.items()):
+            hall_capacity = self.hall_capacity[hall_no]
+            allocated = len(hall_data)
             utilization = (allocated / hall_capacity) * 100
             print(f"  Hall {hall_no:2d}: {allocated:2d}/{hall_capacity:2d} seats ({utilization:5.1f}% utilized)")
 
 
+# Per-process state for parallel student PDF rendering
+_worker_system = None
+
+
+def _init_hall_page_worker(system):
+    """Keep one copy of the allocation system in each render worker"""
+    global _worker_system
+    _worker_system = system
+
+
+def _render_hall_page(hall_no):
+    """Draw one hall layout and return it as single-page PDF bytes"""
+    import matplotlib.pyplot as plt
+    from matplotlib.backends.backend_pdf import PdfPages
+    
+    fig = _worker_system.generate_hall_visual(hall_no)
+    buffer = BytesIO()
+    with PdfPages(buffer) as pdf:
+        pdf.savefig(fig, bbox_inches='tight')
+    plt.close(fig)
+    return buffer.getvalue()
+
+
 def main():
     """Main execution function"""
     print("\n" + "=" * 60)
@@ -0,0 +1,111 @@
+"""
+ReportLab canvas renderer for student seating pages
+---------------------------------------------------
+Draws the same page as the matplotlib hall visual (college header, seat grid
+and department breakdown) directly with canvas primitives, so no figure
+layout or tight-bbox pass is needed and matplotlib is never imported.
+
+Positions are fractions of an A4 landscape page, matching the figure
+coordinates used by generate_hall_visual.
+"""
+
+from reportlab.lib.pagesizes import landscape, A4
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.pdfgen import canvas
+
+PAGE_SIZE = landscape(A4)
+
+# Seat grid and department table areas as (left, bottom, width, height) fractions
+SEAT_GRID_BOX = (0.1, 0.20, 0.8, 0.57)
+DEPT_TABLE_BOX = (0.1, 0.05, 0.5, 0.15)
+CELL_PADDING = 3
+
+
+def new_seating_canvas(output_file):
+    """Create a canvas for a student seating PDF"""
+    return canvas.Canvas(output_file, pagesize=PAGE_SIZE)
+
+
+def _fit_font_size(text, font_name, font_size, max_width):
+    """Shrink the font size until text fits in max_width"""
+    width = stringWidth(text, font_name, font_size)
+    if width > max_width > 0:
+        return font_size * max_width / width
+    return font_size
+
+
+def _draw_table(canv, box, rows, font_size, bold_rows, align='center'):
+    """Draw a bordered table of strings filling box"""
+    page_width, page_height = PAGE_SIZE
+    left, bottom, width, height = box
+    x0, y0 = left * page_width, bottom * page_height
+    table_width, table_height = width * page_width, height * page_height
+
+    num_cols = max(len(row) for row in rows)
+    col_width = table_width / num_cols
+    row_height = table_height / len(rows)
+    top = y0 + table_height
+
+    xs = [x0 + i * col_width for i in range(num_cols + 1)]
+    ys = [top - i * row_height for i in range(len(rows) + 1)]
+    canv.setLineWidth(1)
+    canv.grid(xs, ys)
+
+    for r, row in enumerate(rows):
+        font_name = 'Helvetica-Bold' if r in bold_rows else 'Helvetica'
+        # Vertically centre the cap height in the row
+        baseline = top - (r + 0.5) * row_height - font_size * 0.35
+        for c, value in enumerate(row):
+            text = str(value)
+            size = _fit_font_size(text, font_name, font_size, col_width - 2 * CELL_PADDING)
+            canv.setFont(font_name, size)
+            if align == 'center':
+                canv.drawCentredString(xs[c] + col_width / 2, baseline, text)
+            else:
+                canv.drawString(xs[c] + CELL_PADDING, baseline, text)
+
+
+def draw_seating_page(canv, exam_type_text, date_text, session_text, hall_text,
+                      table_data, dept_counts, occupied, font_size):
+    """
+    Draw one hall page and finish it with showPage()
+
+    Args:
+        canv: Canvas from new_seating_canvas
+        exam_type_text: Text shown in brackets after the title
+        date_text, session_text, hall_text: Info line (left, centre, right)
+        table_data: Seat grid rows as strings, first row is the column headers
+        dept_counts: (department, count) pairs for the breakdown table
+        occupied: Total number of students in the hall
+        font_size: Seat grid font size
+    """
+    page_width, page_height = PAGE_SIZE
+    centre = page_width / 2
+
+    # College header
+    canv.setFont('Helvetica-Bold', 16)
+    canv.drawCentredString(centre, 0.96 * page_height, 'Marri Laxman Reddy Institute of Technology')
+    canv.setFont('Helvetica', 11)
+    canv.drawCentredString(centre, 0.93 * page_height, 'Hyderabad - 43')
+    canv.setFont('Helvetica-Oblique', 9)
+    canv.drawCentredString(centre, 0.90 * page_height, '[An Autonomous Institution]')
+    canv.setFont('Helvetica-Bold', 14)
+    canv.drawCentredString(centre, 0.87 * page_height, f'SEATING ARRANGEMENT ({exam_type_text})')
+
+    # Date, session and hall line
+    canv.setFont('Helvetica', 10)
+    canv.drawString(0.1 * page_width, 0.82 * page_height, date_text)
+    canv.drawCentredString(centre, 0.82 * page_height, session_text)
+    canv.drawRightString(0.9 * page_width, 0.82 * page_height, hall_text)
+
+    # Seat grid, header row in bold
+    _draw_table(canv, SEAT_GRID_BOX, table_data, font_size, bold_rows={0})
+
+    # Department breakdown, header and total rows in bold
+    dept_rows = [['Department', 'Count']]
+    dept_rows.extend([dept, count] for dept, count in dept_counts)
+    dept_rows.append(['Total Number of Students:', str(occupied)])
+    _draw_table(canv, DEPT_TABLE_BOX, dept_rows, 9,
+                bold_rows={0, len(dept_rows) - 1}, align='left')
+
+    canv.showPage()
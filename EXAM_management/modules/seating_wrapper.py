@@ -5,30 +5,41 @@ Preserves exact original PDF format using matplotlib while working with MongoDB
 """
 
 import sys
+import os
 import json
+from io import BytesIO
+from pathlib import Path
 from pymongo import MongoClient
 from bson import ObjectId
 from datetime import datetime
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_pdf import PdfPages
-import numpy as np
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.units import inch
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib.enums import TA_CENTER, TA_LEFT
-from reportlab.lib import colors
+from pdf_cache import default_cache as pdf_cache
+
+# Rendering dependencies (matplotlib, ReportLab, the process pool) are imported
+# inside the methods that draw PDFs, so allocate_seats starts without them.
+
+# The ReportLab page renderer (seating_canvas) lives with the standalone
+# seating module; added once per process, not per render
+SEATING_ARRANGEMENT_DIR = str(Path(__file__).parent / 'seating_arrangement')
+if SEATING_ARRANGEMENT_DIR not in sys.path:
+    sys.path.append(SEATING_ARRANGEMENT_DIR)
 
 # MongoDB connection
 MONGO_URI = "mongodb://127.0.0.1:27017/"
 DB_NAME = "exam_management"
 
+# Fields the PDF renderers read from allocations and halls
+ALLOCATION_FIELDS = ['hall', 'seatNumber', 'isLeftSeat', 'registerNumber', 'department']
+HALL_FIELDS = ['hallNumber', 'capacity', 'numberOfColumns', 'rowsPerColumn']
+
+# Part of the PDF cache keys, bump when a seating PDF layout changes
+SEATING_TEMPLATE_VERSION = 1
+
 class MongoSeatingAllocator:
     """MongoDB-integrated seating allocator that generates PDFs matching original format"""
     
-    def __init__(self, schedule_id, schedule_data=None):
-        """Initialize with MongoDB schedule ID and optional schedule data"""
-        self.client = MongoClient(MONGO_URI)
+    def __init__(self, schedule_id, schedule_data=None, client=None):
+        """Initialize with MongoDB schedule ID and optional schedule data (reuses client if given)"""
+        self.client = client if client is not None else MongoClient(MONGO_URI)
         self.db = self.client[DB_NAME]
         self.schedule_id = ObjectId(schedule_id) if isinstance(schedule_id, str) else schedule_id
         self.schedule_data = schedule_data  # Optional data from backend
@@ -36,16 +47,31 @@ class MongoSeatingAllocator:
         # Load schedule data
         self.load_schedule_data()
     
+    def __getstate__(self):
+        """Drop the MongoDB handles so the allocator can be pickled into render workers"""
+        state = self.__dict__.copy()
+        state.pop('client', None)
+        state.pop('db', None)
+        return state
+    
     def load_schedule_data(self):
-        """Load schedule, allocations, halls, departments from MongoDB"""
+        """
+        Load schedule, allocations, halls, departments from MongoDB
+        
+        Halls and departments are fetched in one $in query each, and every
+        query only projects the fields the PDF renderers read.
+        """
         # Try to get schedule from MongoDB
         schedule = self.db.schedules.find_one({'_id': self.schedule_id})
         
+        # Get all allocations for this schedule
+        allocations = list(self.db.allocations.find({'schedule': self.schedule_id}, ALLOCATION_FIELDS)
+                           .sort('seatNumber', 1))
+        
         # If not found in DB, MUST get from allocations or schedule_data
         if not schedule:
             # First priority: check allocations
-            alloc_count = self.db.allocations.count_documents({'schedule': self.schedule_id})
-            if alloc_count > 0:
+            if allocations:
                 # Build schedule from allocations - use defaults for PDF generation
                 schedule = {
                     '_id': self.schedule_id,
@@ -94,8 +120,6 @@ class MongoSeatingAllocator:
         self.generation_date = schedule.get('date', datetime.now().strftime('%Y-%m-%d'))
         self.session = schedule.get('session', 'FN')
         
-        # Get all allocations for this schedule
-        allocations = list(self.db.allocations.find({'schedule': self.schedule_id}).sort('seatNumber', 1))
         self.allocations = allocations
         
         # Group by hall
@@ -113,18 +137,16 @@ class MongoSeatingAllocator:
         
         # Load hall information
         self.halls = {}
-        for hall_id in hall_ids:
-            hall = self.db.halls.find_one({'_id': hall_id})
-            if hall:
-                self.halls[hall_id] = hall
+        if hall_ids:
+            for hall in self.db.halls.find({'_id': {'$in': list(hall_ids)}}, HALL_FIELDS):
+                self.halls[hall['_id']] = hall
         
         # Load department names
         self.departments = {}
         dept_ids = set(alloc.get('department') for alloc in allocations if alloc.get('department'))
-        for dept_id in dept_ids:
-            dept = self.db.departments.find_one({'_id': dept_id})
-            if dept:
-                self.departments[dept_id] = dept['name']
+        if dept_ids:
+            for dept in self.db.departments.find({'_id': {'$in': list(dept_ids)}}, ['name']):
+                self.departments[dept['_id']] = dept['name']
     
     def _convert_to_2d_layout(self, hall_allocations, hall_info):
         """Convert flat allocations to 2D grid layout matching exact column structure"""
@@ -191,46 +213,29 @@ class MongoSeatingAllocator:
         
         return layout, dept_counts, occupied
     
-    def _generate_hall_visual(self, hall_id):
-        """Generate matplotlib figure for one hall matching original format exactly"""
+    def _hall_page_content(self, hall_id):
+        """Collect the header text, seat grid and department breakdown for one hall page"""
         hall_info = self.halls.get(hall_id, {})
         hall_allocations = self.hall_wise_allocations.get(hall_id, [])
         hall_no = hall_info.get('hallNumber', 'Unknown')
         
         num_cols = hall_info.get('numberOfColumns', 4)
-        rows_per_col = hall_info.get('rowsPerColumn', 15)
         
         # Convert to 2D layout
         layout, dept_counts, occupied = self._convert_to_2d_layout(hall_allocations, hall_info)
         
-        # Create figure (A4 landscape: 11.69 x 8.27 inches)
-        fig, ax = plt.subplots(figsize=(11.69, 8.27))
-        ax.axis('off')
-        
-        # College header - exact positioning
-        fig.text(0.5, 0.96, 'Marri Laxman Reddy Institute of Technology',
-                ha='center', fontsize=16, fontweight='bold')
-        fig.text(0.5, 0.93, 'Hyderabad - 43',
-                ha='center', fontsize=11)
-        fig.text(0.5, 0.90, '[An Autonomous Institution]',
-                ha='center', fontsize=9, style='italic')
-        
         # Title
         if self.exam_type == 'Internal':
             roman_numeral = 'I' if self.internal_number == 1 else 'II'
             exam_type_text = f'Continuous Internal Assessment - {roman_numeral}'
         else:
             exam_type_text = 'End Semester Examination'
-        fig.text(0.5, 0.87, f'SEATING ARRANGEMENT ({exam_type_text})',
-                ha='center', fontsize=14, fontweight='bold')
         
-        # Date, session, hall info
-        fig.text(0.1, 0.82, f'Date: {self.generation_date}', fontsize=10)
+        # Session info
         if self.exam_type == 'Internal':
-            fig.text(0.5, 0.82, f'Session: Morning', ha='center', fontsize=10)
+            session_text = f'Session: Morning'
         else:
-            fig.text(0.5, 0.82, f'Session: {self.session}', ha='center', fontsize=10)
-        fig.text(0.9, 0.82, f'Hall: {hall_no}', ha='right', fontsize=10)
+            session_text = f'Session: {self.session}'
         
         # Column headers
         col_headers = [f'Column {i+1}' for i in range(num_cols)]
@@ -256,18 +261,50 @@ class MongoSeatingAllocator:
                         row_data.append(str(cell))
                 table_data.append(row_data)
         
+        return {
+            'exam_type_text': exam_type_text,
+            'date_text': f'Date: {self.generation_date}',
+            'session_text': session_text,
+            'hall_text': f'Hall: {hall_no}',
+            'table_data': table_data,
+            'dept_counts': list(dept_counts.items()),
+            'occupied': occupied,
+            'font_size': 6 if self.exam_type == 'Internal' else 9
+        }
+    
+    def _generate_hall_visual(self, hall_id):
+        """Generate matplotlib figure for one hall matching original format exactly"""
+        import matplotlib.pyplot as plt
+        
+        page = self._hall_page_content(hall_id)
+        
+        # Create figure (A4 landscape: 11.69 x 8.27 inches)
+        fig, ax = plt.subplots(figsize=(11.69, 8.27))
+        ax.axis('off')
+        
+        # College header - exact positioning
+        fig.text(0.5, 0.96, 'Marri Laxman Reddy Institute of Technology',
+                ha='center', fontsize=16, fontweight='bold')
+        fig.text(0.5, 0.93, 'Hyderabad - 43',
+                ha='center', fontsize=11)
+        fig.text(0.5, 0.90, '[An Autonomous Institution]',
+                ha='center', fontsize=9, style='italic')
+        fig.text(0.5, 0.87, f"SEATING ARRANGEMENT ({page['exam_type_text']})",
+                ha='center', fontsize=14, fontweight='bold')
+        
+        # Date, session, hall info
+        fig.text(0.1, 0.82, page['date_text'], fontsize=10)
+        fig.text(0.5, 0.82, page['session_text'], ha='center', fontsize=10)
+        fig.text(0.9, 0.82, page['hall_text'], ha='right', fontsize=10)
+        
         # Main seating table
-        table = ax.table(cellText=table_data, cellLoc='center', loc='center',
+        table = ax.table(cellText=page['table_data'], cellLoc='center', loc='center',
                         bbox=[0.1, 0.20, 0.8, 0.57])
         
         # Style table
         table.auto_set_font_size(False)
-        if self.exam_type == 'Internal':
-            table.set_fontsize(6)
-            table.scale(1, 2.0)
-        else:
-            table.set_fontsize(9)
-            table.scale(1, 2)
+        table.set_fontsize(page['font_size'])
+        table.scale(1, 2)
         
         # Style all cells
         for key, cell in table.get_celld().items():
@@ -280,9 +317,9 @@ class MongoSeatingAllocator:
                 cell.set_text_props(weight='bold')
         
         # Department breakdown table at bottom
-        dept_data = [[dept, count] for dept, count in dept_counts.items()]
+        dept_data = [[dept, count] for dept, count in page['dept_counts']]
         dept_data.insert(0, ['Department', 'Count'])
-        dept_data.append(['Total Number of Students:', str(occupied)])
+        dept_data.append(['Total Number of Students:', str(page['occupied'])])
         
         dept_table = ax.table(cellText=dept_data, cellLoc='left', loc='lower center',
                              bbox=[0.1, 0.05, 0.5, 0.15])
@@ -301,29 +338,21 @@ class MongoSeatingAllocator:
         plt.tight_layout()
         return fig
     
-    def generate_seating_pdf_student(self, output_dir='uploads/seating'):
-        """Generate student PDF with hall layouts using matplotlib"""
+    def generate_seating_pdf_student(self, output_dir='uploads/seating', workers=1, renderer='matplotlib'):
+        """
+        Generate student PDF with hall layouts
+        
+        renderer='reportlab' draws the pages with ReportLab canvas primitives
+        and never imports matplotlib. With the matplotlib renderer and
+        workers > 1 the hall pages are drawn in a process pool and merged in
+        hall order.
+        """
         import os
         os.makedirs(output_dir, exist_ok=True)
         
-        # Load allocations from database if not already loaded
+        # Allocations were loaded with the schedule, querying again cannot find more
         if not self.hall_wise_allocations:
-            allocations = list(self.db.allocations.find({'schedule': self.schedule_id}))
-            if not allocations:
-                return {"success": False, "message": "No allocations found for this schedule"}
-            
-            # Group by hall
-            self.hall_wise_allocations = {}
-            for alloc in allocations:
-                hall_id = alloc['hall']
-                if hall_id not in self.hall_wise_allocations:
-                    self.hall_wise_allocations[hall_id] = []
-                self.hall_wise_allocations[hall_id].append(alloc)
-        
-        # Generate filename
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f"seating_student_{self.schedule_id}_{timestamp}.pdf"
-        output_file = os.path.join(output_dir, filename)
+            return {"success": False, "message": "No allocations found for this schedule"}
         
         # Filter non-empty halls
         non_empty_halls = [hall_id for hall_id in sorted(self.hall_wise_allocations.keys())
@@ -332,44 +361,129 @@ class MongoSeatingAllocator:
         if not non_empty_halls:
             return {"success": False, "message": "No halls with students"}
         
-        # Generate PDF using matplotlib
-        with PdfPages(output_file) as pdf:
-            for hall_id in non_empty_halls:
-                fig = self._generate_hall_visual(hall_id)
-                pdf.savefig(fig, bbox_inches='tight', facecolor='white')
-                plt.close(fig)
+        # Generate filename from the hash of every page's content
+        cache_key = pdf_cache.key('seating_student', SEATING_TEMPLATE_VERSION, renderer,
+                                  [self._hall_page_content(hall_id) for hall_id in non_empty_halls])
+        filename = f"seating_student_{self.schedule_id}_{cache_key[:16]}.pdf"
+        output_file = os.path.join(output_dir, filename)
         
-        return {
+        result = {
             "success": True,
             "message": "Student seating PDF generated successfully",
             "pdfPath": output_file,
             "filename": filename
         }
+        if pdf_cache.fetch(cache_key, output_file):
+            return result
+        
+        if renderer == 'reportlab':
+            # Page renderer shared with the standalone seating module
+            from seating_canvas import new_seating_canvas, draw_seating_page
+            
+            canv = new_seating_canvas(output_file)
+            for hall_id in non_empty_halls:
+                draw_seating_page(canv, **self._hall_page_content(hall_id))
+            canv.save()
+        elif workers > 1:
+            self._generate_seating_pdf_student_parallel(non_empty_halls, output_file, workers)
+        else:
+            import matplotlib.pyplot as plt
+            from matplotlib.backends.backend_pdf import PdfPages
+            
+            with PdfPages(output_file) as pdf:
+                for hall_id in non_empty_halls:
+                    fig = self._generate_hall_visual(hall_id)
+                    pdf.savefig(fig, bbox_inches='tight', facecolor='white')
+                    plt.close(fig)
+        
+        pdf_cache.store(cache_key, output_file)
+        return result
+    
+    def _generate_seating_pdf_student_parallel(self, hall_ids, output_file, workers):
+        """Render each hall page in a worker process and merge pages in hall order"""
+        from concurrent.futures import ProcessPoolExecutor
+        from pypdf import PdfReader, PdfWriter
+        
+        writer = PdfWriter()
+        with ProcessPoolExecutor(max_workers=workers,
+                                 initializer=_init_hall_page_worker,
+                                 initargs=(self,)) as executor:
+            for page in executor.map(_render_hall_page, hall_ids):
+                writer.append(PdfReader(BytesIO(page)))
+        
+        with open(output_file, 'wb') as f:
+            writer.write(f)
+    
+    def _faculty_summary(self):
+        """Statistics rows and per-hall rows (hall, capacity, allocated, departments, invigilators) of the faculty PDF"""
+        # Overall Statistics
+        total_students = len(self.allocations)
+        halls_used = len(self.hall_wise_allocations)
+        
+        stats_data = [
+            ['Overall Statistics', ''],
+            ['Total Students Allocated:', str(total_students)],
+            ['Total Halls Used:', str(halls_used)],
+            ['Exam Type:', self.exam_type],
+            ['Year of Study:', f'Year {self.year}']
+        ]
+        
+        hall_rows = []
+        for hall_id in sorted(self.hall_wise_allocations.keys()):
+            hall_info = self.halls.get(hall_id, {})
+            hall_allocations = self.hall_wise_allocations[hall_id]
+            hall_no = hall_info.get('hallNumber', 'Unknown')
+            capacity = hall_info.get('capacity', 0)
+            allocated = len(hall_allocations)
+            
+            # Department breakdown
+            dept_counts = {}
+            for alloc in hall_allocations:
+                dept_id = alloc.get('department')
+                if dept_id:
+                    dept_name = self.departments.get(dept_id, 'Unknown')
+                    dept_counts[dept_name] = dept_counts.get(dept_name, 0) + 1
+            
+            dept_breakdown = ", ".join([f"{dept}: {count}" for dept, count in dept_counts.items()])
+            invigilators = max(1, allocated // 30)
+            
+            hall_rows.append([str(hall_no), str(capacity), str(allocated), dept_breakdown, str(invigilators)])
+        
+        return stats_data, hall_rows
     
     def generate_seating_pdf_faculty(self, output_dir='uploads/seating'):
         """Generate faculty PDF with summary table (portrait A4)"""
+        from reportlab.lib.pagesizes import A4
+        from reportlab.lib.units import inch
+        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+        from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+        from reportlab.lib.enums import TA_CENTER
+        from reportlab.lib import colors
+        
         import os
         os.makedirs(output_dir, exist_ok=True)
         
-        # Load allocations from database if not already loaded
+        # Allocations were loaded with the schedule, querying again cannot find more
         if not self.hall_wise_allocations:
-            allocations = list(self.db.allocations.find({'schedule': self.schedule_id}))
-            if not allocations:
-                return {"success": False, "message": "No allocations found for this schedule"}
-            
-            # Group by hall
-            self.hall_wise_allocations = {}
-            for alloc in allocations:
-                hall_id = alloc['hall']
-                if hall_id not in self.hall_wise_allocations:
-                    self.hall_wise_allocations[hall_id] = []
-                self.hall_wise_allocations[hall_id].append(alloc)
-        
-        # Generate filename
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f"seating_faculty_{self.schedule_id}_{timestamp}.pdf"
+            return {"success": False, "message": "No allocations found for this schedule"}
+        
+        stats_data, hall_rows = self._faculty_summary()
+        
+        # Generate filename from the hash of the summary content
+        cache_key = pdf_cache.key('seating_faculty', SEATING_TEMPLATE_VERSION,
+                                  [self.generation_date, self.session], stats_data, hall_rows)
+        filename = f"seating_faculty_{self.schedule_id}_{cache_key[:16]}.pdf"
         output_file = os.path.join(output_dir, filename)
         
+        result = {
+            "success": True,
+            "message": "Faculty duty roster PDF generated successfully",
+            "pdfPath": output_file,
+            "filename": filename
+        }
+        if pdf_cache.fetch(cache_key, output_file):
+            return result
+        
         # Use portrait A4
         doc = SimpleDocTemplate(output_file, pagesize=A4,
                                rightMargin=30, leftMargin=30,
@@ -423,17 +537,6 @@ class MongoSeatingAllocator:
         elements.append(Spacer(1, 0.3*inch))
         
         # Overall Statistics
-        total_students = len(self.allocations)
-        halls_used = len(self.hall_wise_allocations)
-        
-        stats_data = [
-            ['Overall Statistics', ''],
-            ['Total Students Allocated:', str(total_students)],
-            ['Total Halls Used:', str(halls_used)],
-            ['Exam Type:', self.exam_type],
-            ['Year of Study:', f'Year {self.year}']
-        ]
-        
         stats_table = Table(stats_data, colWidths=[3*inch, 2*inch])
         stats_table.setStyle(TableStyle([
             ('BACKGROUND', (0, 0), (-1, -1), colors.white),
@@ -463,33 +566,16 @@ class MongoSeatingAllocator:
         
         hall_data = [['Hall No.', 'Capacity', 'Allocated', 'Department Breakdown', 'Invigilators Needed']]
         
-        for hall_id in sorted(self.hall_wise_allocations.keys()):
-            hall_info = self.halls.get(hall_id, {})
-            hall_allocations = self.hall_wise_allocations[hall_id]
-            hall_no = hall_info.get('hallNumber', 'Unknown')
-            capacity = hall_info.get('capacity', 0)
-            allocated = len(hall_allocations)
-            
-            # Department breakdown
-            dept_counts = {}
-            for alloc in hall_allocations:
-                dept_id = alloc.get('department')
-                if dept_id:
-                    dept_name = self.departments.get(dept_id, 'Unknown')
-                    dept_counts[dept_name] = dept_counts.get(dept_name, 0) + 1
-            
-            dept_breakdown = ", ".join([f"{dept}: {count}" for dept, count in dept_counts.items()])
-            invigilators = max(1, allocated // 30)
-            
+        for hall_no, capacity, allocated, dept_breakdown, invigilators in hall_rows:
             # Wrap department breakdown in Paragraph for text wrapping
             dept_para = Paragraph(dept_breakdown, cell_style)
             
             hall_data.append([
-                str(hall_no),
-                str(capacity),
-                str(allocated),
+                hall_no,
+                capacity,
+                allocated,
                 dept_para,  # Use Paragraph object for wrapping
-                str(invigilators)
+                invigilators
             ])
         
         hall_table = Table(hall_data, colWidths=[0.6*inch, 0.7*inch, 0.7*inch, 3.4*inch, 1.8*inch])
@@ -510,13 +596,9 @@ class MongoSeatingAllocator:
         
         # Build PDF
         doc.build(elements)
+        pdf_cache.store(cache_key, output_file)
         
-        return {
-            "success": True,
-            "message": "Faculty duty roster PDF generated successfully",
-            "pdfPath": output_file,
-            "filename": filename
-        }
+        return result
     
     def allocate_seats(self):
         """Allocate seats for students (MongoDB version)"""
@@ -665,16 +747,38 @@ class MongoSeatingAllocator:
             "totalHalls": hall_idx + 1
         }
 
-def main():
-    """Command-line interface"""
-    if len(sys.argv) < 3:
-        print("Usage: python seating_wrapper.py <command> <schedule_id> [output_dir]")
-        print("Commands: allocate_seats, generate_student_pdf, generate_faculty_pdf")
-        sys.exit(1)
+# Allocator copy held by each student PDF render worker
+_worker_allocator = None
+
+def _init_hall_page_worker(allocator):
+    """Store the (connection-less) allocator in the worker process"""
+    global _worker_allocator
+    _worker_allocator = allocator
+
+def _render_hall_page(hall_id):
+    """Render one hall page to single-page PDF bytes"""
+    import matplotlib.pyplot as plt
+    from matplotlib.backends.backend_pdf import PdfPages
+    
+    fig = _worker_allocator._generate_hall_visual(hall_id)
+    buffer = BytesIO()
+    with PdfPages(buffer) as pdf:
+        pdf.savefig(fig, bbox_inches='tight', facecolor='white')
+    plt.close(fig)
+    return buffer.getvalue()
+
+def run_command(args, client=None):
+    """
+    Run one command and return (result, exit_code)
     
-    command = sys.argv[1]
-    schedule_id_param = sys.argv[2]
-    output_dir = sys.argv[3] if len(sys.argv) > 3 else 'uploads/seating'
+    Used by main() and by the worker daemon, which passes its pooled client.
+    """
+    if len(args) < 2:
+        return {"success": False, "message": "Usage: python seating_wrapper.py <command> <schedule_id> [output_dir]"}, 1
+    
+    command = args[0]
+    schedule_id_param = args[1]
+    output_dir = args[2] if len(args) > 2 else 'uploads/seating'
     
     # Handle both JSON object and plain schedule_id
     schedule_id = schedule_id_param
@@ -696,23 +800,50 @@ def main():
         pass
     
     try:
-        allocator = MongoSeatingAllocator(schedule_id, schedule_data)
+        allocator = MongoSeatingAllocator(schedule_id, schedule_data, client=client)
         
         if command == 'allocate_seats':
             result = allocator.allocate_seats()
         elif command == 'generate_student_pdf':
-            result = allocator.generate_seating_pdf_student(output_dir)
+            workers = int(os.environ.get('SEATING_PDF_WORKERS', '1'))
+            renderer = os.environ.get('SEATING_PDF_RENDERER', 'matplotlib')
+            result = allocator.generate_seating_pdf_student(output_dir, workers=workers, renderer=renderer)
         elif command == 'generate_faculty_pdf':
             result = allocator.generate_seating_pdf_faculty(output_dir)
+        elif command == 'generate_pdfs':
+            # Both PDFs from the allocations, halls and departments loaded once
+            workers = int(os.environ.get('SEATING_PDF_WORKERS', '1'))
+            renderer = os.environ.get('SEATING_PDF_RENDERER', 'matplotlib')
+            student_result = allocator.generate_seating_pdf_student(output_dir, workers=workers, renderer=renderer)
+            faculty_result = allocator.generate_seating_pdf_faculty(output_dir)
+            failed = next((r for r in (student_result, faculty_result) if not r.get('success')), None)
+            result = {
+                "success": failed is None,
+                "message": failed['message'] if failed else "Seating PDFs generated successfully",
+                "studentPdf": student_result,
+                "facultyPdf": faculty_result
+            }
         else:
             result = {"success": False, "message": f"Unknown command: {command}"}
         
-        print(json.dumps(result))
-        sys.exit(0 if result.get('success') else 1)
+        return result, (0 if result.get('success') else 1)
     
     except Exception as e:
-        print(json.dumps({"success": False, "message": str(e)}))
+        return {"success": False, "message": str(e)}, 1
+
+def main():
+    """Command-line interface"""
+    if len(sys.argv) < 3:
+        print("Usage: python seating_wrapper.py <command> <schedule_id> [output_dir]")
+        print("Commands: allocate_seats, generate_student_pdf, generate_faculty_pdf, generate_pdfs")
         sys.exit(1)
+    
+    # Hand the command to the worker daemon when one is running
+    from worker_client import run_in_worker
+    result, exit_code = run_in_worker('seating_wrapper.py', sys.argv[1:]) or run_command(sys.argv[1:])
+    
+    print(json.dumps(result))
+    sys.exit(exit_code)
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,79 @@
+"""
+Graph-Colouring Slot Allocator
+Assigns exams to the fewest slots with the DSATUR heuristic: subjects that
+conflict (shared students) get different colours, and each colour is a slot.
+
+DSATUR repeatedly colours the subject whose neighbours already use the most
+distinct colours (ties: most conflicts, most students, then input order).
+With a seat capacity, as many colours as the seats require are opened up
+front and each subject takes the least-loaded colour that no neighbour uses
+and that still has seats for its students, so headcounts spread evenly
+instead of filling the first slots; a new colour is opened only when none
+fits.
+"""
+
+import heapq
+
+
+def dsatur_colouring(nodes, neighbors, headcount=None, capacity=None):
+    """
+    Colour nodes so that no two neighbours share a colour
+
+    Args:
+        nodes: Hashable subject keys; earlier nodes win ties
+        neighbors: Dict mapping each node to the nodes it conflicts with
+        headcount: Optional dict of students sitting each node's exam
+        capacity: Optional seats per colour (slot); None means unlimited
+
+    Returns:
+        Dict mapping node to colour (0, 1, 2, ...)
+
+    Raises:
+        ValueError: If a single subject has more students than a slot has seats
+    """
+    headcount = headcount or {}
+    order = {node: i for i, node in enumerate(nodes)}
+    adjacency = {node: [other for other in neighbors.get(node, ()) if other in order and other != node]
+                 for node in nodes}
+
+    if capacity is not None:
+        for node in nodes:
+            if headcount.get(node, 0) > capacity:
+                raise ValueError(f"{node} has {headcount[node]} students, only {capacity} seats per slot")
+
+    saturation = {node: set() for node in nodes}
+    colours = {}
+    if capacity:
+        total = sum(headcount.get(node, 0) for node in nodes)
+        load = [0] * -(-total // capacity)
+    else:
+        load = []
+
+    # Max-heap on (saturation, degree, students); stale entries are skipped when popped
+    heap = [(0, -len(adjacency[node]), -headcount.get(node, 0), order[node], node) for node in nodes]
+    heapq.heapify(heap)
+
+    while heap:
+        neg_saturation, _, _, _, node = heapq.heappop(heap)
+        if node in colours or -neg_saturation != len(saturation[node]):
+            continue
+
+        students = headcount.get(node, 0)
+        free = [c for c in range(len(load)) if c not in saturation[node]
+                and (capacity is None or load[c] + students <= capacity)]
+        if free:
+            colour = min(free, key=lambda c: (load[c], c)) if capacity else free[0]
+        else:
+            colour = len(load)
+            load.append(0)
+
+        colours[node] = colour
+        load[colour] += students
+
+        for other in adjacency[node]:
+            if other not in colours and colour not in saturation[other]:
+                saturation[other].add(colour)
+                heapq.heappush(heap, (-len(saturation[other]), -len(adjacency[other]),
+                                      -headcount.get(other, 0), order[other], other))
+
+    return colours
@@ -0,0 +1,115 @@
+"""
+Hall ticket wrapper CLI and bulk generation, against in-memory stand-ins
+"""
+
+import io
+import os
+import sys
+import json
+from contextlib import redirect_stdout
+from pathlib import Path
+
+from bson import ObjectId
+
+import worker_client
+import hall_ticket_wrapper
+
+MODULES_DIR = Path(__file__).resolve().parent
+
+SCHEDULE_ID = '5f0000000000000000000000'
+
+
+def _run_main(serve_post, argv, run_command):
+    """Run hall_ticket_wrapper.main() from the modules directory with a daemon listening"""
+    requests = []
+
+    def handle(handler):
+        requests.append(json.loads(handler.rfile.read(int(handler.headers['Content-Length']))))
+        data = b'{"exitCode": 0, "result": {"success": true, "generated": []}}'
+        handler.send_response(200)
+        handler.send_header('Content-Length', str(len(data)))
+        handler.end_headers()
+        handler.wfile.write(data)
+
+    saved = (worker_client.WORKER_URL, hall_ticket_wrapper.run_command, sys.argv, os.getcwd())
+    worker_client.WORKER_URL = serve_post(handle)
+    hall_ticket_wrapper.run_command = run_command
+    sys.argv = ['hall_ticket_wrapper.py'] + argv
+    os.chdir(MODULES_DIR)
+
+    stdout = io.StringIO()
+    try:
+        with redirect_stdout(stdout):
+            exit_code = hall_ticket_wrapper.main()
+    finally:
+        worker_client.WORKER_URL, hall_ticket_wrapper.run_command, sys.argv, _ = saved
+        os.chdir(saved[3])
+
+    return exit_code, [json.loads(line) for line in stdout.getvalue().splitlines()], requests
+
+
+def _fake_bulk(args, client=None):
+    """generate_bulk stand-in that reports two students the way --progress does"""
+    for done, reg_no in enumerate(['21CS001', '21CS002'], 1):
+        entry = {'success': True, 'registerNumber': reg_no, 'pdfPath': f'{reg_no}.pdf'}
+        if '--progress' in args:
+            hall_ticket_wrapper._print_progress(entry, done, 2)
+    return {'success': True, 'total': 2, 'successful': 2}, 0
+
+
+def test_progress_lines_arrive_while_daemon_listens(serve_post):
+    exit_code, lines, requests = _run_main(serve_post, [SCHEDULE_ID, 'generate_bulk', '1', '--progress'], _fake_bulk)
+
+    assert exit_code == 0
+    assert requests == []
+    assert [line.get('event') for line in lines] == ['progress', 'progress', None]
+    assert [line['done'] for line in lines[:2]] == [1, 2]
+    assert lines[-1] == {'success': True, 'total': 2, 'successful': 2}
+
+
+def test_other_commands_go_to_the_daemon(serve_post):
+    exit_code, lines, requests = _run_main(serve_post, [SCHEDULE_ID, 'generate_bulk', '1'], _fake_bulk)
+
+    assert exit_code == 0
+    assert [request['args'] for request in requests] == [[SCHEDULE_ID, 'generate_bulk', '1']]
+    assert lines == [{'success': True, 'generated': []}]
+
+
+def test_merge_by_department_uses_department_names(mongo, tmp_path):
+    cse, ece = ObjectId(), ObjectId()
+    db = mongo[hall_ticket_wrapper.DB_NAME]
+    db.students.insert_many([
+        # Students created through the backend model: department ref, no branch
+        {'_id': ObjectId(), 'name': 'A', 'registerNumber': '21CS001', 'department': cse, 'yearOfStudy': 1},
+        {'_id': ObjectId(), 'name': 'B', 'registerNumber': '21EC001', 'department': ece, 'yearOfStudy': 1},
+        {'_id': ObjectId(), 'name': 'C', 'registerNumber': '21CS002', 'department': cse, 'yearOfStudy': 1},
+        # Imported student with only a branch name
+        {'_id': ObjectId(), 'name': 'D', 'registerNumber': '21ME001', 'branch': 'MECH', 'yearOfStudy': 1},
+        {'_id': ObjectId(), 'name': 'E', 'registerNumber': '22CS001', 'department': cse, 'yearOfStudy': 2},
+    ])
+    db.departments.insert_many([{'_id': cse, 'name': 'CSE'}, {'_id': ece, 'name': 'ECE'}])
+
+    generator = hall_ticket_wrapper.MongoHallTicketGenerator(str(ObjectId()), client=mongo)
+    generator.schedule_data = {'academicYear': '2024-25', 'semester': 'SEM'}
+
+    built = {}
+
+    def build_merged(group_students, output_path):
+        built[Path(output_path).name] = [student['registerNumber'] for student in group_students]
+        entries = [{'success': True, 'registerNumber': student['registerNumber'],
+                    'pdfPath': str(output_path), 'page': page}
+                   for page, student in enumerate(group_students, 1)]
+        return entries, len(entries)
+
+    generator._build_merged_tickets = build_merged
+
+    result = generator.generate_bulk_hall_tickets(1, output_dir=str(tmp_path), merge='department')
+
+    assert [(doc['group'], doc['tickets']) for doc in result['documents']] == [('CSE', 2), ('ECE', 1), ('MECH', 1)]
+    assert built[f'hall_tickets_{generator.schedule_id}_CSE.pdf'] == ['21CS001', '21CS002']
+    assert result['index']['21EC001']['page'] == 1
+
+    # department is loaded for grouping only, never part of the ticket cache key
+    assert 'department' in db.students.projections[-1]
+    assert 'department' not in hall_ticket_wrapper.TICKET_FIELDS
+
@@ -0,0 +1,72 @@
+"""
+PDF output cache eviction and concurrent stores
+"""
+
+import os
+import time
+import threading
+
+import pdf_cache
+from pdf_cache import PDFCache
+
+
+def _render(path, size=1000):
+    path.write_bytes(b'%PDF' + b'x' * size)
+    return path
+
+
+def _age(path, seconds):
+    then = time.time() - seconds
+    os.utime(path, (then, then))
+
+
+def test_first_store_of_a_process_sweeps(tmp_path):
+    cache = PDFCache(tmp_path / 'cache', max_bytes=10 ** 6, max_age_days=1)
+    cache.store('a' * 64, _render(tmp_path / 'old.pdf'))
+    _age(cache._path('a' * 64), 2 * 24 * 3600)
+    _age(tmp_path / 'cache' / pdf_cache.SWEEP_MARKER, pdf_cache.SWEEP_INTERVAL + 1)
+
+    # A new CLI process stores one PDF: the expired entry goes
+    PDFCache(tmp_path / 'cache', max_bytes=10 ** 6, max_age_days=1).store('b' * 64, _render(tmp_path / 'new.pdf'))
+
+    assert not cache._path('a' * 64).exists()
+    assert cache._path('b' * 64).exists()
+
+
+def test_sweeps_at_most_once_per_interval(tmp_path):
+    for n, key in enumerate(['a' * 64, 'b' * 64, 'c' * 64]):
+        # Each store from its own process, over the size limit
+        PDFCache(tmp_path / 'cache', max_bytes=1500).store(key, _render(tmp_path / f'{n}.pdf'))
+
+    # The first store swept an empty cache, the others came within the interval
+    assert len(list((tmp_path / 'cache').glob('*/*.pdf'))) == 3
+
+    _age(tmp_path / 'cache' / pdf_cache.SWEEP_MARKER, pdf_cache.SWEEP_INTERVAL + 1)
+    PDFCache(tmp_path / 'cache', max_bytes=1500).store('d' * 64, _render(tmp_path / 'd.pdf'))
+    assert sorted(path.name[:1] for path in (tmp_path / 'cache').glob('*/*.pdf')) == ['d']
+
+
+def test_threads_storing_one_key(tmp_path):
+    cache = PDFCache(tmp_path / 'cache')
+    cache._path('e' * 64).parent.mkdir(parents=True)
+    sources = [_render(tmp_path / f'{n}.pdf') for n in range(8)]
+    errors = []
+
+    def store(source, barrier):
+        barrier.wait()
+        try:
+            pdf_cache._link_or_copy(source, cache._path('e' * 64))
+        except OSError as e:
+            errors.append(e)
+
+    # The race is narrow, run it a few times
+    for _ in range(20):
+        barrier = threading.Barrier(len(sources))
+        threads = [threading.Thread(target=store, args=(source, barrier)) for source in sources]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert errors == []
+    assert list(cache._path('e' * 64).parent.glob('*.tmp')) == []
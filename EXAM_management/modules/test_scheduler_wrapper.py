@@ -0,0 +1,76 @@
+"""
+Timetable generation against the seats of the selected halls
+"""
+
+import pytest
+from bson import ObjectId
+
+from scheduler_wrapper import MongoScheduler
+from seating_wrapper import MongoSeatingAllocator
+
+
+def _setup(mongo, benches, students_per_dept=(12, 10)):
+    """Two departments with three subjects each, and one hall of benches"""
+    db = mongo.get_default_database()
+    departments = [{'_id': ObjectId(), 'code': code} for code in ('CSE', 'ECE')]
+    db.departments.insert_many(departments)
+    db.subjects.insert_many([
+        {'code': f"{dept['code']}20{n}", 'name': f"Subject {n}", 'department': dept['_id'],
+         'year': 2, 'semester': 3, 'isActive': True}
+        for dept in departments for n in range(1, 4)
+    ])
+    db.students.insert_many([
+        {'registerNumber': f"22{dept['code']}{n:03d}", 'name': 'Student', 'department': dept['_id'],
+         'year': 2, 'isActive': True}
+        for dept, count in zip(departments, students_per_dept) for n in range(count)
+    ])
+    # Left the college, neither scheduled nor seated
+    db.students.insert_many([{'registerNumber': '22CSE999', 'department': departments[0]['_id'],
+                              'year': 2, 'isActive': False}])
+    hall = {'_id': ObjectId(), 'hallNumber': 'H101', 'capacity': benches, 'isActive': True}
+    db.halls.insert_many([hall])
+    return hall
+
+
+def _generate(mongo, hall, strategy):
+    return MongoScheduler(client=mongo).generate_timetable({
+        'year': 2, 'semester': 3, 'examType': 'Internal', 'session': 'FN',
+        'startDate': '2025-12-01', 'endDate': '2025-12-19', 'holidays': [],
+        'scheduleId': str(ObjectId()), 'strategy': strategy, 'halls': [str(hall['_id'])]
+    })
+
+
+def _allocate(mongo, hall):
+    schedule_id = ObjectId()
+    allocator = MongoSeatingAllocator(schedule_id, {
+        'scheduleId': str(schedule_id), 'examType': 'Internal', 'year': 2, 'halls': [str(hall['_id'])]
+    }, client=mongo)
+    return allocator.allocate_seats()
+
+
+@pytest.mark.parametrize('strategy', ['sequential', 'dsatur'])
+def test_refuses_a_year_larger_than_the_halls(mongo, strategy):
+    # 22 students, 10 benches of two: each department fits, the year does not
+    hall = _setup(mongo, benches=10)
+
+    result = _generate(mongo, hall, strategy)
+    assert result['success'] is False
+    assert result['message'] == 'Year 2 has 22 students, the halls seat only 20'
+    assert result['timetable'] == []
+
+    # Which is what seating would have run into after saving the timetable
+    assert _allocate(mongo, hall) == {'success': False, 'message': 'Not enough halls for all students'}
+
+
+@pytest.mark.parametrize('strategy', ['sequential', 'dsatur'])
+def test_accepted_timetable_can_be_seated(mongo, strategy):
+    hall = _setup(mongo, benches=11)
+
+    result = _generate(mongo, hall, strategy)
+    assert result['success'] is True
+    assert sorted(entry['subjectCode'] for entry in result['timetable']) == [
+        'CSE201', 'CSE202', 'CSE203', 'ECE201', 'ECE202', 'ECE203']
+
+    seating = _allocate(mongo, hall)
+    assert seating['success'] is True
+    assert seating['totalStudents'] == 22
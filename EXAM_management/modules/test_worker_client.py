@@ -0,0 +1,200 @@
+"""
+Worker daemon client and request handling, against small local HTTP servers
+"""
+
+import os
+import sys
+import json
+import types
+import socket
+import threading
+from concurrent.futures import Future
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+
+import worker_client
+import worker_daemon
+
+MODULES_DIR = Path(__file__).resolve().parent
+
+
+def _reply(handler, status, body):
+    data = body.encode()
+    handler.send_response(status)
+    handler.send_header('Content-Length', str(len(data)))
+    handler.end_headers()
+    handler.wfile.write(data)
+
+
+def _run(url, args=('x',)):
+    """run_in_worker against the daemon at url, from the modules directory"""
+    saved_url, saved_cwd = worker_client.WORKER_URL, os.getcwd()
+    worker_client.WORKER_URL = url
+    os.chdir(MODULES_DIR)
+    try:
+        return worker_client.run_in_worker('seating_wrapper.py', list(args))
+    finally:
+        worker_client.WORKER_URL = saved_url
+        os.chdir(saved_cwd)
+
+
+def test_reply_is_returned(serve_post):
+    received = []
+
+    def handle(handler):
+        received.append(json.loads(handler.rfile.read(int(handler.headers['Content-Length']))))
+        _reply(handler, 200, '{"exitCode": 0, "result": {"success": true}}')
+
+    os.environ['SEATING_PDF_WORKERS'] = '3'
+    try:
+        assert _run(serve_post(handle)) == ({'success': True}, 0)
+    finally:
+        del os.environ['SEATING_PDF_WORKERS']
+
+    assert received[0]['cwd'] == str(MODULES_DIR)
+    assert received[0]['env'] == {'SEATING_PDF_WORKERS': '3'}
+
+
+def test_refused_connection_falls_back():
+    # Bind a port, then close it so nothing is listening there
+    probe = socket.socket()
+    probe.bind(('127.0.0.1', 0))
+    port = probe.getsockname()[1]
+    probe.close()
+
+    saved_url, saved_cwd = worker_client.WORKER_URL, os.getcwd()
+    worker_client.WORKER_URL = f'http://127.0.0.1:{port}'
+    os.chdir(MODULES_DIR)
+    try:
+        assert worker_client.run_in_worker('seating_wrapper.py', []) is None
+    finally:
+        worker_client.WORKER_URL = saved_url
+        os.chdir(saved_cwd)
+
+
+def _failed(reply):
+    """The error result run_in_worker returns once the request was sent"""
+    result, exit_code = reply
+    return result['success'] is False and exit_code == 1
+
+
+def test_reset_connection_is_not_run_again(serve_post):
+    def handle(handler):
+        handler.connection.shutdown(socket.SHUT_RDWR)
+
+    assert _failed(_run(serve_post(handle)))
+
+
+def test_hung_daemon_is_not_run_again(serve_post):
+    release = threading.Event()
+
+    def handle(handler):
+        release.wait(5)
+
+    saved_timeout = worker_client.REPLY_TIMEOUT
+    worker_client.REPLY_TIMEOUT = 0.2
+    try:
+        result, _ = _run(serve_post(handle))
+    finally:
+        worker_client.REPLY_TIMEOUT = saved_timeout
+        release.set()
+    assert result['error'] == 'TimeoutError'
+
+
+def test_non_json_reply_is_an_error(serve_post):
+    assert _failed(_run(serve_post(lambda handler: _reply(handler, 500, '<html>Internal error</html>'))))
+
+
+def test_reply_without_result_is_an_error(serve_post):
+    assert _failed(_run(serve_post(lambda handler: _reply(handler, 200, '{"exitCode": 0}'))))
+
+
+def test_other_working_directory_runs_in_process():
+    saved_cwd = os.getcwd()
+    os.chdir(MODULES_DIR.parent)
+    try:
+        assert worker_client.run_in_worker('seating_wrapper.py', []) is None
+    finally:
+        os.chdir(saved_cwd)
+
+
+class _RecordingExecutor:
+    """Stands in for the process pool, runs nothing"""
+
+    _max_workers = 1
+
+    def __init__(self):
+        self.calls = []
+
+    def submit(self, func, *args):
+        self.calls.append(args)
+        future = Future()
+        future.set_result(('{"success": true}', 0))
+        return future
+
+
+def _post_to_daemon(request):
+    executor = _RecordingExecutor()
+    worker_daemon.WorkerRequestHandler.executor = executor
+    server = ThreadingHTTPServer(('127.0.0.1', 0), worker_daemon.WorkerRequestHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    import http.client
+    connection = http.client.HTTPConnection('127.0.0.1', server.server_address[1], timeout=5)
+    try:
+        connection.request('POST', '/run', json.dumps(request), {'Content-Type': 'application/json'})
+        response = connection.getresponse()
+        return response.status, json.loads(response.read()), executor.calls
+    finally:
+        connection.close()
+        server.shutdown()
+        server.server_close()
+
+
+def test_daemon_refuses_other_working_directories():
+    status, reply, calls = _post_to_daemon({'script': 'seating_wrapper.py', 'args': [], 'cwd': '/tmp'})
+    assert status == 403
+    assert reply['exitCode'] == 1
+    assert calls == []
+
+
+def test_daemon_runs_from_modules_directory():
+    status, reply, calls = _post_to_daemon({
+        'script': 'seating_wrapper.py', 'args': ['a'], 'cwd': str(MODULES_DIR),
+        'env': {'SEATING_PDF_WORKERS': '2'}
+    })
+    assert status == 200
+    assert reply == {'exitCode': 0, 'result': {'success': True}}
+    assert calls == [('seating_wrapper.py', ['a'], {'SEATING_PDF_WORKERS': '2'})]
+
+
+def test_request_env_applies_to_one_command():
+    seen = {}
+
+    def run_command(args, client=None):
+        seen.update({key: os.environ.get(key) for key in worker_daemon.FORWARDED_ENV})
+        return {'success': True}, 0
+
+    module = types.ModuleType('fake_wrapper')
+    module.MONGO_URI = 'mongodb://localhost:27017/'
+    module.run_command = run_command
+    sys.modules['fake_wrapper'] = module
+    worker_daemon.WRAPPERS['fake_wrapper.py'] = 'fake_wrapper'
+
+    os.environ['HALL_TICKET_WORKERS'] = '8'
+    saved_cwd = os.getcwd()
+    try:
+        result_json, exit_code = worker_daemon._run_request(
+            'fake_wrapper.py', [], {'SEATING_PDF_RENDERER': 'reportlab'})
+        assert (json.loads(result_json), exit_code) == ({'success': True}, 0)
+        # The caller's settings replace the daemon's, which come back afterwards
+        assert seen == {'SEATING_PDF_WORKERS': None, 'SEATING_PDF_RENDERER': 'reportlab',
+                        'HALL_TICKET_WORKERS': None}
+        assert os.environ.get('HALL_TICKET_WORKERS') == '8'
+        assert 'SEATING_PDF_RENDERER' not in os.environ
+    finally:
+        os.chdir(saved_cwd)
+        del os.environ['HALL_TICKET_WORKERS']
+        del worker_daemon.WRAPPERS['fake_wrapper.py']
+        del sys.modules['fake_wrapper']
+
@@ -0,0 +1,84 @@
+"""
+Worker Daemon Client
+Forwards a wrapper command to a running worker_daemon.py so the CLI entry
+points stay thin. Only the standard library is imported here.
+
+Set PYTHON_WORKER_URL to point at the daemon, or to an empty string to always
+run commands in-process. When no daemon accepts the connection the command
+runs in-process. Once a request has been sent it is never run a second time:
+a lost or unreadable reply is reported as a failed command, since the daemon
+may already have run it (allocate_seats, generate_timetable and
+generate_bulk write to the database and the output directory).
+
+Per-command settings (FORWARDED_ENV) are sent with each request and apply
+to that command only. Settings read when a module is imported (MONGO_URI,
+PDF_CACHE_*, QR_CACHE_*, REFERENCE_CACHE_TTL) come from the daemon's own
+environment; restart the daemon to change them.
+"""
+
+import os
+import json
+import http.client
+from pathlib import Path
+from urllib.parse import urlsplit
+
+WORKER_URL = os.environ.get('PYTHON_WORKER_URL', 'http://127.0.0.1:8765')
+
+# Seconds to wait for the daemon to accept the connection, and for its reply
+CONNECT_TIMEOUT = 2.0
+REPLY_TIMEOUT = float(os.environ.get('PYTHON_WORKER_TIMEOUT', '600'))
+
+# Environment settings read per command, forwarded so they follow the caller
+FORWARDED_ENV = ('SEATING_PDF_WORKERS', 'SEATING_PDF_RENDERER', 'HALL_TICKET_WORKERS')
+
+# The daemon only runs commands from the modules directory
+MODULES_DIR = Path(__file__).resolve().parent
+
+
+def run_in_worker(script, args):
+    """
+    Run a wrapper command in the worker daemon
+
+    Args:
+        script: Wrapper file name, e.g. 'seating_wrapper.py'
+        args: Command line arguments after the script name
+
+    Returns:
+        (result, exit_code) from the daemon, an error result with exit code 1
+        when its reply is lost or unusable, or None when no daemon accepted
+        the connection and the caller should run the command itself
+    """
+    if not WORKER_URL or Path.cwd().resolve() != MODULES_DIR:
+        return None
+
+    url = urlsplit(WORKER_URL)
+    body = json.dumps({
+        'script': script,
+        'args': list(args),
+        'cwd': str(MODULES_DIR),
+        'env': {key: os.environ[key] for key in FORWARDED_ENV if key in os.environ},
+    })
+
+    connection = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=CONNECT_TIMEOUT)
+    try:
+        connection.connect()
+    except OSError:
+        # Refused or timed out: no daemon, nothing was sent
+        connection.close()
+        return None
+
+    try:
+        connection.sock.settimeout(REPLY_TIMEOUT)
+        connection.request('POST', '/run', body, {'Content-Type': 'application/json'})
+        response = connection.getresponse()
+        reply = json.loads(response.read())
+        return reply['result'], reply['exitCode']
+    except (OSError, http.client.HTTPException, ValueError, KeyError, TypeError) as e:
+        # Reset or timed out after sending, or a reply that is not ours
+        return {
+            'success': False,
+            'message': f'Python worker daemon request failed: {e}',
+            'error': type(e).__name__
+        }, 1
+    finally:
+        connection.close()
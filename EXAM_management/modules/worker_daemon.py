@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Persistent Python Worker Daemon
+Serves scheduler, seating and hall ticket commands over local HTTP so the
+backend does not start a new interpreter (and re-import pandas, matplotlib,
+ReportLab and pymongo) for every request.
+
+Each command runs in a pool of warm worker processes. A worker keeps the
+wrappers imported and one pooled MongoClient per URI, and runs from the
+modules directory, as the CLI does when the backend spawns it. Requests
+with any other working directory are refused. Worker processes (rather
+than threads) keep matplotlib's global pyplot state private to one request
+at a time.
+
+The per-command settings in FORWARDED_ENV are taken from the request, so
+they follow the caller. Settings read at import time (MONGO_URI,
+PDF_CACHE_*, QR_CACHE_*, REFERENCE_CACHE_TTL) come from the daemon's own
+environment.
+
+Protocol (JSON over HTTP on 127.0.0.1):
+    POST /run     {"script": "seating_wrapper.py", "args": [...], "cwd": "...",
+                   "env": {"SEATING_PDF_WORKERS": "4", ...}}
+                  -> {"exitCode": 0, "result": {...}}
+    GET  /health  -> {"success": true, "processes": N}
+
+Usage:
+    python worker_daemon.py [--port 8765] [--processes N]
+"""
+
+import os
+import sys
+import json
+import signal
+import importlib
+from contextlib import redirect_stdout
+from concurrent.futures import ProcessPoolExecutor, wait
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from pathlib import Path
+
+MODULES_DIR = Path(__file__).resolve().parent
+
+DEFAULT_PORT = 8765
+
+# Environment settings a request may set for its own command
+FORWARDED_ENV = ('SEATING_PDF_WORKERS', 'SEATING_PDF_RENDERER', 'HALL_TICKET_WORKERS')
+
+# Scripts the daemon serves, mapped to the module exposing run_command()
+WRAPPERS = {
+    'scheduler_wrapper.py': 'scheduler_wrapper',
+    'seating_wrapper.py': 'seating_wrapper',
+    'hall_ticket_wrapper.py': 'hall_ticket_wrapper',
+}
+
+# MongoClient per URI, created inside each worker process (clients are not fork-safe)
+_clients = {}
+
+
+def _init_worker():
+    """Import the wrappers and their rendering libraries once per worker"""
+    sys.path.insert(0, str(MODULES_DIR))
+
+    import matplotlib
+    matplotlib.use('Agg')
+
+    # Preloaded for the renderers the wrappers import lazily, not used here
+    for module_name in ['matplotlib.pyplot', 'qrcode', 'reportlab.platypus', *WRAPPERS.values()]:
+        importlib.import_module(module_name)
+
+
+def _worker_pid():
+    """No-op task used to start and warm up every worker at launch"""
+    return os.getpid()
+
+
+def _get_client(mongo_uri):
+    """Return this worker's pooled MongoClient for mongo_uri"""
+    from pymongo import MongoClient
+
+    if mongo_uri not in _clients:
+        _clients[mongo_uri] = MongoClient(mongo_uri)
+    return _clients[mongo_uri]
+
+
+def _run_request(script, args, env):
+    """Run one wrapper command in a worker and return (result_json, exit_code)"""
+    module = importlib.import_module(WRAPPERS[script])
+    os.chdir(MODULES_DIR)
+
+    # The caller's per-command settings replace the daemon's for this command only
+    saved = {key: os.environ.pop(key, None) for key in FORWARDED_ENV}
+    os.environ.update({key: env[key] for key in FORWARDED_ENV if key in env})
+    try:
+        # Keep stray prints out of the reply, they go to the daemon log instead
+        with redirect_stdout(sys.stderr):
+            result, exit_code = module.run_command(args, client=_get_client(module.MONGO_URI))
+    finally:
+        for key, value in saved.items():
+            os.environ.pop(key, None)
+            if value is not None:
+                os.environ[key] = value
+
+    return json.dumps(result, default=str), exit_code
+
+
+class WorkerRequestHandler(BaseHTTPRequestHandler):
+    """JSON request handler, one thread per connection"""
+
+    executor = None
+
+    def _reply(self, status, body):
+        data = body.encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _reply_error(self, status, message):
+        result = json.dumps({'success': False, 'message': message})
+        self._reply(status, f'{{"exitCode": 1, "result": {result}}}')
+
+    def do_GET(self):
+        if self.path != '/health':
+            self._reply_error(404, f'Unknown path: {self.path}')
+            return
+        self._reply(200, json.dumps({'success': True, 'processes': self.executor._max_workers}))
+
+    def do_POST(self):
+        if self.path != '/run':
+            self._reply_error(404, f'Unknown path: {self.path}')
+            return
+
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            request = json.loads(self.rfile.read(length))
+            script = request['script']
+            args = [str(arg) for arg in request.get('args', [])]
+            cwd = request.get('cwd')
+            env = {str(key): str(value) for key, value in request.get('env', {}).items()}
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            self._reply_error(400, f'Invalid request: {e}')
+            return
+
+        if script not in WRAPPERS:
+            self._reply_error(400, f'Unknown script: {script}')
+            return
+
+        # Commands only run from the modules directory, as the backend spawns them
+        if cwd is not None and Path(str(cwd)).resolve() != MODULES_DIR:
+            self._reply_error(403, f'Working directory not allowed: {cwd}')
+            return
+
+        try:
+            result_json, exit_code = self.executor.submit(_run_request, script, args, env).result()
+        except Exception as e:
+            self._reply_error(500, f'{type(e).__name__}: {e}')
+            return
+
+        self._reply(200, f'{{"exitCode": {exit_code}, "result": {result_json}}}')
+
+
+def main():
+    args = sys.argv[1:]
+    port = int(args[args.index('--port') + 1]) if '--port' in args else DEFAULT_PORT
+    processes = (int(args[args.index('--processes') + 1]) if '--processes' in args
+                 else min(4, os.cpu_count() or 1))
+
+    print("=" * 60)
+    print("PYTHON WORKER DAEMON")
+    print("=" * 60)
+
+    # Treat SIGTERM like Ctrl+C so the worker processes are shut down too
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
+    with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker) as executor:
+        # The pool starts workers on demand, start them all before taking requests
+        wait([executor.submit(_worker_pid) for _ in range(processes)])
+
+        WorkerRequestHandler.executor = executor
+        server = ThreadingHTTPServer(('127.0.0.1', port), WorkerRequestHandler)
+
+        print(f"Listening on http://127.0.0.1:{port} with {processes} worker processes")
+        print("=" * 60, flush=True)
+
+        try:
+            server.serve_forever()
+        except (KeyboardInterrupt, SystemExit):
+            print("\nShutting down")
+        finally:
+            server.server_close()
+
+
+if __name__ == '__main__':
+    main()
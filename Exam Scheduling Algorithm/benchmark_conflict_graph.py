@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Conflict Graph Benchmark
+Builds the student-level conflict graph on a synthetic in-memory database
+(years x departments x subjects, one cohort of students per department and
+year, plus arrear enrolments in earlier years' subjects) and checks the
+edges against a brute-force count over every student's subject pairs.
+
+Usage:
+    python benchmark_conflict_graph.py [--years 5] [--departments 10] [--subjects 10]
+                                       [--students 120] [--arrears 0.2] [--repeat 3]
+"""
+
+import sys
+import time
+import random
+import sqlite3
+import itertools
+from collections import Counter
+
+from integrated_db_setup import create_tables
+from conflict_graph import ConflictGraph
+
+
+def build_database(years, departments, subjects_per_dept, students_per_cohort, arrear_rate):
+    """In-memory integrated database with synthetic enrolments"""
+    conn = sqlite3.connect(':memory:')
+    create_tables(conn)
+    rng = random.Random(0)
+
+    subjects = {}
+    for year in range(1, years + 1):
+        for d in range(departments):
+            for i in range(subjects_per_dept):
+                cursor = conn.execute('''
+                    INSERT INTO subjects (subject_code, subject_name, department, year,
+                                          semester_type, subject_type, exam_type)
+                    VALUES (?, ?, ?, ?, 'ODD', 'THEORY', 'BOTH')
+                ''', (f'Y{year}D{d:02d}S{i:02d}', f'Subject {i}', f'D{d:02d}', year))
+                subjects.setdefault((year, d), []).append(cursor.lastrowid)
+
+    mappings = []
+    student_id = 0
+    for year in range(1, years + 1):
+        for d in range(departments):
+            for _ in range(students_per_cohort):
+                student_id += 1
+                for subject_id in subjects[(year, d)]:
+                    mappings.append((student_id, subject_id, 0))
+                # Arrears from earlier years, possibly another department's subject
+                if year > 1 and rng.random() < arrear_rate:
+                    for _ in range(rng.randint(1, 3)):
+                        arrear_year = rng.randint(1, year - 1)
+                        arrear_dept = d if rng.random() < 0.8 else rng.randrange(departments)
+                        mappings.append((student_id, rng.choice(subjects[(arrear_year, arrear_dept)]), 1))
+
+    conn.executemany('''
+        INSERT OR IGNORE INTO student_subjects (student_id, subject_id, is_arrear)
+        VALUES (?, ?, ?)
+    ''', mappings)
+    conn.commit()
+    return conn
+
+
+def brute_force_edges(conn):
+    """(subject_a, subject_b) -> shared students, from every student's subject pairs"""
+    by_student = {}
+    for student_id, subject_id in conn.execute('SELECT student_id, subject_id FROM student_subjects'):
+        by_student.setdefault(student_id, []).append(subject_id)
+
+    edges = Counter()
+    for subject_ids in by_student.values():
+        for pair in itertools.combinations(sorted(subject_ids), 2):
+            edges[pair] += 1
+    return edges
+
+
+def main():
+    args = sys.argv[1:]
+
+    def option(name, default, cast=int):
+        return cast(args[args.index(name) + 1]) if name in args else default
+
+    years = option('--years', 5)
+    departments = option('--departments', 10)
+    subjects_per_dept = option('--subjects', 10)
+    students = option('--students', 120)
+    arrears = option('--arrears', 0.2, float)
+    repeat = option('--repeat', 3)
+
+    conn = build_database(years, departments, subjects_per_dept, students, arrears)
+    enrolments = conn.execute('SELECT COUNT(*) FROM student_subjects').fetchone()[0]
+
+    print("=" * 60)
+    print("CONFLICT GRAPH BENCHMARK")
+    print("=" * 60)
+    print(f"{years} years x {departments} departments x {subjects_per_dept} subjects, "
+          f"{enrolments} enrolments, best of {repeat}")
+
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        graph = ConflictGraph.from_enrolments(conn)
+        times.append(time.perf_counter() - start)
+
+    expected = brute_force_edges(conn)
+    mismatched = graph.edge_count != len(expected) or any(
+        graph.weight(a, b) != shared for (a, b), shared in expected.items()
+    )
+
+    print(f"\n  Subjects:  {len(graph)}")
+    print(f"  Edges:     {graph.edge_count}")
+    print(f"  Build:     {min(times) * 1000:10.2f} ms")
+
+    print("\n" + "=" * 60)
+    if mismatched:
+        print("MISMATCH: edges differ from the brute-force count")
+        print("=" * 60)
+        return 1
+    print("OK: edges match the brute-force count")
+    print("=" * 60)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
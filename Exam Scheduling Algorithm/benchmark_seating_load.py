@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+SEM Seating Load Benchmark
+Loads the students of every scheduled SEM date and session with
+SeatingAllocationSystem._load_from_database and with the earlier
+row-by-row filter (JSON-parse each student's arrears, then one COUNT query
+per student for regular enrolment), and checks both give the same frame.
+The arrears now come from the student_arrears view, so the JSON column must
+be current (python integrated_db_setup.py --migrate rebuilds it).
+
+Usage:
+    python benchmark_seating_load.py [--db exam_scheduling.db] [--repeat 3]
+"""
+
+import sys
+import json
+import time
+import sqlite3
+
+import pandas as pd
+
+import seating_allocation
+from seating_allocation import SeatingAllocationSystem
+
+
+def load_row_by_row(conn, exam_date, session):
+    """The SEM student filter as it was: N+1 queries"""
+    students_df = pd.read_sql_query('''
+        SELECT DISTINCT
+            s.reg_no as "Register Number",
+            s.name as "Name",
+            s.department as "Department",
+            s.year as "Student Year",
+            s.arrears as "Arrears"
+        FROM students s
+        JOIN student_subjects ss ON s.student_id = ss.student_id
+        JOIN subjects sub ON ss.subject_id = sub.subject_id
+        JOIN schedules sch ON sub.subject_id = sch.subject_id
+        WHERE sch.exam_date = ? AND sch.session = ? AND s.active = 1
+        ORDER BY s.department, s.reg_no
+    ''', conn, params=(exam_date, session))
+
+    cursor = conn.cursor()
+    cursor.execute('''
+        SELECT DISTINCT sub.subject_code
+        FROM schedules sch
+        JOIN subjects sub ON sch.subject_id = sub.subject_id
+        WHERE sch.exam_date = ? AND sch.session = ?
+    ''', (exam_date, session))
+    scheduled_subjects = [row[0] for row in cursor.fetchall()]
+
+    filtered_students = []
+    for _, row in students_df.iterrows():
+        arrears = json.loads(row['Arrears']) if row['Arrears'] else []
+        if any(sub_code in arrears for sub_code in scheduled_subjects):
+            filtered_students.append(row)
+        else:
+            cursor.execute('''
+                SELECT COUNT(*) FROM student_subjects ss
+                JOIN subjects sub ON ss.subject_id = sub.subject_id
+                JOIN students st ON ss.student_id = st.student_id
+                WHERE st.reg_no = ? AND sub.subject_code IN ({})
+                      AND ss.is_arrear = 0
+            '''.format(','.join('?' * len(scheduled_subjects))),
+            (row['Register Number'], *scheduled_subjects))
+            if cursor.fetchone()[0] > 0:
+                filtered_students.append(row)
+
+    return pd.DataFrame(filtered_students)
+
+
+def load_set_based(exam_date, session):
+    """Students as _load_from_database loads them now"""
+    system = SeatingAllocationSystem.__new__(SeatingAllocationSystem)
+    system.exam_type = 'SEMESTER'
+    system.exam_date = exam_date
+    system.session = session
+    system._load_from_database(year=None)
+    return system.students_df
+
+
+def best_of(repeat, func, *args):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        times.append(time.perf_counter() - start)
+    return result, min(times)
+
+
+def main():
+    args = sys.argv[1:]
+    if '--db' in args:
+        seating_allocation.DB_PATH = args[args.index('--db') + 1]
+    repeat = int(args[args.index('--repeat') + 1]) if '--repeat' in args else 3
+
+    conn = sqlite3.connect(seating_allocation.DB_PATH)
+    students = conn.execute('SELECT COUNT(*) FROM students').fetchone()[0]
+    slots = conn.execute('''
+        SELECT DISTINCT exam_date, session FROM schedules ORDER BY exam_date, session
+    ''').fetchall()
+
+    print("=" * 60)
+    print("SEM SEATING LOAD BENCHMARK")
+    print("=" * 60)
+    print(f"{students} students, {len(slots)} scheduled sessions, best of {repeat}")
+    print(f"\n  {'Session':<16} {'Students':>8} {'Row-by-row':>12} {'Set-based':>12}")
+
+    total_old = total_new = 0
+    mismatched = []
+    for exam_date, session in slots:
+        expected, old_time = best_of(repeat, load_row_by_row, conn, exam_date, session)
+        result, new_time = best_of(repeat, load_set_based, exam_date, session)
+        total_old += old_time
+        total_new += new_time
+
+        if not result.equals(expected) or not result.index.equals(expected.index):
+            mismatched.append(f"{exam_date} {session}")
+        print(f"  {exam_date + ' ' + session:<16} {len(result):>8} "
+              f"{old_time * 1000:>9.1f} ms {new_time * 1000:>9.1f} ms")
+
+    conn.close()
+
+    print(f"\n  {'Total':<16} {'':>8} {total_old * 1000:>9.1f} ms {total_new * 1000:>9.1f} ms")
+    print("\n" + "=" * 60)
+    if not slots:
+        print("No schedules in the database; run the exam scheduler first")
+        print("=" * 60)
+        return 1
+    if mismatched:
+        print(f"MISMATCH: students differ on {', '.join(mismatched)}")
+        print("=" * 60)
+        return 1
+    print("OK: same students for every session")
+    print("=" * 60)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
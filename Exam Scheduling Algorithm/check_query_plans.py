@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Query Plan Check
+Runs EXPLAIN QUERY PLAN over the queries issued by ExamScheduler,
+SeatingAllocationSystem._load_from_database and get_allocation_from_db and
+fails if any of them reads a table with a full scan instead of an index.
+
+The schema comes from integrated_db_setup.create_tables (in memory), or from
+an existing database with --db. halls and teachers are small reference
+tables that are read whole on purpose, so scans of them are allowed (the
+queries name them without an alias). Scans of WITH-clause results and of
+virtual tables are not table scans and are skipped.
+
+Keep the queries below in step with the code they are copied from.
+
+Usage:
+    python check_query_plans.py [--db exam_scheduling.db] [--verbose]
+"""
+
+import re
+import sys
+import sqlite3
+
+from integrated_db_setup import create_tables
+
+# Tables small enough to read whole
+ALLOWED_SCANS = {'halls', 'teachers'}
+
+SUBJECT_IDS = (1, 2, 3)
+
+QUERIES = [
+    # ----- ExamScheduler.get_subjects_for_year -----
+    ('ExamScheduler: regular subjects', '''
+        SELECT subject_id, subject_code, subject_name, department,
+               year, semester_type, subject_type, exam_type, student_count,
+               'REGULAR' as subject_track
+        FROM subjects
+        WHERE year = ? AND semester_type = ? AND (exam_type = ? OR exam_type = 'BOTH')
+    ''', (2, 'ODD', 'SEMESTER')),
+
+    ('ExamScheduler: arrear subjects', '''
+        SELECT DISTINCT s.subject_id, s.subject_code, s.subject_name, s.department,
+               s.year, s.semester_type, s.subject_type, s.exam_type,
+               COUNT(DISTINCT a.student_id) as student_count,
+               'ARREAR' as subject_track
+        FROM subjects s
+        JOIN student_arrears a ON s.subject_id = a.subject_id
+        WHERE s.year = ? AND s.semester_type = ?
+              AND (s.exam_type = ? OR s.exam_type = 'BOTH')
+        GROUP BY s.subject_id
+        HAVING COUNT(DISTINCT a.student_id) > 0
+    ''', (2, 'EVEN', 'SEMESTER')),
+
+    # ----- ExamScheduler.build_student_conflict_graph -----
+    ('ExamScheduler: student conflict graph', '''
+        SELECT a.subject_id, b.subject_id, COUNT(*)
+        FROM student_subjects a
+        JOIN student_subjects b
+          ON b.student_id = a.student_id AND b.subject_id > a.subject_id
+        WHERE a.subject_id IN (?,?,?) AND b.subject_id IN (?,?,?)
+        GROUP BY a.subject_id, b.subject_id
+    ''', SUBJECT_IDS * 2),
+
+    # ----- ExamScheduler.save_schedule_to_db / create_exam_cycle -----
+    ('ExamScheduler: insert schedule', '''
+        INSERT INTO schedules
+        (cycle_id, subject_id, exam_date, session)
+        VALUES (?, ?, ?, ?)
+    ''', (1, 1, '01.12.2025', 'FN')),
+
+    ('ExamScheduler: insert violation', '''
+        INSERT INTO schedule_violations
+        (cycle_id, subject_id, violation_type, description, severity)
+        VALUES (?, ?, ?, ?, ?)
+    ''', (1, 1, 'GAP', '', 'HIGH')),
+
+    ('ExamScheduler: insert exam cycle', '''
+        INSERT INTO exam_cycles (exam_type, year_group, start_date, end_date,
+                                created_date, status)
+        VALUES (?, ?, ?, ?, ?, ?)
+    ''', ('SEMESTER', 2, '01.12.2025', '20.12.2025', '', 'ACTIVE')),
+
+    # ----- SeatingAllocationSystem._load_from_database -----
+    ('_load_from_database: halls', '''
+        SELECT hall_name as hallno, capacity, columns FROM halls WHERE active = 1
+    ''', ()),
+
+    ('_load_from_database: SEM students', '''
+        WITH scheduled AS (
+            SELECT DISTINCT sch.subject_id
+            FROM schedules sch
+            JOIN subjects sub ON sch.subject_id = sub.subject_id
+            WHERE sch.exam_date = ? AND sch.session = ?
+        )
+        SELECT
+            s.reg_no as "Register Number",
+            s.name as "Name",
+            s.department as "Department",
+            s.year as "Student Year",
+            s.arrears as "Arrears"
+        FROM students s
+        WHERE s.active = 1 AND s.student_id IN (
+            SELECT ss.student_id
+            FROM student_subjects ss
+            JOIN scheduled ON scheduled.subject_id = ss.subject_id
+            WHERE ss.is_arrear = 0
+            UNION
+            SELECT a.student_id
+            FROM student_arrears a
+            JOIN scheduled ON scheduled.subject_id = a.subject_id
+        )
+        ORDER BY s.department, s.reg_no
+    ''', ('01.12.2025', 'FN')),
+
+    ('_load_from_database: Internal students', '''
+        SELECT DISTINCT
+            s.student_id,
+            s.reg_no as "Register Number",
+            s.name as "Name",
+            s.department as "Department",
+            s.year as "Student Year"
+        FROM students s
+        JOIN student_subjects ss ON s.student_id = ss.student_id
+        JOIN schedules sch ON ss.subject_id = sch.subject_id
+        WHERE sch.session = ? AND s.year = ? AND s.active = 1
+        ORDER BY s.department, s.reg_no
+    ''', ('FN', 2)),
+
+    ('_load_from_database: year students', '''
+        SELECT DISTINCT
+            s.reg_no as "Register Number",
+            s.name as "Name",
+            s.department as "Department",
+            s.year as "Student Year"
+        FROM students s
+        WHERE s.year = ? AND s.active = 1
+        ORDER BY s.department, s.reg_no
+    ''', (2,)),
+
+    ('_load_from_database: teachers', '''
+        SELECT teacher_name as Name, department as Department FROM teachers WHERE active = 1
+    ''', ()),
+
+    # ----- SeatingAllocationSystem.get_allocation_from_db -----
+    ('get_allocation_from_db: by date+session', '''
+        SELECT
+            allocation_id, cycle_id, exam_date, session,
+            hall_name, seat_no, reg_no, student_name,
+            department, bench_number, exam_type, allocation_date
+        FROM seating_allocations
+        WHERE exam_date = ? AND session = ?
+        ORDER BY hall_name, bench_number, seat_no
+    ''', ('01.12.2025', 'FN')),
+
+    ('get_allocation_from_db: by cycle', '''
+        SELECT
+            allocation_id, cycle_id, exam_date, session,
+            hall_name, seat_no, reg_no, student_name,
+            department, bench_number, exam_type, allocation_date
+        FROM seating_allocations
+        WHERE cycle_id = ?
+        ORDER BY exam_date, session, hall_name, bench_number, seat_no
+    ''', (1,)),
+]
+
+# "SCAN students", "SCAN s USING COVERING INDEX ..." (a whole index is still a full scan)
+SCAN = re.compile(r'^SCAN (?:TABLE )?(\w+)(?: AS (\w+))?')
+# WITH-clause results, built from their own (checked) plan lines
+SUBQUERY = re.compile(r'^(?:MATERIALIZE|CO-ROUTINE) (\w+)')
+
+
+def full_scans(conn, query, params):
+    """Full scans of stored tables in the query plan, as (table or alias, plan line)"""
+    plan = conn.execute('EXPLAIN QUERY PLAN ' + query, params).fetchall()
+    subqueries = {match.group(1) for match in (SUBQUERY.match(row[-1]) for row in plan) if match}
+    scans = []
+    for row in plan:
+        detail = row[-1]
+        match = SCAN.match(detail)
+        # Virtual tables (json_each) walk one value, not a stored table
+        if match and 'VIRTUAL TABLE' not in detail:
+            name = match.group(2) or match.group(1)
+            if name not in subqueries:
+                scans.append((name, detail))
+    return plan, scans
+
+
+def main():
+    args = sys.argv[1:]
+    verbose = '--verbose' in args
+
+    if '--db' in args:
+        db_path = args[args.index('--db') + 1]
+        conn = sqlite3.connect(f'file:{db_path}?mode=ro', uri=True)
+    else:
+        db_path = ':memory:'
+        conn = sqlite3.connect(db_path)
+        create_tables(conn)
+
+    print("=" * 60)
+    print("QUERY PLAN CHECK")
+    print("=" * 60)
+    print(f"Database: {db_path}, {len(QUERIES)} queries")
+
+    failures = 0
+    for name, query, params in QUERIES:
+        plan, scans = full_scans(conn, query, params)
+        bad = [detail for table, detail in scans if table not in ALLOWED_SCANS]
+        status = "FAIL" if bad else "ok"
+        print(f"\n  [{status:>4}] {name}")
+        if bad or verbose:
+            for row in plan:
+                print(f"           {row[-1]}")
+        failures += bool(bad)
+
+    conn.close()
+
+    print("\n" + "=" * 60)
+    if failures:
+        print(f"FAIL: {failures} queries scan a whole table")
+        print("=" * 60)
+        return 1
+    print("OK: every query reads through an index")
+    print("=" * 60)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,147 @@
+"""
+Student-Level Subject Conflict Graph
+Two subjects conflict when at least one student is enrolled in both
+(regular or arrear), so their exams cannot share a slot.
+
+The edges come from one self-join aggregation over student_subjects and are
+stored in compressed sparse row (CSR) form:
+    - subject_ids[k]                       subject at position k (ascending)
+    - indices[indptr[k]:indptr[k + 1]]     positions of its neighbours (ascending)
+    - weights[indptr[k]:indptr[k + 1]]     number of students shared with each
+"""
+
+import sqlite3
+from array import array
+from bisect import bisect_left
+from typing import List, Dict, Optional, Iterable
+
+# Largest subject list passed as SQL parameters; bigger sets aggregate all
+# enrolments and drop the other subjects afterwards
+MAX_SQL_PARAMS = 900
+
+
+class ConflictGraph:
+    """Sparse weighted conflict graph between subjects"""
+
+    def __init__(self, subject_ids: List[int], indptr: array, indices: array, weights: array):
+        self.subject_ids = subject_ids
+        self.position = {subject_id: k for k, subject_id in enumerate(subject_ids)}
+        self.indptr = indptr
+        self.indices = indices
+        self.weights = weights
+
+    @classmethod
+    def from_enrolments(cls, conn: sqlite3.Connection,
+                        subject_ids: Optional[Iterable[int]] = None) -> 'ConflictGraph':
+        """
+        Build the graph from shared enrolments in student_subjects
+
+        Args:
+            conn: Connection to the integrated database
+            subject_ids: Subjects to include (default: every subject with enrolments)
+
+        Returns:
+            ConflictGraph over subject_ids
+        """
+        query = '''
+            SELECT a.subject_id, b.subject_id, COUNT(*)
+            FROM student_subjects a
+            JOIN student_subjects b
+              ON b.student_id = a.student_id AND b.subject_id > a.subject_id
+        '''
+        params = []
+
+        if subject_ids is None:
+            wanted = None
+        else:
+            wanted = set(subject_ids)
+            if len(wanted) <= MAX_SQL_PARAMS:
+                placeholders = ','.join('?' * len(wanted))
+                query += f'''
+            WHERE a.subject_id IN ({placeholders}) AND b.subject_id IN ({placeholders})
+                '''
+                params = list(wanted) * 2
+        query += '''
+            GROUP BY a.subject_id, b.subject_id
+        '''
+
+        edges = conn.execute(query, params).fetchall()
+        if wanted is not None and len(wanted) > MAX_SQL_PARAMS:
+            edges = [edge for edge in edges if edge[0] in wanted and edge[1] in wanted]
+
+        if wanted is None:
+            wanted = {a for a, _, _ in edges} | {b for _, b, _ in edges}
+        return cls.from_edges(sorted(wanted), edges)
+
+    @classmethod
+    def from_edges(cls, subject_ids: List[int], edges: List[tuple]) -> 'ConflictGraph':
+        """
+        Build the graph from (subject_a, subject_b, shared_students) triples
+
+        Each undirected edge is listed once; subject_ids must be ascending.
+        """
+        position = {subject_id: k for k, subject_id in enumerate(subject_ids)}
+        n = len(subject_ids)
+
+        # Count degrees, then fill each row from its start offset
+        degree = [0] * n
+        pairs = []
+        for a, b, shared in edges:
+            i, j = position[a], position[b]
+            degree[i] += 1
+            degree[j] += 1
+            pairs.append((i, j, shared))
+
+        indptr = array('l', [0]) * (n + 1)
+        for k in range(n):
+            indptr[k + 1] = indptr[k] + degree[k]
+
+        fill = list(indptr[:n])
+        indices = array('l', [0]) * indptr[n]
+        weights = array('l', [0]) * indptr[n]
+        # Sorted (i, j) pairs give every row ascending neighbours: row k first
+        # receives its smaller neighbours (as j), then its larger ones (as i)
+        pairs.sort()
+        for i, j, shared in pairs:
+            indices[fill[j]] = i
+            weights[fill[j]] = shared
+            fill[j] += 1
+        for i, j, shared in pairs:
+            indices[fill[i]] = j
+            weights[fill[i]] = shared
+            fill[i] += 1
+
+        return cls(list(subject_ids), indptr, indices, weights)
+
+    def __len__(self) -> int:
+        return len(self.subject_ids)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.indices) // 2
+
+    def degree(self, subject_id: int) -> int:
+        k = self.position[subject_id]
+        return self.indptr[k + 1] - self.indptr[k]
+
+    def neighbors(self, subject_id: int) -> List[int]:
+        """Subjects sharing at least one student with subject_id"""
+        k = self.position.get(subject_id)
+        if k is None:
+            return []
+        return [self.subject_ids[j] for j in self.indices[self.indptr[k]:self.indptr[k + 1]]]
+
+    def weight(self, subject_a: int, subject_b: int) -> int:
+        """Number of students enrolled in both subjects"""
+        i, j = self.position.get(subject_a), self.position.get(subject_b)
+        if i is None or j is None:
+            return 0
+        start, end = self.indptr[i], self.indptr[i + 1]
+        k = bisect_left(self.indices, j, start, end)
+        if k < end and self.indices[k] == j:
+            return self.weights[k]
+        return 0
+
+    def to_dict(self) -> Dict[int, List[int]]:
+        """Adjacency lists keyed by subject_id"""
+        return {subject_id: self.neighbors(subject_id) for subject_id in self.subject_ids}
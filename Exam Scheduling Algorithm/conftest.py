@@ -0,0 +1,52 @@
+"""
+Shared pytest fixtures: a temporary integrated database and subject seeding
+"""
+
+import sqlite3
+
+import pytest
+
+from integrated_db_setup import create_tables
+
+# Columns a test subject does not set itself
+SUBJECT_DEFAULTS = {
+    'subject_name': 'Subject', 'department': 'CSE', 'year': 1, 'semester_type': 'ODD',
+    'subject_type': 'THEORY', 'exam_type': 'BOTH',
+}
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """Path of an empty database with the integrated schema"""
+    path = tmp_path / 'exam_scheduling.db'
+    conn = sqlite3.connect(path)
+    create_tables(conn)
+    conn.close()
+    return str(path)
+
+
+@pytest.fixture
+def exam_db(db_path):
+    """Connection to the db_path database"""
+    conn = sqlite3.connect(db_path)
+    yield conn
+    conn.close()
+
+
+@pytest.fixture
+def add_subjects():
+    """
+    add_subjects(conn, subjects) inserts subjects given as dicts with at least
+    subject_id and subject_code, the other columns from SUBJECT_DEFAULTS
+    """
+    def add(conn, subjects):
+        rows = [{**SUBJECT_DEFAULTS, **subject} for subject in subjects]
+        conn.executemany('''
+            INSERT INTO subjects (subject_id, subject_code, subject_name, department, year,
+                                  semester_type, subject_type, exam_type)
+            VALUES (:subject_id, :subject_code, :subject_name, :department, :year,
+                    :semester_type, :subject_type, :exam_type)
+        ''', rows)
+        conn.commit()
+
+    return add
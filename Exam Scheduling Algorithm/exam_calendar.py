@@ -0,0 +1,81 @@
+"""
+Exam Calendar
+Dates as day ordinals (date.toordinal), parsed once, so schedulers and PDF
+generators compare and subtract integers instead of re-parsing date
+strings in their loops.
+
+    calendar = ExamCalendar('01.12.2025', '20.12.2025', ['08.12.2025'])
+    calendar.dates()                        # ['01.12.2025', '02.12.2025', ...]
+    days_between('01.12.2025', '03.12.2025')  # 2
+"""
+
+from datetime import date, datetime
+from functools import lru_cache
+
+DATE_FORMAT = '%d.%m.%Y'
+ISO_FORMAT = '%Y-%m-%d'
+
+
+@lru_cache(maxsize=4096)
+def to_ordinal(text, date_format=DATE_FORMAT):
+    """Day ordinal of a date string"""
+    return datetime.strptime(text, date_format).toordinal()
+
+
+@lru_cache(maxsize=4096)
+def format_ordinal(day, date_format=DATE_FORMAT):
+    """Date string of a day ordinal"""
+    return date.fromordinal(day).strftime(date_format)
+
+
+def weekday(day):
+    """Weekday of a day ordinal, 0 = Monday as in date.weekday()"""
+    return (day - 1) % 7
+
+
+def days_between(first, second, date_format=DATE_FORMAT):
+    """Days from the first date string to the second"""
+    return to_ordinal(second, date_format) - to_ordinal(first, date_format)
+
+
+def reformat(text, from_format, to_format):
+    """Re-write a date string in another format"""
+    return format_ordinal(to_ordinal(text, from_format), to_format)
+
+
+class ExamCalendar:
+    """Exam days between two dates, skipping closed weekdays and holidays"""
+
+    def __init__(self, start_date, end_date, holidays=(), date_format=DATE_FORMAT, closed_weekdays=(6,)):
+        """
+        Args:
+            start_date: First date (inclusive), in date_format
+            end_date: Last date (inclusive), in date_format
+            holidays: Dates to skip, in date_format
+            date_format: strptime format of all the dates
+            closed_weekdays: Weekdays without exams (default Sunday)
+        """
+        self.date_format = date_format
+        self.start = to_ordinal(start_date, date_format)
+        self.end = to_ordinal(end_date, date_format)
+        self.holidays = frozenset(to_ordinal(h, date_format) for h in holidays)
+
+        closed = frozenset(closed_weekdays)
+        self.days = [
+            day for day in range(self.start, self.end + 1)
+            if weekday(day) not in closed and day not in self.holidays
+        ]
+        self.index = {day: i for i, day in enumerate(self.days)}
+
+    def __len__(self):
+        return len(self.days)
+
+    def __iter__(self):
+        return iter(self.days)
+
+    def is_exam_day(self, day):
+        return day in self.index
+
+    def dates(self):
+        """Exam days as date strings"""
+        return [format_ordinal(day, self.date_format) for day in self.days]
@@ -5,10 +5,14 @@ Integrated Database Setup for All Three Modules:
 3. Hall Ticket Generation
 
 This script creates tables and populates mock data in exam_scheduling.db
+
+Bring an existing database up to the current schema (keeps its data):
+    python integrated_db_setup.py --migrate
 """
 
 import sqlite3
 import os
+import sys
 from datetime import datetime
 
 DB_PATH = os.path.join(os.path.dirname(__file__), 'exam_scheduling.db')
@@ -174,10 +178,55 @@ def create_tables(conn):
     )
     ''')
     
+    # Arrear subjects of each student, straight from student_subjects (served by
+    # its subject/student indexes), instead of decoding students.arrears JSON
+    cursor.execute('''
+    CREATE VIEW IF NOT EXISTS student_arrears AS
+    SELECT ss.student_id, ss.subject_id, sub.subject_code
+    FROM student_subjects ss
+    JOIN subjects sub ON ss.subject_id = sub.subject_id
+    WHERE ss.is_arrear = 1
+    ''')
+    
+    create_indexes(conn)
+    
     conn.commit()
     print("All tables created successfully")
 
 
+# Secondary indexes: (name, table, columns). Each one lets a hot lookup seek
+# instead of scanning, and carries the columns the query reads after the
+# filter so SQLite can answer from the index alone where that is cheap.
+# students(reg_no) and student_subjects(student_id, subject_id) already have
+# the automatic indexes of their UNIQUE constraints.
+INDEXES = [
+    # Regular/arrear subject lists of a year and semester (ExamScheduler)
+    ('idx_subjects_year_semester', 'subjects', 'year, semester_type, exam_type'),
+    # Subjects sitting on a date+session (seating allocation, hall tickets)
+    ('idx_schedules_date_session', 'schedules', 'exam_date, session, subject_id, cycle_id'),
+    # Sessions a subject is scheduled in (internal seating allocation)
+    ('idx_schedules_subject', 'schedules', 'subject_id, session'),
+    # Regular vs arrear enrolments of a student
+    ('idx_student_subjects_student', 'student_subjects', 'student_id, is_arrear, subject_id'),
+    # Students enrolled in a subject (arrear counts, conflict graph)
+    ('idx_student_subjects_subject', 'student_subjects', 'subject_id, is_arrear, student_id'),
+    # Active students of a year
+    ('idx_students_year_active', 'students', 'year, active, department, reg_no'),
+    # Saved seating of a date+session, in hall/bench order
+    ('idx_seating_date_session', 'seating_allocations', 'exam_date, session, hall_name, bench_number, seat_no'),
+    # Saved seating of an exam cycle
+    ('idx_seating_cycle', 'seating_allocations', 'cycle_id'),
+]
+
+
+def create_indexes(conn):
+    """Create the secondary indexes; safe to run again on an existing database"""
+    cursor = conn.cursor()
+    for name, table, columns in INDEXES:
+        cursor.execute(f'CREATE INDEX IF NOT EXISTS {name} ON {table} ({columns})')
+    conn.commit()
+
+
 def populate_subjects_data(conn):
     """Populate subjects data for all departments, years, and exam types"""
     cursor = conn.cursor()
@@ -509,33 +558,28 @@ def link_students_to_subjects(conn):
     print(f"Linked {len(mappings)} student-subject mappings (including {arrear_count} arrear subjects)")
     
     # Update students.arrears JSON array with their arrear subject codes
-    import json
-    cursor.execute('SELECT student_id FROM students')
-    all_students = cursor.fetchall()
-    
-    for (student_id,) in all_students:
-        # Get arrear subject codes for this student
-        cursor.execute('''
-            SELECT sub.subject_code
-            FROM student_subjects ss
-            JOIN subjects sub ON ss.subject_id = sub.subject_id
-            WHERE ss.student_id = ? AND ss.is_arrear = 1
-        ''', (student_id,))
-        
-        arrear_codes = [row[0] for row in cursor.fetchall()]
-        arrear_json = json.dumps(arrear_codes)
-        
-        # Update student's arrears field
-        cursor.execute('''
-            UPDATE students
-            SET arrears = ?
-            WHERE student_id = ?
-        ''', (arrear_json, student_id))
-    
-    conn.commit()
+    rebuild_arrears_json(conn)
     print(f"Updated arrears JSON array for all students")
 
 
+def rebuild_arrears_json(conn):
+    """Rewrite every students.arrears JSON array from student_arrears in one statement
+    
+    The JSON column is kept for readers outside this module (hall tickets);
+    scheduling and seating read the student_arrears view.
+    """
+    conn.execute('''
+        UPDATE students
+        SET arrears = (
+            SELECT json_group_array(subject_code)
+            FROM (SELECT subject_code FROM student_arrears
+                  WHERE student_id = students.student_id
+                  ORDER BY subject_id)
+        )
+    ''')
+    conn.commit()
+
+
 def display_database_summary(conn):
     """Display summary of database contents"""
     cursor = conn.cursor()
@@ -578,6 +622,33 @@ def display_database_summary(conn):
     print("=" * 60)
 
 
+def migrate():
+    """
+    Bring an existing database up to the current schema (indexes, views)
+    
+    The file is left in rollback-journal mode (earlier ExamScheduler versions
+    switched it to WAL), so the checked-in database stays a single file.
+    """
+    if not os.path.exists(DB_PATH):
+        print(f"Database not found: {DB_PATH}")
+        print("Run: python integrated_db_setup.py")
+        return
+    
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        existing = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        create_tables(conn)
+        added = [name for name, _, _ in INDEXES if name not in existing]
+        print(f"Added {len(added)} indexes" + (f": {', '.join(added)}" if added else " (already up to date)"))
+        
+        rebuild_arrears_json(conn)
+        print("Rebuilt arrears JSON array for all students")
+        
+        conn.execute('PRAGMA journal_mode=DELETE')
+    finally:
+        conn.close()
+
+
 def main():
     """Main setup function"""
     print("\n" + "=" * 60)
@@ -641,4 +712,7 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    if '--migrate' in sys.argv:
+        migrate()
+    else:
+        main()
@@ -8,6 +8,7 @@ import os
 from datetime import datetime
 from scheduler import ExamScheduler
 from pdf_generator import generate_schedule_pdf
+from exam_calendar import to_ordinal, reformat, DATE_FORMAT
 import config
 
 def print_header(title):
@@ -44,7 +45,7 @@ def print_internal_matrix_table(schedule, session):
     
     # Get unique dates and departments
     dates = sorted(set(item['date'] for item in session_schedule), 
-                   key=lambda x: datetime.strptime(x, '%d.%m.%Y'))
+                   key=to_ordinal)
     departments = sorted(set(item['department'] for item in session_schedule))
     
     # Create mapping: (dept, date) -> subject
@@ -66,15 +67,11 @@ def print_internal_matrix_table(schedule, session):
     print(f"\n{'Dept':<10}", end='')
     for date in dates:
         # Show date and day of week
-        date_obj = datetime.strptime(date, '%d.%m.%Y')
-        date_short = date_obj.strftime('%d.%m.%Y')
-        day_name = date_obj.strftime('%A')
-        print(f"{date_short:^{col_width}}", end='')
+        print(f"{date:^{col_width}}", end='')
     print()
     print(f"{'/ Day':<10}", end='')
     for date in dates:
-        date_obj = datetime.strptime(date, '%d.%m.%Y')
-        day_name = date_obj.strftime('%A')
+        day_name = reformat(date, DATE_FORMAT, '%A')
         print(f"{day_name:^{col_width}}", end='')
     print()
     print("-" * 70)
@@ -113,7 +110,7 @@ def print_schedule_list_format(schedule, exam_type):
     print("-"*70)
     
     # Print schedule
-    for date in sorted(schedule_by_date.keys(), key=lambda x: datetime.strptime(x, '%d.%m.%Y')):
+    for date in sorted(schedule_by_date.keys(), key=to_ordinal):
         exams = schedule_by_date[date]
         
         # Sort by session then department
@@ -224,8 +221,7 @@ def modify_schedule_interactive(schedule, exam_type, available_dates):
                 # Show available dates
                 print("\n   Available dates:")
                 for i, date in enumerate(available_dates, 1):
-                    date_obj = datetime.strptime(date, '%d.%m.%Y')
-                    day_name = date_obj.strftime('%A')
+                    day_name = reformat(date, DATE_FORMAT, '%A')
                     print(f"   [{i}] {date} ({day_name})")
                 
                 # Get new date
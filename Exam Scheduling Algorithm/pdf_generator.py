@@ -11,6 +11,7 @@ from reportlab.lib.units import inch
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
 from datetime import datetime
 import config
+from exam_calendar import to_ordinal, reformat, DATE_FORMAT
 
 class SchedulePDFGenerator:
     def __init__(self, filename='exam_schedule.pdf', orientation='portrait'):
@@ -158,8 +159,7 @@ class SchedulePDFGenerator:
         data = [headers]
         
         # Sort by date
-        dept_schedule_sorted = sorted(dept_schedule, 
-                                     key=lambda x: datetime.strptime(x['date'], '%d.%m.%Y'))
+        dept_schedule_sorted = sorted(dept_schedule, key=lambda x: to_ordinal(x['date']))
         
         for exam in dept_schedule_sorted:
             row = [
@@ -222,8 +222,7 @@ class SchedulePDFGenerator:
         data = [headers]
         
         # Sort by date
-        dept_schedule_sorted = sorted(dept_schedule, 
-                                     key=lambda x: datetime.strptime(x['date'], '%d.%m.%Y'))
+        dept_schedule_sorted = sorted(dept_schedule, key=lambda x: to_ordinal(x['date']))
         
         for exam in dept_schedule_sorted:
             row = [
@@ -299,7 +298,7 @@ class SchedulePDFGenerator:
         
 
         dates = sorted(list(set(exam['date'] for exam in schedule)), 
-                      key=lambda x: datetime.strptime(x, '%d.%m.%Y'))
+                      key=to_ordinal)
         departments = sorted(list(set(exam['department'] for exam in schedule)))
         
         # Create a mapping for quick lookup
@@ -312,9 +311,8 @@ class SchedulePDFGenerator:
         # Header row with dates and day names
         header_row = ['Branch/ Date']
         for date_str in dates:
-            date_obj = datetime.strptime(date_str, '%d.%m.%Y')
-            formatted = date_obj.strftime('%d.%m.%Y')
-            day_name = date_obj.strftime('%A')
+            formatted = date_str
+            day_name = reformat(date_str, DATE_FORMAT, '%A')
             # Use Paragraph for proper line breaks
             header_para = Paragraph(f"{formatted}<br/>{day_name}", ParagraphStyle(
                 'HeaderText',
@@ -423,7 +421,7 @@ class SchedulePDFGenerator:
         
         # Extract all unique dates and departments
         dates = sorted(list(set(exam['date'] for exam in session_schedule)), 
-                      key=lambda x: datetime.strptime(x, '%d.%m.%Y'))
+                      key=to_ordinal)
         departments = sorted(list(set(exam['department'] for exam in session_schedule)))
         
         # Create a mapping for quick lookup
@@ -436,9 +434,8 @@ class SchedulePDFGenerator:
         # Header row with dates and day names
         header_row = ['Branch/ Date']
         for date_str in dates:
-            date_obj = datetime.strptime(date_str, '%d.%m.%Y')
-            formatted = date_obj.strftime('%d.%m.%Y')
-            day_name = date_obj.strftime('%A')
+            formatted = date_str
+            day_name = reformat(date_str, DATE_FORMAT, '%A')
             # Use Paragraph for proper line breaks
             header_para = Paragraph(f"{formatted}<br/>{day_name}", ParagraphStyle(
                 'HeaderText',
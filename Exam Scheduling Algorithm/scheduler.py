@@ -4,9 +4,11 @@ Implements greedy scheduling with best-effort gap constraints
 """
 
 import sqlite3
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import List, Dict, Tuple, Optional
 import config
+from conflict_graph import ConflictGraph
+from exam_calendar import ExamCalendar, days_between
 
 class ExamScheduler:
     def __init__(self, db_path='exam_scheduling.db'):
@@ -31,25 +33,8 @@ class ExamScheduler:
         Returns:
             List of available dates in DD.MM.YYYY format
         """
-        # Parse dates
-        start = datetime.strptime(start_date, '%d.%m.%Y')
-        end = datetime.strptime(end_date, '%d.%m.%Y')
-        
-        # Convert holidays to datetime objects
-        holiday_dates = [datetime.strptime(h, '%d.%m.%Y') for h in holidays]
-        
-        available_dates = []
-        current = start
-        
-        while current <= end:
-            # Skip only Sunday (weekday 6) - Saturday is working day
-            if current.weekday() != 6:
-                # Skip holidays
-                if current not in holiday_dates:
-                    available_dates.append(current.strftime('%d.%m.%Y'))
-            current += timedelta(days=1)
-        
-        return available_dates
+        # Skip only Sunday (config.WEEKENDS) - Saturday is working day
+        return ExamCalendar(start_date, end_date, holidays, closed_weekdays=config.WEEKENDS).dates()
     
     def get_subjects_for_year(self, year: int, exam_type: str, semester_type: str) -> List[Dict]:
         """
@@ -81,15 +66,14 @@ class ExamScheduler:
             query_arrear = '''
             SELECT DISTINCT s.subject_id, s.subject_code, s.subject_name, s.department,
                    s.year, s.semester_type, s.subject_type, s.exam_type,
-                   COUNT(DISTINCT ss.student_id) as student_count,
+                   COUNT(DISTINCT a.student_id) as student_count,
                    'ARREAR' as subject_track
             FROM subjects s
-            JOIN student_subjects ss ON s.subject_id = ss.subject_id
+            JOIN student_arrears a ON s.subject_id = a.subject_id
             WHERE s.year = ? AND s.semester_type = ? 
                   AND (s.exam_type = ? OR s.exam_type = 'BOTH')
-                  AND ss.is_arrear = 1
             GROUP BY s.subject_id
-            HAVING student_count > 0
+            HAVING COUNT(DISTINCT a.student_id) > 0
             '''
             
             # Fetch both regular and arrear subjects
@@ -137,9 +121,26 @@ class ExamScheduler:
         
         return subjects
     
+    def build_student_conflict_graph(self, subjects: List[Dict]) -> ConflictGraph:
+        """
+        Build the conflict graph from shared student enrolments
+        
+        Subjects conflict when a student (regular or arrear) takes both,
+        including across departments and years. Edge weights are the
+        number of shared students.
+        
+        Args:
+            subjects: List of subject dictionaries
+            
+        Returns:
+            ConflictGraph over the given subjects
+        """
+        return ConflictGraph.from_enrolments(self.conn, [s['subject_id'] for s in subjects])
+    
     def build_conflict_graph(self, subjects: List[Dict]) -> Dict[int, List[int]]:
         """
-        Build conflict graph where subjects from same department conflict
+        Build conflict graph where subjects from same department conflict,
+        as do subjects sharing at least one enrolled student
         
         Args:
             subjects: List of subject dictionaries
@@ -147,17 +148,20 @@ class ExamScheduler:
         Returns:
             Dictionary mapping subject_id to list of conflicting subject_ids
         """
-        conflicts = {}
+        graph = self.build_student_conflict_graph(subjects)
+        
+        dept_ids = {}
+        for subject in subjects:
+            dept_ids.setdefault(subject['department'], []).append(subject['subject_id'])
         
+        conflicts = {}
         for subject in subjects:
             subject_id = subject['subject_id']
-            dept = subject['department']
             
-            # Find all subjects from same department
-            conflicting_ids = [
-                s['subject_id'] for s in subjects 
-                if s['department'] == dept and s['subject_id'] != subject_id
-            ]
+            # Same department first, then students shared with other subjects
+            conflicting_ids = [sid for sid in dept_ids[subject['department']] if sid != subject_id]
+            seen = set(conflicting_ids)
+            conflicting_ids.extend(sid for sid in graph.neighbors(subject_id) if sid not in seen)
             
             conflicts[subject_id] = conflicting_ids
         
@@ -179,12 +183,10 @@ class ExamScheduler:
         if last_exam is None:
             return True, ""
         
-        last_date = datetime.strptime(last_exam['date'], '%d.%m.%Y')
-        new_date_dt = datetime.strptime(new_date, '%d.%m.%Y')
         last_session = last_exam['session']
         last_type = last_exam['subject_type']
         
-        days_diff = (new_date_dt - last_date).days
+        days_diff = days_between(last_exam['date'], new_date)
         
         # Heavy subject constraint: Need 1 full day gap
         if last_type == 'HEAVY':
@@ -259,6 +261,9 @@ class ExamScheduler:
         print(f"   Available dates: {len(available_dates)}")
         print(f"   Starting with: {semester_type} semester")
         
+        # Subjects sharing a student (arrears included) never share a date
+        graph = self.build_student_conflict_graph(odd_subjects + even_subjects)
+        
         # Initialize schedule
         schedule = []
         violations = []
@@ -267,53 +272,33 @@ class ExamScheduler:
         
         # Determine which semester to start with
         if semester_type == 'ODD':
-            primary_subjects = odd_by_dept
-            secondary_subjects = even_by_dept
-            max_primary = max_odd
-            max_secondary = max_even
-            primary_sem = 'ODD'
-            secondary_sem = 'EVEN'
+            primary_sem, secondary_sem = 'ODD', 'EVEN'
+            pending = {'ODD': odd_by_dept, 'EVEN': even_by_dept}
         else:
-            primary_subjects = even_by_dept
-            secondary_subjects = odd_by_dept
-            max_primary = max_even
-            max_secondary = max_odd
-            primary_sem = 'EVEN'
-            secondary_sem = 'ODD'
-        
-        # Alternate between primary and secondary
-        round_num = 0
-        max_rounds = max(max_primary, max_secondary)
-        
-        while round_num < max_rounds and date_index < len(available_dates):
-            # Schedule primary semester (e.g., ODD1, ODD2, ODD3...)
-            if round_num < max_primary and date_index < len(available_dates):
-                exam_date = available_dates[date_index]
-                
-                for dept, subjs in sorted(primary_subjects.items()):
-                    if round_num < len(subjs):
-                        subject = subjs[round_num]
-                        schedule.append({
-                            'subject_id': subject['subject_id'],
-                            'subject_code': subject['subject_code'],
-                            'subject_name': subject['subject_name'],
-                            'department': dept,
-                            'date': exam_date,
-                            'session': session,
-                            'subject_type': subject['subject_type'],
-                            'student_count': subject['student_count'],
-                            'semester_type': primary_sem
-                        })
-                
-                date_index += 1
+            primary_sem, secondary_sem = 'EVEN', 'ODD'
+            pending = {'EVEN': even_by_dept, 'ODD': odd_by_dept}
+        
+        # Alternate between primary and secondary (e.g., ODD1, EVEN1, ODD2...),
+        # each department taking its next subject that clashes with none of the
+        # date's exams; a clashing subject waits for a later date
+        turn = 0
+        while any(pending[primary_sem].values()) or any(pending[secondary_sem].values()):
+            sem = primary_sem if turn % 2 == 0 else secondary_sem
+            turn += 1
             
-            # Schedule secondary semester (e.g., EVEN1, EVEN2, EVEN3...)
-            if round_num < max_secondary and date_index < len(available_dates):
-                exam_date = available_dates[date_index]
-                
-                for dept, subjs in sorted(secondary_subjects.items()):
-                    if round_num < len(subjs):
-                        subject = subjs[round_num]
+            if not any(pending[sem].values()):
+                continue
+            if date_index >= len(available_dates):
+                break
+            
+            exam_date = available_dates[date_index]
+            on_date = set()
+            
+            for dept, subjs in sorted(pending[sem].items()):
+                for i, subject in enumerate(subjs):
+                    if on_date.isdisjoint(graph.neighbors(subject['subject_id'])):
+                        del subjs[i]
+                        on_date.add(subject['subject_id'])
                         schedule.append({
                             'subject_id': subject['subject_id'],
                             'subject_code': subject['subject_code'],
@@ -323,12 +308,21 @@ class ExamScheduler:
                             'session': session,
                             'subject_type': subject['subject_type'],
                             'student_count': subject['student_count'],
-                            'semester_type': secondary_sem
+                            'semester_type': sem
                         })
-                
-                date_index += 1
+                        break
             
-            round_num += 1
+            date_index += 1
+        
+        for subjs in list(pending[primary_sem].values()) + list(pending[secondary_sem].values()):
+            for subject in subjs:
+                violations.append({
+                    'subject_id': subject['subject_id'],
+                    'subject_code': subject['subject_code'],
+                    'violation_type': 'NO_SLOT_AVAILABLE',
+                    'description': 'Could not find available slot',
+                    'severity': 'HIGH'
+                })
         
         print(f"\n✅ Scheduled {len(schedule)} exams using {date_index} dates")
         print(f"   {primary_sem} exams: {len([s for s in schedule if s.get('semester_type') == primary_sem])}")
@@ -407,7 +401,7 @@ class ExamScheduler:
         # Initialize schedule and tracking
         schedule = []
         violations = []
-        dept_date_session_usage = {}  # Track which date+session combinations are used per department
+        slot_usage = {}  # Track which subjects are placed in each date+session
         
         # Create slots
         slots = []
@@ -422,13 +416,14 @@ class ExamScheduler:
             
             scheduled = False
             
-            # Find first available slot for this department
+            # Find first slot without a conflicting subject (same department
+            # or a shared student)
             for slot in slots:
-                slot_key = f"{dept}_{slot['date']}_{slot['session']}"
+                placed = slot_usage.setdefault((slot['date'], slot['session']), set())
                 
-                if slot_key not in dept_date_session_usage:
+                if placed.isdisjoint(conflicts[subject_id]):
                     # Assign to this slot
-                    dept_date_session_usage[slot_key] = subject_id
+                    placed.add(subject_id)
                     
                     schedule.append({
                         'subject_id': subject_id,
@@ -465,24 +460,22 @@ class ExamScheduler:
             schedule: List of scheduled exams
             violations: List of constraint violations
         """
-        # Insert schedule
-        for item in schedule:
-            self.cursor.execute('''
+        # Insert schedule and violations in one transaction
+        with self.conn:
+            self.cursor.executemany('''
             INSERT INTO schedules 
             (cycle_id, subject_id, exam_date, session)
             VALUES (?, ?, ?, ?)
-            ''', (cycle_id, item['subject_id'], item['date'], item['session']))
-        
-        # Insert violations
-        for violation in violations:
-            self.cursor.execute('''
+            ''', [(cycle_id, item['subject_id'], item['date'], item['session'])
+                  for item in schedule])
+            
+            self.cursor.executemany('''
             INSERT INTO schedule_violations
             (cycle_id, subject_id, violation_type, description, severity)
             VALUES (?, ?, ?, ?, ?)
-            ''', (cycle_id, violation['subject_id'], violation['violation_type'],
-                  violation['description'], violation['severity']))
-        
-        self.conn.commit()
+            ''', [(cycle_id, violation['subject_id'], violation['violation_type'],
+                   violation['description'], violation['severity'])
+                  for violation in violations])
     
     def create_exam_cycle(self, exam_type: str, year: int, 
                          start_date: str, end_date: str) -> int:
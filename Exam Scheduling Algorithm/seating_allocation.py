@@ -32,6 +32,9 @@ except ImportError:
 # Database path - shared with exam scheduling
 DB_PATH = os.path.join(os.path.dirname(__file__), '..', 'Exam Scheduling Algorithm', 'exam_scheduling.db')
 
+# Largest reg_no list passed as SQL parameters in one query
+MAX_SQL_PARAMS = 900
+
 
 class SeatingAllocationSystem:
     def __init__(self, halls_file=None, students_file=None, teachers_file=None, session='FN', exam_type='Internal', year=1, internal_number=1, selected_halls=None, selected_teachers=None, use_database=True, exam_date=None):
@@ -83,7 +86,6 @@ class SeatingAllocationSystem:
     
     def _load_from_database(self, year, selected_halls=None, selected_teachers=None):
         """Load data from shared database"""
-        import json
         conn = sqlite3.connect(DB_PATH)
         
         # Load halls data
@@ -96,58 +98,36 @@ class SeatingAllocationSystem:
         
         # Load students based on exam type
         if self.exam_type == 'SEMESTER' and self.exam_date:
-            # For SEM exams, get students based on scheduled subjects for this date+session
+            # For SEM exams, get regular students of the subjects scheduled for this
+            # date+session plus arrear students of them (student_arrears), in one query
             students_query = '''
-                SELECT DISTINCT 
+                WITH scheduled AS (
+                    SELECT DISTINCT sch.subject_id
+                    FROM schedules sch
+                    JOIN subjects sub ON sch.subject_id = sub.subject_id
+                    WHERE sch.exam_date = ? AND sch.session = ?
+                )
+                SELECT 
                     s.reg_no as "Register Number", 
                     s.name as "Name", 
                     s.department as "Department",
                     s.year as "Student Year",
                     s.arrears as "Arrears"
                 FROM students s
-                JOIN student_subjects ss ON s.student_id = ss.student_id
-                JOIN subjects sub ON ss.subject_id = sub.subject_id
-                JOIN schedules sch ON sub.subject_id = sch.subject_id
-                WHERE sch.exam_date = ? AND sch.session = ? AND s.active = 1
+                WHERE s.active = 1 AND s.student_id IN (
+                    SELECT ss.student_id
+                    FROM student_subjects ss
+                    JOIN scheduled ON scheduled.subject_id = ss.subject_id
+                    WHERE ss.is_arrear = 0
+                    UNION
+                    SELECT a.student_id
+                    FROM student_arrears a
+                    JOIN scheduled ON scheduled.subject_id = a.subject_id
+                )
                 ORDER BY s.department, s.reg_no
             '''
             self.students_df = pd.read_sql_query(students_query, conn, params=(self.exam_date, self.session))
             
-            # Filter students: include regular students + arrear students (subject_code in arrears array)
-            cursor = conn.cursor()
-            cursor.execute('''
-                SELECT DISTINCT sub.subject_code
-                FROM schedules sch
-                JOIN subjects sub ON sch.subject_id = sub.subject_id
-                WHERE sch.exam_date = ? AND sch.session = ?
-            ''', (self.exam_date, self.session))
-            
-            scheduled_subjects = [row[0] for row in cursor.fetchall()]
-            
-            # Filter students who have these subjects (regular or arrear)
-            filtered_students = []
-            for _, row in self.students_df.iterrows():
-                arrears = json.loads(row['Arrears']) if row['Arrears'] else []
-                # Include if any scheduled subject is in their arrears array
-                if any(sub_code in arrears for sub_code in scheduled_subjects):
-                    filtered_students.append(row)
-                # Also include regular students (those whose year matches scheduled subjects)
-                else:
-                    # Check if they're regular students for these subjects
-                    cursor.execute('''
-                        SELECT COUNT(*) FROM student_subjects ss
-                        JOIN subjects sub ON ss.subject_id = sub.subject_id
-                        JOIN students st ON ss.student_id = st.student_id
-                        WHERE st.reg_no = ? AND sub.subject_code IN ({})
-                              AND ss.is_arrear = 0
-                    '''.format(','.join('?' * len(scheduled_subjects))), 
-                    (row['Register Number'], *scheduled_subjects))
-                    
-                    if cursor.fetchone()[0] > 0:
-                        filtered_students.append(row)
-            
-            self.students_df = pd.DataFrame(filtered_students)
-            
         elif self.exam_type == 'Internal' and self.exam_date:
             # For Internal exams, get students enrolled in subjects for this session
             # NO ARREAR checking - only students enrolled in subjects scheduled for this session
@@ -1137,45 +1117,54 @@ class SeatingAllocationSystem:
                 if result:
                     cycle_id = result[0]
             
+            # Replace the allocation in one transaction
+            cursor.execute('BEGIN')
+            
             # Delete existing allocations for this date+session (if re-running)
             cursor.execute('''
                 DELETE FROM seating_allocations 
                 WHERE exam_date = ? AND session = ?
             ''', (self.exam_date, self.session))
             
+            # Resolve hall and student ids once, instead of two lookups per seat
+            allocations = self.allocations.to_dict('records')
+            reg_nos = sorted({row['Register Number'] for row in allocations})
+            hall_ids = dict(cursor.execute('SELECT hall_name, hall_id FROM halls'))
+            student_ids = {}
+            for start in range(0, len(reg_nos), MAX_SQL_PARAMS):
+                chunk = reg_nos[start:start + MAX_SQL_PARAMS]
+                cursor.execute('SELECT reg_no, student_id FROM students WHERE reg_no IN ({})'.format(
+                    ','.join('?' * len(chunk))), chunk)
+                student_ids.update(cursor.fetchall())
+            
             # Prepare data for insertion
-            records_saved = 0
-            for _, row in self.allocations.iterrows():
-                # Get hall_id from hall name
-                cursor.execute('SELECT hall_id FROM halls WHERE hall_name = ?', (row['Hall No'],))
-                hall_result = cursor.fetchone()
-                if not hall_result:
+            records = []
+            for row in allocations:
+                hall_id = hall_ids.get(row['Hall No'])
+                if hall_id is None:
                     print(f"⚠️ Warning: Hall {row['Hall No']} not found in database")
                     continue
-                hall_id = hall_result[0]
                 
-                # Get student_id from register number
-                cursor.execute('SELECT student_id FROM students WHERE reg_no = ?', (row['Register Number'],))
-                student_result = cursor.fetchone()
-                if not student_result:
+                student_id = student_ids.get(row['Register Number'])
+                if student_id is None:
                     print(f"⚠️ Warning: Student {row['Register Number']} not found in database")
                     continue
-                student_id = student_result[0]
                 
-                # Insert allocation record
-                cursor.execute('''
-                    INSERT INTO seating_allocations (
-                        cycle_id, exam_date, session, hall_id, hall_name,
-                        student_id, reg_no, student_name, department,
-                        bench_number, seat_no, position, exam_type
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
+                records.append((
                     cycle_id, self.exam_date, self.session, hall_id, row['Hall No'],
                     student_id, row['Register Number'], row['Name'], row['Department'],
                     row.get('Bench Number', 0), row['Seat No'], 
                     row.get('Position', 'N/A'), self.exam_type
                 ))
-                records_saved += 1
+            
+            cursor.executemany('''
+                INSERT INTO seating_allocations (
+                    cycle_id, exam_date, session, hall_id, hall_name,
+                    student_id, reg_no, student_name, department,
+                    bench_number, seat_no, position, exam_type
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', records)
+            records_saved = len(records)
             
             conn.commit()
             print(f"\n✅ Saved {records_saved} seating allocations to database")
@@ -2077,24 +2066,15 @@ def main_sem_exam():
     
     # Query: Arrear students (have arrears in these subjects)
     cursor.execute(f'''
-        SELECT DISTINCT s.student_id, s.reg_no, s.name, s.department, s.year, s.arrears
+        SELECT DISTINCT s.student_id, s.reg_no, s.name, s.department, s.year
         FROM students s
-        WHERE s.active = 1 AND s.arrears IS NOT NULL
-    ''')
-    
-    all_students_with_arrears = cursor.fetchall()
-    arrear_students = []
+        JOIN student_arrears a ON s.student_id = a.student_id
+        WHERE a.subject_code IN ({placeholders})
+            AND s.active = 1
+        ORDER BY s.student_id
+    ''', subject_codes)
     
-    for student_id, reg_no, name, dept, student_year, arrears_json in all_students_with_arrears:
-        if arrears_json:
-            try:
-                import json
-                arrears_list = json.loads(arrears_json)
-                # Check if any scheduled subject is in arrears
-                if any(sc in arrears_list for sc in subject_codes):
-                    arrear_students.append((student_id, reg_no, name, dept, student_year))
-            except:
-                pass
+    arrear_students = cursor.fetchall()
     
     # Combine regular + arrear students
     all_student_data = list(regular_students) + arrear_students
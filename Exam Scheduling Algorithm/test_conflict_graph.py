@@ -0,0 +1,142 @@
+"""
+Student-level conflict graph: CSR layout, enrolment edges, and its use by the schedulers
+"""
+
+import pytest
+
+import conflict_graph
+from conflict_graph import ConflictGraph
+from scheduler import ExamScheduler
+from benchmark_conflict_graph import build_database, brute_force_edges
+
+# Students 1-3 share subjects 1 and 2, student 3 also takes 4; subject 5 has one student
+ENROLMENTS = [(1, 1), (1, 2), (2, 1), (2, 2), (3, 1), (3, 2), (3, 4), (4, 5)]
+
+
+@pytest.fixture
+def enrolled(exam_db, add_subjects):
+    """Subjects 1-5 with ENROLMENTS"""
+    add_subjects(exam_db, [{'subject_id': n, 'subject_code': f'S{n}'} for n in range(1, 6)])
+    exam_db.executemany('INSERT INTO student_subjects (student_id, subject_id) VALUES (?, ?)', ENROLMENTS)
+    exam_db.commit()
+    return exam_db
+
+
+def test_from_edges_builds_sorted_rows():
+    graph = ConflictGraph.from_edges([10, 20, 30, 40], [(20, 30, 1), (10, 30, 2), (10, 20, 5)])
+
+    assert list(graph.indptr) == [0, 2, 4, 6, 6]
+    # Each row lists its neighbours' positions in ascending order
+    assert list(graph.indices) == [1, 2, 0, 2, 0, 1]
+    assert list(graph.weights) == [5, 2, 5, 1, 2, 1]
+    assert len(graph) == 4
+    assert graph.edge_count == 3
+
+
+def test_neighbors_weight_and_degree():
+    graph = ConflictGraph.from_edges([10, 20, 30, 40], [(20, 30, 1), (10, 30, 2), (10, 20, 5)])
+
+    assert graph.neighbors(30) == [10, 20]
+    assert graph.neighbors(40) == []
+    assert graph.neighbors(99) == []
+    assert [graph.degree(subject_id) for subject_id in (10, 20, 30, 40)] == [2, 2, 2, 0]
+
+    assert graph.weight(10, 20) == graph.weight(20, 10) == 5
+    assert graph.weight(10, 30) == 2
+    assert graph.weight(10, 40) == 0
+    assert graph.weight(10, 99) == 0
+    assert graph.to_dict() == {10: [20, 30], 20: [10, 30], 30: [10, 20], 40: []}
+
+
+def test_from_enrolments_counts_shared_students(enrolled):
+    graph = ConflictGraph.from_enrolments(enrolled)
+
+    # Subject 5 has no conflicts, so it is not part of the default graph
+    assert graph.subject_ids == [1, 2, 4]
+    assert graph.to_dict() == {1: [2, 4], 2: [1, 4], 4: [1, 2]}
+    assert graph.weight(1, 2) == 3
+    assert graph.weight(2, 4) == 1
+
+
+def test_requested_subjects_keep_isolated_ones(enrolled):
+    graph = ConflictGraph.from_enrolments(enrolled, [1, 2, 5])
+
+    assert graph.subject_ids == [1, 2, 5]
+    assert graph.to_dict() == {1: [2], 2: [1], 5: []}
+
+
+def test_large_subject_lists_filter_after_aggregating(enrolled):
+    expected = ConflictGraph.from_enrolments(enrolled, [1, 2, 5])
+
+    saved = conflict_graph.MAX_SQL_PARAMS
+    conflict_graph.MAX_SQL_PARAMS = 2
+    try:
+        graph = ConflictGraph.from_enrolments(enrolled, [1, 2, 5])
+    finally:
+        conflict_graph.MAX_SQL_PARAMS = saved
+
+    # Subject 4 is enrolled with 1 and 2 but was not asked for
+    assert graph.subject_ids == expected.subject_ids
+    assert graph.to_dict() == expected.to_dict()
+    assert list(graph.weights) == list(expected.weights)
+
+
+def test_matches_brute_force_with_arrears():
+    conn = build_database(years=3, departments=3, subjects_per_dept=3,
+                          students_per_cohort=5, arrear_rate=0.5)
+    graph = ConflictGraph.from_enrolments(conn)
+
+    edges = {(a, b): graph.weight(a, b)
+             for a in graph.subject_ids for b in graph.neighbors(a) if a < b}
+    assert edges == dict(brute_force_edges(conn))
+    assert graph.edge_count == len(edges)
+
+
+
+def _dates(schedule, subject_code):
+    return {(exam['date'], exam['session']) for exam in schedule if exam['subject_code'] == subject_code}
+
+
+def test_semester_exams_keep_arrear_subjects_apart(db_path, exam_db, add_subjects):
+    add_subjects(exam_db, [
+        {'subject_id': 1, 'subject_code': 'CS201', 'year': 2},
+        {'subject_id': 2, 'subject_code': 'EC201', 'department': 'ECE', 'year': 2},
+        {'subject_id': 3, 'subject_code': 'CS202', 'year': 2, 'semester_type': 'EVEN'},
+        {'subject_id': 4, 'subject_code': 'EC202', 'department': 'ECE', 'year': 2, 'semester_type': 'EVEN'},
+    ])
+    # One student with arrears in both departments' second subject
+    exam_db.executemany('INSERT INTO student_subjects (student_id, subject_id, is_arrear) VALUES (1, ?, 1)',
+                        [(3,), (4,)])
+    exam_db.commit()
+
+    scheduler = ExamScheduler(db_path)
+    try:
+        schedule, violations = scheduler.schedule_semester_exams(2, 'ODD', '01.12.2025', '20.12.2025', [])
+    finally:
+        scheduler.close()
+
+    assert violations == []
+    assert {exam['subject_code'] for exam in schedule} == {'CS201', 'EC201', 'CS202', 'EC202'}
+    assert _dates(schedule, 'CS202').isdisjoint(_dates(schedule, 'EC202'))
+
+
+def test_internal_exams_keep_shared_students_apart(db_path, exam_db, add_subjects):
+    add_subjects(exam_db, [
+        {'subject_id': 1, 'subject_code': 'CS201', 'year': 2},
+        {'subject_id': 2, 'subject_code': 'EC201', 'department': 'ECE', 'year': 2},
+        {'subject_id': 3, 'subject_code': 'ME201', 'department': 'MECH', 'year': 2},
+    ])
+    # A CSE student taking the ECE subject as an elective
+    exam_db.executemany('INSERT INTO student_subjects (student_id, subject_id) VALUES (1, ?)', [(1,), (2,)])
+    exam_db.commit()
+
+    scheduler = ExamScheduler(db_path)
+    try:
+        schedule, violations = scheduler.schedule_internal_exams(2, 'ODD', '01.12.2025', '20.12.2025', [])
+    finally:
+        scheduler.close()
+
+    assert violations == []
+    assert _dates(schedule, 'CS201').isdisjoint(_dates(schedule, 'EC201'))
+    # Departments without shared students still write on the first date
+    assert _dates(schedule, 'ME201') == _dates(schedule, 'CS201')
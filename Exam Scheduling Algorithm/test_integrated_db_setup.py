@@ -0,0 +1,115 @@
+"""
+Integrated schema: the student_arrears view, the arrears JSON rebuild,
+--migrate on an older database and the query plan check
+"""
+
+import os
+import sqlite3
+
+import pytest
+
+import integrated_db_setup
+from integrated_db_setup import create_tables, rebuild_arrears_json, INDEXES
+from check_query_plans import QUERIES, ALLOWED_SCANS, full_scans
+from scheduler import ExamScheduler
+
+# All year 2
+SUBJECTS = [
+    {'subject_id': 1, 'subject_code': 'CS201', 'year': 2},
+    {'subject_id': 2, 'subject_code': 'CS202', 'year': 2, 'semester_type': 'EVEN'},
+    {'subject_id': 3, 'subject_code': 'CS203', 'year': 2, 'semester_type': 'EVEN'},
+    {'subject_id': 4, 'subject_code': 'CS204', 'year': 2, 'semester_type': 'EVEN'},
+]
+
+# (student_id, subject_id, is_arrear)
+ENROLMENTS = [
+    (1, 1, 0), (1, 3, 1), (1, 2, 1),
+    (2, 1, 0), (2, 3, 1),
+    (3, 1, 0), (3, 4, 0),
+]
+
+
+@pytest.fixture
+def conn(exam_db, add_subjects):
+    """The shared database with three students enrolled in SUBJECTS"""
+    add_subjects(exam_db, SUBJECTS)
+    exam_db.executemany('''
+        INSERT INTO students (student_id, reg_no, name, department, year, semester)
+        VALUES (?, ?, 'Student', 'CSE', 2, 3)
+    ''', [(student_id, f'21CS00{student_id}') for student_id in (1, 2, 3)])
+    exam_db.executemany('''
+        INSERT INTO student_subjects (student_id, subject_id, is_arrear) VALUES (?, ?, ?)
+    ''', ENROLMENTS)
+    exam_db.commit()
+    return exam_db
+
+
+def test_student_arrears_lists_arrear_enrolments(conn):
+    rows = conn.execute('''
+        SELECT student_id, subject_id, subject_code FROM student_arrears ORDER BY student_id, subject_id
+    ''').fetchall()
+    assert rows == [(1, 2, 'CS202'), (1, 3, 'CS203'), (2, 3, 'CS203')]
+
+
+def test_rebuild_arrears_json_follows_enrolments(conn):
+    conn.execute('''UPDATE students SET arrears = '["STALE"]' ''')
+    rebuild_arrears_json(conn)
+
+    arrears = dict(conn.execute('SELECT student_id, arrears FROM students'))
+    assert arrears == {1: '["CS202","CS203"]', 2: '["CS203"]', 3: '[]'}
+
+
+def test_scheduler_counts_arrear_students_from_view(conn, db_path):
+    scheduler = ExamScheduler(db_path)
+    try:
+        subjects = scheduler.get_subjects_for_year(2, 'SEMESTER', 'ODD')
+    finally:
+        scheduler.close()
+
+    tracks = {subject['subject_code']: (subject['subject_track'], subject['student_count'])
+              for subject in subjects}
+    # CS204 is an EVEN subject nobody has an arrear in
+    assert tracks == {'CS201': ('REGULAR', 0), 'CS202': ('ARREAR', 1), 'CS203': ('ARREAR', 2)}
+
+
+def test_migrate_upgrades_an_older_database(conn, db_path, monkeypatch):
+    # As saved before the indexes and the view, after an older scheduler ran on it
+    conn.execute('DROP VIEW student_arrears')
+    for name, _, _ in INDEXES:
+        conn.execute(f'DROP INDEX {name}')
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.close()
+
+    monkeypatch.setattr(integrated_db_setup, 'DB_PATH', db_path)
+    integrated_db_setup.migrate()
+
+    conn = sqlite3.connect(db_path)
+    try:
+        names = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type IN ('index', 'view')")}
+        assert {name for name, _, _ in INDEXES} | {'student_arrears'} <= names
+        assert conn.execute('SELECT arrears FROM students WHERE student_id = 1').fetchone() == ('["CS202","CS203"]',)
+        assert conn.execute('PRAGMA journal_mode').fetchone() == ('delete',)
+    finally:
+        conn.close()
+
+
+def test_saving_a_schedule_keeps_a_single_file(conn, db_path):
+
+    scheduler = ExamScheduler(db_path)
+    try:
+        cycle_id = scheduler.create_exam_cycle('SEMESTER', 1, '01.12.2025', '20.12.2025')
+        scheduler.save_schedule_to_db(cycle_id, [{'subject_id': 1, 'date': '01.12.2025', 'session': 'FN'}], [])
+        assert scheduler.conn.execute('PRAGMA journal_mode').fetchone() == ('delete',)
+    finally:
+        scheduler.close()
+
+    assert not os.path.exists(db_path + '-wal')
+
+
+def test_queries_read_through_indexes():
+    conn = sqlite3.connect(':memory:')
+    create_tables(conn)
+    for name, query, params in QUERIES:
+        _, scans = full_scans(conn, query, params)
+        assert [detail for table, detail in scans if table not in ALLOWED_SCANS] == [], name
+
@@ -0,0 +1,81 @@
+"""
+SEM student load in SeatingAllocationSystem._load_from_database
+"""
+
+import pytest
+
+import seating_allocation
+from integrated_db_setup import rebuild_arrears_json
+from benchmark_seating_load import load_row_by_row, load_set_based
+
+SUBJECTS = [
+    {'subject_id': 1, 'subject_code': 'CS101'}, {'subject_id': 2, 'subject_code': 'CS102'},
+    {'subject_id': 3, 'subject_code': 'CS201', 'year': 2}, {'subject_id': 4, 'subject_code': 'CS202', 'year': 2},
+]
+
+# reg_no, department, year, active
+STUDENTS = [
+    ('21CS001', 'CSE', 2, 1),   # regular in CS201
+    ('21CS002', 'CSE', 2, 1),   # regular in CS202 only (not scheduled)
+    ('21CS003', 'CSE', 2, 0),   # regular in CS201, inactive
+    ('21EC001', 'ECE', 2, 1),   # regular in CS101 and CS202, same session
+    ('22CS001', 'CSE', 1, 1),   # arrear in CS201
+    ('22EC001', 'ECE', 1, 1),   # regular in CS101 (other session)
+    ('20CS001', 'CSE', 3, 1),   # no enrolments
+]
+
+# (reg_no, subject_id, is_arrear)
+ENROLMENTS = [
+    ('21CS001', 3, 0), ('21CS002', 4, 0), ('21CS003', 3, 0),
+    ('21EC001', 1, 0), ('21EC001', 4, 0),
+    ('22CS001', 1, 0), ('22CS001', 3, 1),
+    ('22EC001', 1, 0),
+]
+
+# CS201 is written in the forenoon, CS101 and CS202 in the afternoon
+SCHEDULES = [(3, '01.12.2025', 'FN'), (1, '01.12.2025', 'AN'), (4, '01.12.2025', 'AN')]
+
+
+@pytest.fixture
+def conn(db_path, exam_db, add_subjects, monkeypatch):
+    """The shared database with these students and schedules, read by seating_allocation"""
+    monkeypatch.setattr(seating_allocation, 'DB_PATH', db_path)
+    add_subjects(exam_db, SUBJECTS)
+    exam_db.executemany('''
+        INSERT INTO students (reg_no, name, department, year, semester, active)
+        VALUES (?, ?, ?, ?, 1, ?)
+    ''', [(reg_no, f'Student {reg_no}', dept, year, active) for reg_no, dept, year, active in STUDENTS])
+    exam_db.executemany('''
+        INSERT INTO student_subjects (student_id, subject_id, is_arrear)
+        SELECT student_id, ?, ? FROM students WHERE reg_no = ?
+    ''', [(subject_id, is_arrear, reg_no) for reg_no, subject_id, is_arrear in ENROLMENTS])
+    exam_db.executemany('''
+        INSERT INTO schedules (cycle_id, subject_id, exam_date, session) VALUES (1, ?, ?, ?)
+    ''', SCHEDULES)
+    exam_db.commit()
+    rebuild_arrears_json(exam_db)
+    return exam_db
+
+
+def test_regular_and_arrear_students_of_the_session(conn):
+    students = load_set_based('01.12.2025', 'FN')
+    assert list(students['Register Number']) == ['21CS001', '22CS001']
+    assert list(students.columns) == ['Register Number', 'Name', 'Department', 'Student Year', 'Arrears']
+    assert students.loc[1, 'Arrears'] == '["CS201"]'
+
+
+def test_students_of_every_subject_in_the_session(conn):
+    # 21EC001 writes two of the afternoon's subjects and is listed once
+    students = load_set_based('01.12.2025', 'AN')
+    assert list(students['Register Number']) == ['21CS002', '22CS001', '21EC001', '22EC001']
+
+
+def test_no_students_without_schedules(conn):
+    assert load_set_based('02.12.2025', 'FN').empty
+
+
+def test_same_students_as_row_by_row_filter(conn):
+    for exam_date, session in [('01.12.2025', 'FN'), ('01.12.2025', 'AN')]:
+        expected = load_row_by_row(conn, exam_date, session)
+        result = load_set_based(exam_date, session)
+        assert result.equals(expected)